@@ -0,0 +1,728 @@
+#!/usr/bin/env python3
+"""
+Benchmark the OOXML validators on synthetic documents.
+
+Generates an original package and an unpacked, modified copy of it for each
+format, times every validation step in a fresh process, records peak RSS and
+writes JSON results that can be compared across commits.
+
+Example usage:
+    python benchmark.py run --paragraphs 5000 --tracked-changes 500 -o after.json
+    python benchmark.py run --scale 1 2 4 -o scaling.json
+    python benchmark.py compare before.json after.json
+    python benchmark.py generate corpus/ --slides 50 --media 10
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+# Validation steps in the order each validator's validate() runs them
+VALIDATOR_STEPS = {
+    "DOCXSchemaValidator": [
+        "validate_xml",
+        "validate_namespaces",
+        "validate_unique_ids",
+        "validate_file_references",
+        "validate_content_types",
+        "validate_against_xsd",
+        "validate_whitespace_preservation",
+        "validate_deletions",
+        "validate_insertions",
+        "validate_all_relationship_ids",
+        "compare_paragraph_counts",
+    ],
+    "PPTXSchemaValidator": [
+        "validate_xml",
+        "validate_namespaces",
+        "validate_unique_ids",
+        "validate_uuid_ids",
+        "validate_file_references",
+        "validate_slide_layout_ids",
+        "validate_content_types",
+        "validate_against_xsd",
+        "validate_notes_slide_references",
+        "validate_all_relationship_ids",
+        "validate_no_duplicate_slide_layouts",
+    ],
+    "RedliningValidator": ["validate"],
+}
+
+# Validators run for each generated format
+FORMAT_VALIDATORS = {
+    "docx": ["DOCXSchemaValidator", "RedliningValidator"],
+    "pptx": ["PPTXSchemaValidator"],
+}
+
+# Corpus settings multiplied by --scale
+SCALED_COUNTS = {"paragraphs", "tracked_changes", "comments", "slides", "media"}
+
+# Steps slower than this (seconds) are never reported as regressions
+MIN_REGRESSION_SECONDS = 0.005
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+PIC_NS = "http://schemas.openxmlformats.org/drawingml/2006/picture"
+WP_NS = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+PKG_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+WORDS = (
+    "agreement party term notice payment service delivery period clause "
+    "schedule obligation liability warranty breach remedy consent"
+).split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the OOXML validators")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Generate a corpus and time it")
+    _add_corpus_arguments(run_parser)
+    run_parser.add_argument(
+        "-o", "--output", help="Write JSON results to this file (default: stdout)"
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs per measurement (default: 3)"
+    )
+    run_parser.add_argument(
+        "--scale",
+        type=float,
+        nargs="+",
+        default=[1],
+        help="Multiply all counts by each factor in turn (default: 1)",
+    )
+    run_parser.add_argument(
+        "--baseline-cache",
+        action="store_true",
+        help="Use the on-disk baseline error cache (off for reproducible timings)",
+    )
+    run_parser.add_argument(
+        "--validate-option",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Extra keyword argument for the schema validators, e.g. jobs=4",
+    )
+
+    generate_parser = subparsers.add_parser("generate", help="Only write a corpus")
+    generate_parser.add_argument("output_dir", help="Directory for the corpus")
+    _add_corpus_arguments(generate_parser)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", help="Results of the reference commit")
+    compare_parser.add_argument("candidate", help="Results to check")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown reported as a regression (default: 0.1)",
+    )
+    args = parser.parse_args()
+
+    match args.command:
+        case "run":
+            results = run_benchmark(
+                _corpus_config(args),
+                formats=args.formats,
+                scales=args.scale,
+                repeat=args.repeat,
+                validator_options={
+                    "baseline_cache": args.baseline_cache,
+                    **_parse_options(args.validate_option),
+                },
+            )
+            output = json.dumps(results, indent=2)
+            if args.output:
+                Path(args.output).write_text(output + "\n", encoding="utf-8")
+            else:
+                print(output)
+        case "generate":
+            for fmt in args.formats:
+                original, unpacked = generate_corpus(
+                    args.output_dir, fmt, **_corpus_config(args)
+                )
+                print(f"{fmt}: {original} -> {unpacked}")
+        case "compare":
+            baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+            candidate = json.loads(Path(args.candidate).read_text(encoding="utf-8"))
+            if not compare_results(baseline, candidate, threshold=args.threshold):
+                sys.exit(1)
+
+
+def _add_corpus_arguments(parser):
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=sorted(FORMAT_VALIDATORS),
+        default=sorted(FORMAT_VALIDATORS),
+        help="Document formats to generate (default: all)",
+    )
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--tracked-changes", type=int, default=200)
+    parser.add_argument("--comments", type=int, default=50)
+    parser.add_argument("--slides", type=int, default=30)
+    parser.add_argument("--media", type=int, default=5, help="Embedded images")
+    parser.add_argument(
+        "--media-size", type=int, default=64, help="Size of each image in KB"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def _corpus_config(args):
+    return {
+        "paragraphs": args.paragraphs,
+        "tracked_changes": args.tracked_changes,
+        "comments": args.comments,
+        "slides": args.slides,
+        "media": args.media,
+        "media_size": args.media_size,
+        "seed": args.seed,
+    }
+
+
+def _parse_options(options):
+    parsed = {}
+    for option in options:
+        key, _, value = option.partition("=")
+        try:
+            parsed[key] = json.loads(value)
+        except ValueError:
+            parsed[key] = value
+    return parsed
+
+
+def run_benchmark(config, formats, scales=(1,), repeat=3, validator_options=None):
+    """Generate a corpus per format and scale, and measure every validator on it.
+
+    Returns:
+        dict: JSON-serializable results (see compare_results)
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for scale in scales:
+            scaled = {
+                key: (round(value * scale) if key in SCALED_COUNTS else value)
+                for key, value in config.items()
+            }
+            for fmt in formats:
+                corpus_dir = Path(temp_dir) / f"{fmt}-x{scale:g}"
+                original, unpacked = generate_corpus(corpus_dir, fmt, **scaled)
+                corpus_name = f"{fmt}-x{scale:g}"
+                for validator_name in FORMAT_VALIDATORS[fmt]:
+                    print(f"Measuring {validator_name} on {corpus_name}", file=sys.stderr)
+                    samples = [
+                        _measure_in_fresh_process(
+                            validator_name, unpacked, original, validator_options or {}
+                        )
+                        for _ in range(max(1, repeat))
+                    ]
+                    results.append(
+                        {
+                            "corpus": corpus_name,
+                            "format": fmt,
+                            "scale": scale,
+                            "config": scaled,
+                            "validator": validator_name,
+                            **_summarize(samples),
+                        }
+                    )
+
+    return {
+        "environment": _environment(),
+        "config": config,
+        "validator_options": validator_options or {},
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _summarize(samples):
+    """Reduce repeated samples to the median time and highest peak RSS per step."""
+    steps = {}
+    for step in samples[0]["steps"]:
+        seconds = [sample["steps"][step]["seconds"] for sample in samples]
+        steps[step] = {
+            "seconds": statistics.median(seconds),
+            "min_seconds": min(seconds),
+            "peak_rss_kb": max(sample["steps"][step]["peak_rss_kb"] for sample in samples),
+        }
+    return {
+        "total_seconds": statistics.median(sample["total_seconds"] for sample in samples),
+        "peak_rss_kb": max(sample["peak_rss_kb"] for sample in samples),
+        "steps": steps,
+    }
+
+
+def _measure_in_fresh_process(validator_name, unpacked_dir, original_file, options):
+    # A new process per sample: cold schema caches and a clean RSS high-water mark
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(
+            measure_validator,
+            validator_name,
+            str(unpacked_dir),
+            str(original_file),
+            options,
+        ).result()
+
+
+def measure_validator(validator_name, unpacked_dir, original_file, options):
+    """Time the constructor and each validation step of one validator.
+
+    Peak RSS is the process high-water mark after each step, so growth between
+    steps shows which step needed the memory.
+    """
+    import validation
+
+    validator_class = getattr(validation, validator_name)
+    if not issubclass(validator_class, validation.BaseSchemaValidator):
+        options = {}
+
+    steps = {}
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        step_start = time.perf_counter()
+        validator = validator_class(unpacked_dir, original_file, **options)
+        steps["__init__"] = _step_result(step_start)
+
+        for step in VALIDATOR_STEPS[validator_name]:
+            step_start = time.perf_counter()
+            getattr(validator, step)()
+            steps[step] = _step_result(step_start)
+
+    return {
+        "total_seconds": time.perf_counter() - start,
+        "peak_rss_kb": _peak_rss_kb(),
+        "steps": steps,
+    }
+
+
+def _step_result(step_start):
+    return {"seconds": time.perf_counter() - step_start, "peak_rss_kb": _peak_rss_kb()}
+
+
+def _peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _environment():
+    """Describe the code and machine the results were measured on."""
+    script_dir = Path(__file__).resolve().parent
+
+    def git(*args):
+        try:
+            result = subprocess.run(
+                ["git", *args], cwd=script_dir, capture_output=True, text=True
+            )
+        except OSError:
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    import lxml.etree
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--", str(script_dir))),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "lxml": ".".join(map(str, lxml.etree.LXML_VERSION)),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare_results(baseline, candidate, threshold=0.1):
+    """Print per-step timing changes between two result files.
+
+    Returns:
+        bool: True if no step got slower than threshold (relative)
+    """
+    baseline_steps = _flatten(baseline)
+    candidate_steps = _flatten(candidate)
+
+    print(
+        f"Baseline:  {baseline['environment'].get('commit')} "
+        f"({baseline['environment'].get('timestamp')})"
+    )
+    print(
+        f"Candidate: {candidate['environment'].get('commit')} "
+        f"({candidate['environment'].get('timestamp')})"
+    )
+    if baseline["config"] != candidate["config"]:
+        print("Warning: The results were measured on differently sized corpora")
+    print()
+    print(f"{'corpus / validator / step':<72} {'before':>9} {'after':>9} {'change':>8}")
+
+    regressions = []
+    for key, after in candidate_steps.items():
+        before = baseline_steps.get(key)
+        label = " / ".join(key)
+        if before is None:
+            print(f"{label:<72} {'-':>9} {after['seconds']:>8.3f}s {'new':>8}")
+            continue
+
+        change = (after["seconds"] - before["seconds"]) / max(before["seconds"], 1e-9)
+        marker = ""
+        if (
+            change > threshold
+            and after["seconds"] - before["seconds"] > MIN_REGRESSION_SECONDS
+        ):
+            regressions.append(label)
+            marker = "  REGRESSION"
+        print(
+            f"{label:<72} {before['seconds']:>8.3f}s {after['seconds']:>8.3f}s "
+            f"{change:>+7.0%}{marker}"
+        )
+        if after["peak_rss_kb"] > before["peak_rss_kb"] * (1 + threshold):
+            print(
+                f"{'':<72} peak RSS {before['peak_rss_kb'] // 1024} MB -> "
+                f"{after['peak_rss_kb'] // 1024} MB"
+            )
+
+    print()
+    if regressions:
+        print(f"FAILED - {len(regressions)} step(s) slower than {threshold:.0%}:")
+        for label in regressions:
+            print(f"  {label}")
+        return False
+    print(f"PASSED - No step slower than {threshold:.0%}")
+    return True
+
+
+def _flatten(results):
+    steps = {}
+    for result in results["results"]:
+        steps[(result["corpus"], result["validator"], "total")] = {
+            "seconds": result["total_seconds"],
+            "peak_rss_kb": result["peak_rss_kb"],
+        }
+        for step, values in result["steps"].items():
+            steps[(result["corpus"], result["validator"], step)] = values
+    return steps
+
+
+def generate_corpus(output_dir, fmt, **config):
+    """Write original.<fmt> and its unpacked, modified copy to output_dir.
+
+    The modified copy is produced the way an editing session would: the modified
+    package is unpacked with unpack.py.
+
+    Returns:
+        tuple: (original_file, unpacked_dir)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    generate = {"docx": generate_docx_parts, "pptx": generate_pptx_parts}[fmt]
+
+    original_file = output_dir / f"original.{fmt}"
+    modified_file = output_dir / f"modified.{fmt}"
+    _write_package(original_file, generate(modified=False, **config))
+    _write_package(modified_file, generate(modified=True, **config))
+
+    unpacked_dir = output_dir / f"unpacked-{fmt}"
+    subprocess.run(
+        [
+            sys.executable,
+            str(Path(__file__).parent / "unpack.py"),
+            str(modified_file),
+            str(unpacked_dir),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    modified_file.unlink()
+    return original_file, unpacked_dir
+
+
+def _write_package(path, parts):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _png(rng, size_kb):
+    """Return a valid PNG of roughly size_kb kilobytes of incompressible pixels."""
+    width = 256
+    height = max(1, size_kb * 1024 // (width * 3))
+    raw = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _content_types(defaults, overrides):
+    items = [
+        f'<Default Extension="{ext}" ContentType="{ctype}"/>' for ext, ctype in defaults
+    ] + [
+        f'<Override PartName="/{name}" ContentType="{ctype}"/>'
+        for name, ctype in overrides
+    ]
+    return f'{XML_DECLARATION}<Types xmlns="{CT_NS}">{"".join(items)}</Types>'
+
+
+def _relationships(relationships):
+    items = [
+        f'<Relationship Id="{rid}" Type="{REL_TYPE}/{rel_type}" Target="{target}"/>'
+        for rid, rel_type, target in relationships
+    ]
+    return f'{XML_DECLARATION}<Relationships xmlns="{PKG_RELS_NS}">{"".join(items)}</Relationships>'
+
+
+def generate_docx_parts(
+    modified, paragraphs, tracked_changes, comments, media, media_size, seed, **_
+):
+    """Return {part name: bytes} of a synthetic Word document.
+
+    The modified document adds tracked insertions and deletions by Claude, so
+    the redlining check has real work to do and still passes.
+    """
+    rng = random.Random(seed)
+    media_rids = [f"rIdImg{i + 1}" for i in range(media)]
+    change_every = max(1, paragraphs // tracked_changes) if tracked_changes else 0
+    comment_every = max(1, paragraphs // comments) if comments else 0
+    media_every = max(1, paragraphs // media) if media else 0
+
+    body = []
+    changes = comments_made = images = 0
+    for i in range(paragraphs):
+        text = escape(_text(rng, 12))
+        runs = []
+        if comment_every and i % comment_every == 0 and comments_made < comments:
+            runs.append(f'<w:commentRangeStart w:id="{comments_made}"/>')
+        runs.append(f"<w:r><w:t>{text}</w:t></w:r>")
+
+        if change_every and i % change_every == 0 and changes < tracked_changes:
+            deleted = escape(_text(rng, 3))
+            inserted = escape(_text(rng, 3))
+            if modified:
+                runs.append(
+                    f'<w:del w:id="{10000 + 2 * changes}" w:author="Claude" '
+                    f'w:date="2025-01-01T00:00:00Z"><w:r><w:delText xml:space="preserve"> '
+                    f'{deleted}</w:delText></w:r></w:del>'
+                    f'<w:ins w:id="{10001 + 2 * changes}" w:author="Claude" '
+                    f'w:date="2025-01-01T00:00:00Z"><w:r><w:t xml:space="preserve"> '
+                    f"{inserted}</w:t></w:r></w:ins>"
+                )
+            else:
+                runs.append(f'<w:r><w:t xml:space="preserve"> {deleted}</w:t></w:r>')
+            changes += 1
+
+        if comment_every and i % comment_every == 0 and comments_made < comments:
+            runs.append(
+                f'<w:commentRangeEnd w:id="{comments_made}"/>'
+                f'<w:r><w:commentReference w:id="{comments_made}"/></w:r>'
+            )
+            comments_made += 1
+
+        if media_every and i % media_every == 0 and images < media:
+            runs.append(
+                f'<w:r><w:drawing><wp:inline><wp:extent cx="914400" cy="914400"/>'
+                f'<wp:docPr id="{images + 1}" name="Picture {images + 1}"/>'
+                f'<a:graphic><a:graphicData uri="{PIC_NS}"><pic:pic>'
+                f'<pic:nvPicPr><pic:cNvPr id="{images + 1}" name="image{images + 1}.png"/>'
+                f"<pic:cNvPicPr/></pic:nvPicPr>"
+                f'<pic:blipFill><a:blip r:embed="{media_rids[images]}"/></pic:blipFill>'
+                f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="914400" cy="914400"/>'
+                f'</a:xfrm><a:prstGeom prst="rect"/></pic:spPr>'
+                f"</pic:pic></a:graphicData></a:graphic></wp:inline></w:drawing></w:r>"
+            )
+            images += 1
+
+        if i % 50 == 0:
+            body.append(
+                f'<w:bookmarkStart w:id="{i}" w:name="b{i}"/><w:bookmarkEnd w:id="{i}"/>'
+            )
+        body.append(f"<w:p>{''.join(runs)}</w:p>")
+
+    document = (
+        f'{XML_DECLARATION}<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}" '
+        f'xmlns:a="{A_NS}" xmlns:pic="{PIC_NS}" xmlns:wp="{WP_NS}"><w:body>'
+        f"{''.join(body)}<w:sectPr/></w:body></w:document>"
+    )
+
+    parts = {
+        "[Content_Types].xml": _content_types(
+            [
+                ("rels", "application/vnd.openxmlformats-package.relationships+xml"),
+                ("xml", "application/xml"),
+                ("png", "image/png"),
+            ],
+            [
+                (
+                    "word/document.xml",
+                    "application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml",
+                ),
+                (
+                    "word/comments.xml",
+                    "application/vnd.openxmlformats-officedocument.wordprocessingml.comments+xml",
+                ),
+            ][: 2 if comments else 1],
+        ),
+        "_rels/.rels": _relationships([("rId1", "officeDocument", "word/document.xml")]),
+        "word/document.xml": document,
+    }
+
+    document_rels = [
+        (rid, "image", f"media/image{i + 1}.png") for i, rid in enumerate(media_rids)
+    ]
+    if comments:
+        document_rels.append(("rIdComments", "comments", "comments.xml"))
+        parts["word/comments.xml"] = (
+            f'{XML_DECLARATION}<w:comments xmlns:w="{W_NS}">'
+            + "".join(
+                f'<w:comment w:id="{i}" w:author="Reviewer" w:initials="R">'
+                f"<w:p><w:r><w:t>{escape(_text(rng, 8))}</w:t></w:r></w:p></w:comment>"
+                for i in range(comments_made)
+            )
+            + "</w:comments>"
+        )
+    parts["word/_rels/document.xml.rels"] = _relationships(document_rels)
+
+    media_rng = random.Random(seed + 1)  # Same images in original and modified
+    for i in range(media):
+        parts[f"word/media/image{i + 1}.png"] = _png(media_rng, media_size)
+    return parts
+
+
+def generate_pptx_parts(modified, slides, media, media_size, seed, paragraphs=0, **_):
+    """Return {part name: bytes} of a synthetic PowerPoint presentation.
+
+    The modified presentation has different text on every other slide.
+    """
+    rng = random.Random(seed)
+    text_rng = random.Random(seed + 2)
+    namespaces = f'xmlns:a="{A_NS}" xmlns:r="{R_NS}" xmlns:p="{P_NS}"'
+    empty_tree = (
+        '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+        "<p:grpSpPr/>"
+    )
+    ct = "application/vnd.openxmlformats-officedocument.presentationml"
+
+    parts = {
+        "ppt/slideMasters/slideMaster1.xml": (
+            f"{XML_DECLARATION}<p:sldMaster {namespaces}><p:cSld><p:spTree>{empty_tree}"
+            '</p:spTree></p:cSld><p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" '
+            'accent1="accent1" accent2="accent2" accent3="accent3" accent4="accent4" '
+            'accent5="accent5" accent6="accent6" hlink="hlink" folHlink="folHlink"/>'
+            '<p:sldLayoutIdLst><p:sldLayoutId id="2147483649" r:id="rId1"/>'
+            "</p:sldLayoutIdLst></p:sldMaster>"
+        ),
+        "ppt/slideMasters/_rels/slideMaster1.xml.rels": _relationships(
+            [
+                ("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml"),
+                ("rId2", "theme", "../theme/theme1.xml"),
+            ]
+        ),
+        "ppt/slideLayouts/slideLayout1.xml": (
+            f"{XML_DECLARATION}<p:sldLayout {namespaces}><p:cSld><p:spTree>{empty_tree}"
+            "</p:spTree></p:cSld></p:sldLayout>"
+        ),
+        "ppt/slideLayouts/_rels/slideLayout1.xml.rels": _relationships(
+            [("rId1", "slideMaster", "../slideMasters/slideMaster1.xml")]
+        ),
+        "ppt/theme/theme1.xml": (
+            f'{XML_DECLARATION}<a:theme xmlns:a="{A_NS}" name="Synthetic">'
+            "<a:themeElements/></a:theme>"
+        ),
+    }
+
+    presentation_rels = [
+        ("rId1", "slideMaster", "slideMasters/slideMaster1.xml"),
+        ("rId2", "theme", "theme/theme1.xml"),
+    ]
+    slide_ids = []
+    media_rng = random.Random(seed + 1)
+    for i in range(slides):
+        shapes = []
+        for j in range(6):
+            text = _text(text_rng, 10)
+            if modified and i % 2 == 0 and j == 0:
+                text = _text(rng, 10)
+            shapes.append(
+                f'<p:sp><p:nvSpPr><p:cNvPr id="{j + 2}" name="Text {j + 2}"/>'
+                "<p:cNvSpPr/><p:nvPr/></p:nvSpPr><p:spPr/><p:txBody><a:bodyPr/>"
+                f"<a:p><a:r><a:t>{escape(text)}</a:t></a:r></a:p></p:txBody></p:sp>"
+            )
+        slide_rels = [("rId1", "slideLayout", "../slideLayouts/slideLayout1.xml")]
+        if i < media:
+            shapes.append(
+                '<p:pic><p:nvPicPr><p:cNvPr id="20" name="Picture"/><p:cNvPicPr/><p:nvPr/>'
+                '</p:nvPicPr><p:blipFill><a:blip r:embed="rId2"/></p:blipFill>'
+                '<p:spPr><a:prstGeom prst="rect"/></p:spPr></p:pic>'
+            )
+            slide_rels.append(("rId2", "image", f"../media/image{i + 1}.png"))
+            parts[f"ppt/media/image{i + 1}.png"] = _png(media_rng, media_size)
+
+        parts[f"ppt/slides/slide{i + 1}.xml"] = (
+            f"{XML_DECLARATION}<p:sld {namespaces}><p:cSld><p:spTree>{empty_tree}"
+            f"{''.join(shapes)}</p:spTree></p:cSld></p:sld>"
+        )
+        parts[f"ppt/slides/_rels/slide{i + 1}.xml.rels"] = _relationships(slide_rels)
+        presentation_rels.append((f"rId{i + 3}", "slide", f"slides/slide{i + 1}.xml"))
+        slide_ids.append(f'<p:sldId id="{256 + i}" r:id="rId{i + 3}"/>')
+
+    parts["ppt/presentation.xml"] = (
+        f"{XML_DECLARATION}<p:presentation {namespaces}>"
+        '<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+        f"<p:sldIdLst>{''.join(slide_ids)}</p:sldIdLst>"
+        '<p:sldSz cx="12192000" cy="6858000"/><p:notesSz cx="6858000" cy="9144000"/>'
+        "</p:presentation>"
+    )
+    parts["ppt/_rels/presentation.xml.rels"] = _relationships(presentation_rels)
+    parts["_rels/.rels"] = _relationships(
+        [("rId1", "officeDocument", "ppt/presentation.xml")]
+    )
+    parts["[Content_Types].xml"] = _content_types(
+        [
+            ("rels", "application/vnd.openxmlformats-package.relationships+xml"),
+            ("xml", "application/xml"),
+            ("png", "image/png"),
+        ],
+        [
+            ("ppt/presentation.xml", f"{ct}.presentation.main+xml"),
+            ("ppt/slideMasters/slideMaster1.xml", f"{ct}.slideMaster+xml"),
+            ("ppt/slideLayouts/slideLayout1.xml", f"{ct}.slideLayout+xml"),
+            ("ppt/theme/theme1.xml", "application/vnd.openxmlformats-officedocument.theme+xml"),
+        ]
+        + [(f"ppt/slides/slide{i + 1}.xml", f"{ct}.slide+xml") for i in range(slides)],
+    )
+    return parts
+
+
+if __name__ == "__main__":
+    main()
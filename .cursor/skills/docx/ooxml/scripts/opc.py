@@ -0,0 +1,322 @@
+"""
+In-memory OPC (Open Packaging Conventions) package: the parts of a .docx, .pptx or
+.xlsx file, with their content types and relationships.
+
+A Package reads parts on demand from where it was opened (an unpacked directory,
+a packaged file or the bytes of one) and keeps the parts written to it in memory
+until it is saved. pack_document, the validators and Document all accept one, so
+a document can be edited, validated and packed without copying it to disk.
+
+Example usage:
+    package = Package("document.docx")
+    data = package.read("word/document.xml")
+    package.write("word/document.xml", data.replace(b"draft", b"final"))
+    package.save("output.docx")
+"""
+
+import io
+import posixpath
+import shutil
+import zipfile
+from pathlib import Path
+from urllib.parse import unquote
+
+import defusedxml.ElementTree
+
+try:
+    from .unpack import MANIFEST_NAME
+except ImportError:
+    from unpack import MANIFEST_NAME
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+
+
+class Package:
+    """Parts of an Office document, read lazily from their source and edited in memory.
+
+    Parts are addressed by their name in the package, a POSIX path without a
+    leading slash, e.g. "word/document.xml". Writing or deleting a part never
+    touches the source; use save or extract to write the result.
+    """
+
+    def __init__(self, source=None):
+        """Open a package.
+
+        Args:
+            source: Path to an unpacked directory, path to a .docx/.pptx/.xlsx
+                file, the bytes of such a file, or None for an empty package
+
+        Raises:
+            ValueError: If source is neither a directory nor a zip archive
+        """
+        self.source = source
+        self.directory = None  # Unpacked directory the parts are read from
+        self.archive_path = None  # Packaged file the parts are read from
+        self._zip = None
+        self._members = {}  # Member name -> ZipInfo, in archive order
+        self._written = {}  # Part name -> bytes written since opening
+        self._deleted = set()  # Source parts deleted since opening
+
+        if source is None:
+            return
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.source = bytes(source)
+        elif Path(source).is_dir():
+            self.directory = Path(source)
+            return
+        elif zipfile.is_zipfile(source):
+            self.archive_path = Path(source)
+        else:
+            raise ValueError(f"{source} is not a directory or an Office file")
+        self._members = {
+            info.filename: info
+            for info in self._archive().infolist()
+            if not info.is_dir()
+        }
+
+    def __contains__(self, name):
+        name = part_name(name)
+        if name in self._written:
+            return True
+        if name in self._deleted:
+            return False
+        if self.directory is not None:
+            return name != MANIFEST_NAME and (self.directory / name).is_file()
+        return name in self._members
+
+    def __iter__(self):
+        return iter(self.part_names())
+
+    def __len__(self):
+        return len(self.part_names())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        # Picklable for worker processes; they reopen the archive when they read
+        state = self.__dict__.copy()
+        state["_zip"] = None
+        return state
+
+    def part_names(self):
+        """Return the names of all parts: those of the source, then added ones."""
+        if self.directory is not None:
+            # Listed on every call, so files added to the directory show up
+            source_names = sorted(
+                path.relative_to(self.directory).as_posix()
+                for path in self.directory.rglob("*")
+                if path.is_file() and path != self.directory / MANIFEST_NAME
+            )
+        else:
+            source_names = list(self._members)
+        names = dict.fromkeys(n for n in source_names if n not in self._deleted)
+        names.update(dict.fromkeys(self._written))
+        return list(names)
+
+    def read(self, name):
+        """Return the bytes of a part.
+
+        Raises:
+            KeyError: If the package has no such part
+        """
+        name = part_name(name)
+        if name in self._written:
+            return self._written[name]
+        if name not in self:
+            raise KeyError(f"No part named {name!r}")
+        if self.directory is not None:
+            return (self.directory / name).read_bytes()
+        return self._archive().read(self._members[name])
+
+    def write(self, name, data):
+        """Add a part or replace its content (in memory)."""
+        name = part_name(name)
+        self._written[name] = bytes(data)
+        self._deleted.discard(name)
+
+    def delete(self, name):
+        """Remove a part (in memory).
+
+        Raises:
+            KeyError: If the package has no such part
+        """
+        name = part_name(name)
+        if name not in self:
+            raise KeyError(f"No part named {name!r}")
+        self._written.pop(name, None)
+        if name in self._members or (
+            self.directory is not None and (self.directory / name).is_file()
+        ):
+            self._deleted.add(name)
+
+    def size(self, name):
+        """Return the size of a part in bytes, without reading it if unmodified."""
+        name = part_name(name)
+        if name not in self._written and name in self:
+            if self.directory is not None:
+                return (self.directory / name).stat().st_size
+            return self._members[name].file_size
+        return len(self.read(name))
+
+    def is_modified(self, name):
+        """Return True if a part was written or deleted since the package was opened."""
+        name = part_name(name)
+        return name in self._written or name in self._deleted
+
+    def modified_names(self):
+        """Return the names of parts written or deleted since the package was opened."""
+        return sorted(self._written.keys() | self._deleted)
+
+    def file(self, name):
+        """Return the file an unmodified part of a directory package is read from.
+
+        Returns:
+            Path, or None if the part is modified or not read from a directory
+        """
+        name = part_name(name)
+        if self.directory is None or self.is_modified(name) or name not in self:
+            return None
+        return self.directory / name
+
+    def info(self, name):
+        """Return the zipfile.ZipInfo of an unmodified part of a packaged source.
+
+        Raises:
+            KeyError: If the part is modified or not read from an archive
+        """
+        name = part_name(name)
+        if self.is_modified(name):
+            raise KeyError(f"Part {name!r} is modified")
+        return self._members[name]
+
+    def original(self):
+        """Return a new Package of the same source, without the changes made since."""
+        return Package(self.source)
+
+    def content_type(self, name):
+        """Return the content type [Content_Types].xml declares for a part, or None."""
+        if CONTENT_TYPES_PART not in self:
+            return None
+        root = defusedxml.ElementTree.fromstring(self.read(CONTENT_TYPES_PART))
+        name = part_name(name)
+        uri = "/" + name.lower()
+        for override in root.iter(f"{{{CONTENT_TYPES_NAMESPACE}}}Override"):
+            if override.get("PartName", "").lower() == uri:
+                return override.get("ContentType")
+        # Extensions are matched after the last dot, so ".rels" is one too
+        _, dot, extension = posixpath.basename(name).rpartition(".")
+        for default in root.iter(f"{{{CONTENT_TYPES_NAMESPACE}}}Default"):
+            if dot and default.get("Extension", "").lower() == extension.lower():
+                return default.get("ContentType")
+        return None
+
+    def relationships(self, name=""):
+        """Return the relationships of a part, or of the package itself for "".
+
+        Returns:
+            list: {"id", "type", "target", "external"} dicts in document order.
+            The target of an internal relationship is the name of the part it
+            points to; that of an external one is its URI as written.
+        """
+        name = part_name(name)
+        rels_name = relationships_part_name(name)
+        if rels_name not in self:
+            return []
+        root = defusedxml.ElementTree.fromstring(self.read(rels_name))
+        source_dir = posixpath.dirname(name)
+        relationships = []
+        for rel in root.iter(f"{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"):
+            external = rel.get("TargetMode") == "External"
+            target = rel.get("Target", "")
+            if not external:
+                target = unquote(target.split("#")[0])
+                if target.startswith("/"):
+                    target = target.lstrip("/")
+                else:
+                    target = posixpath.normpath(posixpath.join(source_dir, target))
+            relationships.append(
+                {
+                    "id": rel.get("Id"),
+                    "type": rel.get("Type"),
+                    "target": target,
+                    "external": external,
+                }
+            )
+        return relationships
+
+    def save(self, output_file, **options):
+        """Pack the package into an Office file; options are those of pack_document."""
+        try:
+            from .pack import pack_document
+        except ImportError:
+            from pack import pack_document
+        return pack_document(self, output_file, **options)
+
+    def extract(self, directory):
+        """Write the parts as files to a directory, as they are (not pretty-printed).
+
+        Extracting into the source directory writes only the modified parts whose
+        files differ (so extracting again leaves them untouched) and removes the
+        deleted ones.
+        """
+        directory = Path(directory)
+        in_place = (
+            self.directory is not None
+            and directory.resolve() == self.directory.resolve()
+        )
+        if in_place:
+            for name in self._deleted:
+                (directory / name).unlink(missing_ok=True)
+        for name in self.part_names():
+            if in_place and not self.is_modified(name):
+                continue
+            path = directory / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            source_file = self.file(name)
+            if source_file is not None:
+                shutil.copyfile(source_file, path)
+                continue
+            data = self.read(name)
+            if in_place and path.is_file() and path.stat().st_size == len(data):
+                if path.read_bytes() == data:
+                    continue
+            path.write_bytes(data)
+
+    def close(self):
+        """Close the source archive; it is reopened if parts are read again."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def _archive(self):
+        if self._zip is None:
+            if self.archive_path is not None:
+                self._zip = zipfile.ZipFile(self.archive_path)
+            else:
+                self._zip = zipfile.ZipFile(io.BytesIO(self.source))
+        return self._zip
+
+
+def part_name(name):
+    """Return a part name as the Package methods take it, given it or its part URI.
+
+    e.g. "/word/document.xml" (as in [Content_Types].xml) -> "word/document.xml"
+    """
+    return name.lstrip("/")
+
+
+def relationships_part_name(name):
+    """Return the name of the part with the relationships of a part or "" (package).
+
+    e.g. "word/document.xml" -> "word/_rels/document.xml.rels", "" -> "_rels/.rels"
+    """
+    directory, base = posixpath.split(name)
+    return posixpath.join(directory, "_rels", f"{base}.rels")
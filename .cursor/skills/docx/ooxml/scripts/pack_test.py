@@ -0,0 +1,479 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+import xml.parsers.expat
+import zipfile
+import zlib
+from pathlib import Path
+from unittest import mock
+
+import defusedxml
+import defusedxml.minidom
+
+from opc import Package
+from pack import (
+    MEMBER_DATE_TIME,
+    _ArchiveWriter,
+    check_package_structure,
+    condense_xml_bytes,
+    pack_document,
+)
+from unpack import MANIFEST_NAME, pretty_print_xml_utf8, read_manifest, unpack_document
+
+
+def minidom_condense_xml_bytes(data):
+    """The original minidom-based condense, kept as the reference output."""
+    dom = defusedxml.minidom.parseString(data.decode("utf-8"))
+
+    for element in dom.getElementsByTagName("*"):
+        if element.tagName.endswith(":t"):
+            continue
+
+        for child in list(element.childNodes):
+            if (
+                child.nodeType == child.TEXT_NODE
+                and child.nodeValue
+                and child.nodeValue.strip() == ""
+            ) or child.nodeType == child.COMMENT_NODE:
+                element.removeChild(child)
+
+    return dom.toxml(encoding="UTF-8")
+
+
+def unpack_pretty_print(data):
+    """Pretty-print a part the way unpack.py does."""
+    dom = defusedxml.minidom.parseString(data.decode("utf-8"))
+    return dom.toprettyxml(indent="  ", encoding="ascii")
+
+
+def unpack_pretty_print_utf8(data):
+    """Pretty-print a part the way unpack.py --utf8 does."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        xml_file = Path(temp_dir) / "part.xml"
+        xml_file.write_bytes(data)
+        pretty_print_xml_utf8(xml_file)
+        return xml_file.read_bytes()
+
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+A = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+
+CASES = {
+    "pretty printed": f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document {W}>
+  <w:body>
+    <w:p>
+      <w:r>
+        <w:t xml:space="preserve"> Hello </w:t>
+      </w:r>
+    </w:p>
+  </w:body>
+</w:document>
+""",
+    "whitespace in t kept": f"<w:r {W}><w:t>   </w:t><w:t>\n\t</w:t><w:t></w:t></w:r>",
+    "comments dropped": f"<w:p {W}><!-- a --><w:r><!--b--><w:t>x</w:t></w:r></w:p>",
+    "comments in t kept": f"<w:p {W}><w:t>a<!-- kept -->b</w:t></w:p>",
+    "comments outside root kept": f"<!-- before --><w:p {W}/><!-- after -->",
+    "comment splits text": f"<w:p {W}> <!--c--> x <!--c-->\n</w:p>",
+    "mixed content": f"<w:p {W}>lead <w:r/> \n <w:r/> tail</w:p>",
+    "escaping": f"""<w:p {W} w:val="a&amp;b&lt;c&gt;d&quot;e&apos;f">&amp; &lt; &gt; " ' &#169;</w:p>""",
+    "character references": f"<w:p {W} w:a='&#10;&#9;x'>&#32;&#10;<w:t>&#9;</w:t></w:p>",
+    "non-ascii": f"<w:p {W}><w:t>café — 日本 \U0001f600</w:t> </w:p>",
+    "unicode whitespace": f"<w:p {W}>  <w:r/>　</w:p>",
+    "namespace order": f'<w:p a="1" {W} b="2" xmlns="urn:x" {A}><a:t/><t/></w:p>',
+    "default namespace": '<Types xmlns="urn:ct">\n  <Default Extension="xml"/>\n</Types>',
+    "no namespace": "<root>\n  <child a='1'>\n    <t> </t>\n  </child>\n</root>",
+    "undeclared default": '<a xmlns="urn:x"><b xmlns=""> </b></a>',
+    "xml attributes": f'<w:t {W} xml:space="preserve"> x </w:t>',
+    "processing instructions": f"<?pi before?><w:p {W}> <?mso-x y ?> <?bare?></w:p>",
+    "cdata": f"<w:p {W}> <![CDATA[ ]]> x<![CDATA[a]]><![CDATA[<b>]]> </w:p>",
+    "empty cdata merges text": f"<w:p {W}> <![CDATA[]]> </w:p>",
+    "self closing": f"<w:p {W}><w:r></w:r><w:r/>\n</w:p>",
+    "ascii declaration with utf-8": f'<?xml version="1.0" encoding="ascii"?><w:t {W}>é</w:t>',
+    "byte order mark": f"﻿<w:p {W}/>",
+}
+
+
+class TestCondenseXmlBytes(unittest.TestCase):
+    def assert_same_as_minidom(self, data):
+        self.assertEqual(condense_xml_bytes(data), minidom_condense_xml_bytes(data))
+
+    def test_cases(self):
+        for name, text in CASES.items():
+            with self.subTest(name):
+                self.assert_same_as_minidom(text.encode("utf-8"))
+
+    def test_pretty_printed_cases(self):
+        for name, text in CASES.items():
+            with self.subTest(name):
+                data = text.encode("utf-8")
+                self.assert_same_as_minidom(unpack_pretty_print(data))
+
+    def test_utf8_pretty_printed_cases(self):
+        for name, text in CASES.items():
+            with self.subTest(name):
+                data = text.encode("utf-8")
+                pretty = unpack_pretty_print_utf8(data)
+                self.assertEqual(
+                    condense_xml_bytes(pretty), minidom_condense_xml_bytes(data)
+                )
+        pretty = unpack_pretty_print_utf8(CASES["non-ascii"].encode("utf-8"))
+        self.assertIn("café — 日本 \U0001f600".encode("utf-8"), pretty)
+
+    def test_shipped_xml(self):
+        # Schemas and templates shipped with the skill: large, varied real XML
+        docx_dir = Path(__file__).resolve().parents[2]
+        files = sorted(docx_dir.glob("ooxml/schemas/**/*.xsd"))
+        files += sorted(docx_dir.glob("scripts/templates/*.xml"))
+        self.assertTrue(files)
+        for xml_file in files:
+            with self.subTest(xml_file.name):
+                data = xml_file.read_bytes()
+                self.assert_same_as_minidom(data)
+                self.assert_same_as_minidom(unpack_pretty_print(data))
+                self.assertEqual(
+                    condense_xml_bytes(unpack_pretty_print_utf8(data)),
+                    minidom_condense_xml_bytes(data),
+                )
+
+    def test_malformed_xml_raises(self):
+        for data in [b"<a>", b"<a></b>", b"<x:a/>", b"text", b""]:
+            with self.subTest(data):
+                with self.assertRaises(xml.parsers.expat.ExpatError):
+                    condense_xml_bytes(data)
+
+    def test_entity_declarations_rejected(self):
+        billion_laughs = b"""<!DOCTYPE a [<!ENTITY l "lol"><!ENTITY l2 "&l;&l;">]><a>&l2;</a>"""
+        external = b"""<!DOCTYPE a [<!ENTITY x SYSTEM "file:///etc/passwd">]><a>&x;</a>"""
+        for data in [billion_laughs, external]:
+            with self.subTest(data):
+                with self.assertRaises(defusedxml.DefusedXmlException):
+                    condense_xml_bytes(data)
+
+    def test_undefined_entity_raises(self):
+        with self.assertRaises(xml.parsers.expat.ExpatError):
+            condense_xml_bytes(b"<a>&nbsp;</a>")
+
+
+class TestPackDocument(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+
+        self.input_dir = self.temp_dir / "unpacked"
+        parts = {
+            "[Content_Types].xml": CASES["default namespace"],
+            "_rels/.rels": CASES["no namespace"],
+            "word/document.xml": CASES["pretty printed"],
+            "word/media/image1.png": "\x89PNG" + "x" * 5000,
+        }
+        for i in range(20):
+            parts[f"word/part{i}.xml"] = CASES["mixed content"]
+        for name, text in parts.items():
+            path = self.input_dir / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(text.encode("utf-8"))
+
+    def test_parallel_output_identical_to_serial(self):
+        serial = self.temp_dir / "serial.docx"
+        parallel = self.temp_dir / "parallel.docx"
+        pack_document(self.input_dir, serial)
+        pack_document(self.input_dir, parallel, jobs=3)
+        self.assertEqual(serial.read_bytes(), parallel.read_bytes())
+
+    def test_members_condensed(self):
+        output_file = self.temp_dir / "packed.docx"
+        pack_document(self.input_dir, output_file, jobs=2)
+        with zipfile.ZipFile(output_file) as zf:
+            self.assertIsNone(zf.testzip())
+            for path in self.input_dir.rglob("*"):
+                if not path.is_file():
+                    continue
+                data = path.read_bytes()
+                if path.name.endswith((".xml", ".rels")):
+                    data = minidom_condense_xml_bytes(data)
+                arcname = path.relative_to(self.input_dir).as_posix()
+                self.assertEqual(zf.read(arcname), data)
+
+    def test_reproducible(self):
+        first = self.temp_dir / "first.docx"
+        second = self.temp_dir / "second.docx"
+        pack_document(self.input_dir, first)
+        for path in self.input_dir.rglob("*"):
+            os.utime(path, (0, 1_000_000_000))
+            if path.is_file():
+                path.chmod(0o600)
+        pack_document(self.input_dir, second)
+        self.assertEqual(first.read_bytes(), second.read_bytes())
+
+    def test_member_order_and_compression(self):
+        output_file = self.temp_dir / "packed.docx"
+        pack_document(self.input_dir, output_file, compresslevel=9)
+        with zipfile.ZipFile(output_file) as zf:
+            names = zf.namelist()
+            self.assertEqual(names[0], "[Content_Types].xml")
+            self.assertEqual(names[1:], sorted(names[1:]))
+            for info in zf.infolist():
+                self.assertEqual(info.date_time, (1980, 1, 1, 0, 0, 0))
+                expected = (
+                    zipfile.ZIP_STORED
+                    if info.filename.endswith(".png")
+                    else zipfile.ZIP_DEFLATED
+                )
+                self.assertEqual(info.compress_type, expected, info.filename)
+
+    def test_unchanged_members_copied_from_original(self):
+        (self.input_dir / "word/media/image2.emf").write_bytes(b"EMF" * 5000)
+        original = self.temp_dir / "original.docx"
+        pack_document(self.input_dir, original, compresslevel=1)
+
+        (self.input_dir / "word/part3.xml").write_bytes(b"<changed/>")
+        output_file = self.temp_dir / "repacked.docx"
+        pack_document(self.input_dir, output_file, original=original)
+
+        with zipfile.ZipFile(original) as before, zipfile.ZipFile(output_file) as after:
+            self.assertIsNone(after.testzip())
+            self.assertEqual(
+                after.read("word/part3.xml"), minidom_condense_xml_bytes(b"<changed/>")
+            )
+            for info in after.infolist():
+                if info.filename == "word/part3.xml":
+                    continue
+                # Compressed at level 1 there, so only the same size if copied
+                self.assertEqual(
+                    info.compress_size,
+                    before.getinfo(info.filename).compress_size,
+                    info.filename,
+                )
+                self.assertEqual(after.read(info), before.read(info.filename))
+
+    def test_unedited_parts_copied_using_unpack_manifest(self):
+        original = self.temp_dir / "original.docx"
+        pack_document(self.input_dir, original, compresslevel=1)
+        unpacked = self.temp_dir / "reunpacked"
+        unpack_document(original, unpacked)
+        manifest = read_manifest(unpacked)
+        self.assertEqual(manifest["source"], str(original.resolve()))
+        self.assertEqual(len(manifest["parts"]), 24)
+
+        (unpacked / "word/part3.xml").write_bytes(b"<changed/>")
+        output_file = self.temp_dir / "repacked.docx"
+        pack_document(unpacked, output_file, original=original)
+
+        with zipfile.ZipFile(original) as before, zipfile.ZipFile(output_file) as after:
+            self.assertNotIn(MANIFEST_NAME, after.namelist())
+            self.assertEqual(after.namelist(), before.namelist())
+            for info in after.infolist():
+                if info.filename == "word/part3.xml":
+                    self.assertEqual(
+                        after.read(info), minidom_condense_xml_bytes(b"<changed/>")
+                    )
+                    continue
+                self.assertEqual(
+                    info.compress_size,
+                    before.getinfo(info.filename).compress_size,
+                    info.filename,
+                )
+
+    def test_original_only_used_when_given(self):
+        original = self.temp_dir / "original.docx"
+        pack_document(self.input_dir, original, compresslevel=1)
+        unpacked = self.temp_dir / "reunpacked"
+        unpack_document(original, unpacked)
+
+        output_file = self.temp_dir / "repacked.docx"
+        pack_document(unpacked, output_file)  # The manifest names the original
+        with zipfile.ZipFile(original) as before, zipfile.ZipFile(output_file) as after:
+            info = after.getinfo("word/document.xml")
+            self.assertNotEqual(
+                info.compress_size, before.getinfo(info.filename).compress_size
+            )
+
+    def test_member_with_same_crc_and_size_not_copied(self):
+        original = self.temp_dir / "original.docx"
+        pack_document(self.input_dir, original)
+        # XORing the CRC-32 polynomial into the data keeps its CRC and size
+        image = self.input_dir / "word/media/image1.png"
+        data = bytearray(image.read_bytes())
+        for i, byte in enumerate((0x1DB710641).to_bytes(5, "little")):
+            data[100 + i] ^= byte
+        image.write_bytes(data)
+
+        output_file = self.temp_dir / "repacked.docx"
+        pack_document(self.input_dir, output_file, original=original)
+        with zipfile.ZipFile(original) as before, zipfile.ZipFile(output_file) as after:
+            self.assertEqual(
+                after.getinfo("word/media/image1.png").CRC,
+                before.getinfo("word/media/image1.png").CRC,
+            )
+            self.assertEqual(after.read("word/media/image1.png"), bytes(data))
+
+    def test_package_edited_in_memory_and_saved_over_original(self):
+        original = self.temp_dir / "original.docx"
+        pack_document(self.input_dir, original, compresslevel=1)
+        before = {}
+        with zipfile.ZipFile(original) as zf:
+            for info in zf.infolist():
+                before[info.filename] = (info.compress_size, zf.read(info))
+
+        with Package(original) as package:
+            package.write("word/part3.xml", b"<changed/>")
+            package.write("word/added.xml", b"<added/>")
+            package.delete("word/part4.xml")
+            self.assertEqual(
+                package.modified_names(),
+                ["word/added.xml", "word/part3.xml", "word/part4.xml"],
+            )
+            self.assertEqual(package.read("_rels/.rels"), before["_rels/.rels"][1])
+            package.save(original)  # Written aside, then moved over the original
+
+        with zipfile.ZipFile(original) as after:
+            self.assertIsNone(after.testzip())
+            names = after.namelist()
+            self.assertNotIn("word/part4.xml", names)
+            self.assertEqual(
+                after.read("word/added.xml"), minidom_condense_xml_bytes(b"<added/>")
+            )
+            self.assertEqual(
+                after.read("word/part3.xml"), minidom_condense_xml_bytes(b"<changed/>")
+            )
+            for info in after.infolist():
+                if info.filename in ("word/added.xml", "word/part3.xml"):
+                    continue
+                self.assertEqual(
+                    (info.compress_size, after.read(info)),
+                    before[info.filename],
+                    info.filename,
+                )
+        self.assertEqual(list(self.temp_dir.glob(".original*")), [])
+
+
+class TestArchiveWriter(unittest.TestCase):
+    MEMBERS = {
+        "[Content_Types].xml": b"<Types/>",
+        "empty.xml": b"",
+        "word/m\u00e9dia/\u56fe\u50cf.png": b"\x89PNG" + bytes(range(256)) * 20,
+        "word/document.xml": b"<w:document>" + b"text " * 2000 + b"</w:document>",
+    }
+
+    def write(self, compress_type, **limits):
+        """Write MEMBERS with an _ArchiveWriter, with its limits overridden."""
+        fp = io.BytesIO()
+        archive = _ArchiveWriter(fp)
+        for name, value in limits.items():
+            setattr(archive, name, value)
+        for name, data in self.MEMBERS.items():
+            compressed = data
+            if compress_type == zipfile.ZIP_DEFLATED:
+                compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+                compressed = compressor.compress(data) + compressor.flush()
+            archive.add(name, compress_type, zlib.crc32(data), len(data), compressed)
+        archive.close()
+        return fp.getvalue()
+
+    def write_with_zipfile(self):
+        """Write MEMBERS stored, with ZipFile, as _ArchiveWriter would.
+
+        ZipFile gives every member file attributes, which are zeroed here.
+        """
+        fp = io.BytesIO()
+        with zipfile.ZipFile(fp, "w") as zf:
+            for name, data in self.MEMBERS.items():
+                info = zipfile.ZipInfo(name, MEMBER_DATE_TIME)
+                info.create_system = 0
+                zf.writestr(info, data)
+            offset = zf.start_dir
+        data = bytearray(fp.getvalue())
+        for _ in self.MEMBERS:
+            # Central directory header: name, extra and comment lengths, then
+            # disk number, internal and external attributes
+            lengths = struct.unpack_from("<3H", data, offset + 28)
+            data[offset + 38 : offset + 42] = bytes(4)
+            offset += 46 + sum(lengths)
+        return bytes(data)
+
+    def assert_round_trip(self, data):
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(zf.namelist(), list(self.MEMBERS))
+            for name, member in self.MEMBERS.items():
+                self.assertEqual(zf.read(name), member, name)
+                self.assertEqual(zf.getinfo(name).file_size, len(member), name)
+
+    def test_round_trip(self):
+        for compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            with self.subTest(compress_type=compress_type):
+                self.assert_round_trip(self.write(compress_type))
+
+    def test_stored_members_as_zipfile_writes_them(self):
+        self.assertEqual(self.write(zipfile.ZIP_STORED), self.write_with_zipfile())
+
+    def test_zip64(self):
+        # Limits low enough for the members to need ZIP64 extensions in each
+        # record: large members, offsets, and the number of members
+        limits = {"ZIP64_LIMIT": 1000, "FILE_COUNT_LIMIT": 3}
+        for compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            with self.subTest(compress_type=compress_type):
+                self.assert_round_trip(self.write(compress_type, **limits))
+        with (
+            mock.patch("zipfile.ZIP64_LIMIT", 1000),
+            mock.patch("zipfile.ZIP_FILECOUNT_LIMIT", 3),
+        ):
+            self.assertEqual(
+                self.write(zipfile.ZIP_STORED, **limits), self.write_with_zipfile()
+            )
+            self.assert_round_trip(self.write_with_zipfile())
+
+
+class TestCheckPackageStructure(unittest.TestCase):
+    CONTENT_TYPES = (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/xml"/>'
+        "</Types>"
+    )
+    RELS = (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="t" Target="{target}"/>'
+        '<Relationship Id="rId2" Type="t" Target="https://example.com" TargetMode="External"/>'
+        "</Relationships>"
+    )
+
+    def check(self, members):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            doc_path = Path(temp_dir) / "doc.docx"
+            with zipfile.ZipFile(doc_path, "w") as zf:
+                for name, text in members.items():
+                    zf.writestr(name, text)
+            return check_package_structure(doc_path)
+
+    def test_sound_package(self):
+        members = {
+            "[Content_Types].xml": self.CONTENT_TYPES,
+            "_rels/.rels": self.RELS.format(target="word/document.xml"),
+            "word/document.xml": "<document/>",
+            "word/_rels/document.xml.rels": self.RELS.format(target="../word/document.xml"),
+        }
+        self.assertEqual(self.check(members), [])
+
+    def test_problems_reported(self):
+        members = {
+            "[Content_Types].xml": self.CONTENT_TYPES,
+            "_rels/.rels": self.RELS.format(target="/word/missing.xml"),
+            "word/document.xml": "<document>",
+            "word/media/image1.png": "png",
+        }
+        errors = self.check(members)
+        self.assertEqual(len(errors), 3, errors)
+        self.assertTrue(errors[0].startswith("word/document.xml: "))
+        self.assertIn("word/media/image1.png: No content type declared", errors)
+        self.assertIn(
+            "_rels/.rels: Relationship rId1 targets missing part word/missing.xml", errors
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from soffice_pool import SofficePool, fcntl
+
+# Stands in for soffice: creates profiles, runs as a worker until killed and
+# logs jobs. A single process, whose command line has the profile as soffice's
+FAKE_SOFFICE = """
+import os
+import sys
+import time
+from pathlib import Path
+
+for arg in sys.argv[1:]:
+    if arg.startswith("-env:UserInstallation=file://"):
+        profile = Path(arg.split("file://", 1)[1])
+if "--terminate_after_init" in sys.argv:
+    (profile / "user").mkdir(parents=True)
+elif any(arg.startswith("--accept=") for arg in sys.argv):
+    (profile / ".lock").touch()
+    time.sleep(600)
+elif "hang" in sys.argv:
+    time.sleep(600)
+else:
+    with open(os.environ["FAKE_SOFFICE_LOG"], "a") as log:
+        log.write(" ".join([str(profile), *sys.argv[2:]]) + "\\n")
+"""
+
+
+@unittest.skipUnless(
+    fcntl is not None and Path("/proc/self/cmdline").exists(),
+    "The pool needs flock and /proc",
+)
+class TestSofficePool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        bin_dir = self.temp_dir / "bin"
+        bin_dir.mkdir()
+        soffice = bin_dir / "soffice"
+        soffice.write_text(f"#!{sys.executable}{FAKE_SOFFICE}")
+        soffice.chmod(0o755)
+        self.log = self.temp_dir / "jobs.log"
+        environ = {
+            "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+            "FAKE_SOFFICE_LOG": str(self.log),
+        }
+        patcher = mock.patch.dict(os.environ, environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.pool = SofficePool(self.temp_dir / "pool", startup_timeout=10)
+        self.addCleanup(self.pool.stop)
+
+    def pids(self):
+        return [worker["pid"] for worker in self.pool.status() if worker["alive"]]
+
+    def jobs(self):
+        """Return the worker of each job run, in order."""
+        lines = self.log.read_text().splitlines() if self.log.exists() else []
+        return [int(line.split()[0].split("-")[-2]) for line in lines]
+
+    def test_start_and_stop(self):
+        self.pool.start(2)
+        self.assertTrue(self.pool.is_running())
+        pids = self.pids()
+        self.assertEqual(len(pids), 2)
+
+        self.pool.stop()
+        self.assertFalse(self.pool.is_running())
+        self.assertFalse(self.pool.pool_dir.exists())
+        for pid in pids:
+            with self.assertRaises(ProcessLookupError):
+                os.kill(pid, 0)
+
+    def test_all_workers_busy(self):
+        self.pool.start(2)
+        code = (
+            "import sys\n"
+            "from soffice_pool import SofficePool\n"
+            "with SofficePool(sys.argv[1])._acquire() as worker:\n"
+            "    print(worker)\n"
+        )
+        command = [sys.executable, "-c", code, str(self.pool.pool_dir)]
+        with self.pool._acquire() as first, self.pool._acquire() as second:
+            self.assertEqual({first, second}, {0, 1})
+            waiting = subprocess.Popen(
+                command, stdout=subprocess.PIPE, text=True, cwd=Path(__file__).parent
+            )
+            self.addCleanup(waiting.kill)
+            with self.assertRaises(subprocess.TimeoutExpired):
+                waiting.communicate(timeout=1)
+        # Queued on one worker, spreading waiting processes over the pool
+        stdout, _ = waiting.communicate(timeout=10)
+        self.assertEqual(int(stdout), waiting.pid % 2)
+
+    def test_jobs_run_on_free_workers(self):
+        self.pool.start(2)
+        with self.pool._acquire() as busy:
+            self.pool.run(["--convert-to", "pdf", "a.docx"], timeout=10)
+        self.pool.run(["--convert-to", "pdf", "b.docx"], timeout=10)
+        self.assertEqual(self.jobs(), [1 - busy, 0])
+        self.assertIn("--convert-to pdf a.docx", self.log.read_text())
+
+    def test_dead_worker_started_again(self):
+        self.pool.start(1)
+        [pid] = self.pids()
+        os.killpg(pid, 9)
+        os.waitpid(pid, 0)
+        self.pool.run(["job"], timeout=10)
+        [new_pid] = self.pids()
+        self.assertNotEqual(new_pid, pid)
+        self.assertEqual(self.jobs(), [0])
+
+    def test_setup_changing_profile_restarts_worker(self):
+        self.pool.start(1)
+        [pid] = self.pids()
+        profiles = []
+
+        def unchanged(profile_dir):
+            profiles.append(profile_dir)
+            return False
+
+        self.pool.run(["job"], timeout=10, setup=unchanged)
+        self.assertEqual(self.pids(), [pid])
+        self.assertEqual(profiles, [self.pool._profile_dir(0)])
+
+        self.pool.run(["job"], timeout=10, setup=lambda profile_dir: True)
+        [new_pid] = self.pids()
+        self.assertNotEqual(new_pid, pid)
+
+    def test_overrun_job_stops_worker(self):
+        self.pool.start(1)
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.pool.run(["hang"], timeout=1)
+        self.assertEqual(self.pids(), [])
+        self.pool.run(["job"], timeout=10)
+        self.assertEqual(len(self.pids()), 1)
+
+
+class TestCopies(unittest.TestCase):
+    def test_xlsx_copy_identical(self):
+        this_copy = Path(__file__).resolve().with_name("soffice_pool.py")
+        xlsx_copy = this_copy.parents[3] / "xlsx" / "scripts" / "soffice_pool.py"
+        if not xlsx_copy.exists():
+            self.skipTest("The xlsx skill is not installed")
+        self.assertEqual(xlsx_copy.read_bytes(), this_copy.read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
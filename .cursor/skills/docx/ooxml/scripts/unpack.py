@@ -1,29 +1,233 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--only GLOB ...] [--jobs N] [--utf8]
+"""
+
+import argparse
+import hashlib
+import json
 import random
-import sys
-import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatchcase
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
+import defusedxml.minidom
+import lxml.etree
+
+# Written to the output directory: what each part was in the archive and when
+# unpacked. pack.py and the validators leave it out of the document.
+MANIFEST_NAME = ".unpack-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack an Office file and pretty-print its XML parts"
+    )
+    parser.add_argument("input_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="GLOB",
+        help="Only unpack members whose name matches one of these globs, "
+        "e.g. word/document.xml 'word/_rels/*'",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes pretty-printing XML parts (default: 1)",
+    )
+    parser.add_argument(
+        "--utf8",
+        action="store_true",
+        help="Write XML parts as UTF-8 instead of escaping non-ASCII characters",
+    )
+    args = parser.parse_args()
+
+    unpack_document(
+        args.input_file, args.output_dir, only=args.only, jobs=args.jobs, utf8=args.utf8
+    )
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.input_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, only=None, jobs=1, utf8=False):
+    """Extract an Office file and pretty-print its XML parts.
+
+    A manifest of the extracted parts is written to MANIFEST_NAME in output_dir,
+    recording each part as it was in the archive and as it was unpacked, so
+    later steps can tell which parts have been edited (see is_unchanged).
+
+    Args:
+        input_file: Path to the Office file
+        output_dir: Directory to extract into (created if needed)
+        only: Globs matched against member names, like "word/*.xml"; only
+            matching members are extracted (default: all members)
+        jobs: Number of processes pretty-printing XML parts (default: 1)
+        utf8: Write XML parts as UTF-8 with pretty_print_xml_utf8 instead of
+            ASCII with character references (default: False)
+
+    Returns:
+        list: Paths of the extracted files
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    # Extract
+    with zipfile.ZipFile(input_file) as zf:
+        members = [
+            info
+            for info in zf.infolist()
+            if only is None or any(fnmatchcase(info.filename, p) for p in only)
+        ]
+        extracted = {
+            info: Path(zf.extract(info, output_path))
+            for info in members
+            if not info.is_dir() or only is None
+        }
+    extracted = {info: f for info, f in extracted.items() if f.is_file()}
+
+    # Pretty print all XML files, hashing each part before and after
+    files = list(extracted.values())
+    modes = [utf8] * len(files)
+    if jobs <= 1:
+        entries = list(map(_unpack_part, files, modes))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            entries = list(executor.map(_unpack_part, files, modes, chunksize=4))
+
+    # Record the parts, keeping those of an earlier --only unpack of the same file
+    source = str(Path(input_file).resolve())
+    manifest = read_manifest(output_path)
+    if manifest is None or manifest["source"] != source:
+        manifest = {"version": MANIFEST_VERSION, "source": source, "parts": {}}
+    for info, entry in zip(extracted, entries):
+        manifest["parts"][info.filename] = {
+            "size": info.file_size,
+            "crc": info.CRC,
+            "compress_type": info.compress_type,
+            **entry,
+        }
+    (output_path / MANIFEST_NAME).write_text(json.dumps(manifest, indent=1))
+
+    return files
 
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
 
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
+def read_manifest(unpacked_dir):
+    """Return the manifest unpack_document wrote to a directory, or None.
+
+    The manifest is a dict with the "source" file that was unpacked and its
+    "parts": member name -> {"size", "crc", "compress_type", "sha256"} of the
+    member in the archive and {"unpacked_size", "unpacked_sha256"} of the file
+    it was unpacked to.
+    """
+    try:
+        manifest = json.loads((Path(unpacked_dir) / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def is_unchanged(path, entry):
+    """Return True if an unpacked file still holds the part as unpack_document wrote it.
+
+    Args:
+        path: The file of the part
+        entry: The part's entry in the manifest (see read_manifest)
+    """
+    try:
+        # Only files of the recorded size are read and hashed
+        if Path(path).stat().st_size != entry["unpacked_size"]:
+            return False
+        digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return False
+    return digest == entry["unpacked_sha256"]
+
+
+def _unpack_part(path, utf8=False):
+    """Pretty-print an extracted XML part and return its hashes for the manifest."""
+    data = path.read_bytes()
+    entry = {"sha256": hashlib.sha256(data).hexdigest()}
+    if path.name.endswith((".xml", ".rels")):
+        if utf8:
+            pretty_print_xml_utf8(path)
+        else:
+            pretty_print_xml(path)
+        data = path.read_bytes()
+    entry["unpacked_size"] = len(data)
+    entry["unpacked_sha256"] = hashlib.sha256(data).hexdigest()
+    return entry
+
+
+def pretty_print_xml(xml_file):
+    """Rewrite an XML file indented, with non-ASCII characters as references."""
+    content = Path(xml_file).read_text(encoding="utf-8")
     dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+    Path(xml_file).write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+
+
+def pretty_print_xml_utf8(xml_file):
+    """Rewrite an XML file indented, keeping it UTF-8.
+
+    Indentation only goes where pack.py's condense_xml removes it again: into
+    elements whose text between children is all whitespace, except *:t
+    elements. Mixed content, text and comments are left untouched, so packing
+    the file gives the same part as packing it unformatted. Parts with CDATA
+    sections are only re-encoded, as lxml can't tell CDATA and text apart.
+    """
+    data = Path(xml_file).read_bytes()
+    parser = lxml.etree.XMLParser(
+        encoding="utf-8",
+        resolve_entities=False,
+        no_network=True,
+        strip_cdata=False,
+        huge_tree=True,
+    )
+    tree = lxml.etree.fromstring(data, parser).getroottree()
+    if b"<![CDATA[" not in data:
+        _indent(tree.getroot(), 0)
+
+    declaration = '<?xml version="1.0" encoding="UTF-8"'
+    if tree.docinfo.standalone is not None:
+        declaration += ' standalone="%s"' % ("yes" if tree.docinfo.standalone else "no")
+    Path(xml_file).write_bytes(
+        declaration.encode() + b"?>\n" + lxml.etree.tostring(tree, encoding="UTF-8")
+    )
+
+
+def _indent(element, level):
+    """Indent the children of element and its descendants, like toprettyxml."""
+    children = list(element)
+    if not children:
+        return
+    if element.prefix is None or lxml.etree.QName(element).localname != "t":
+        if _is_blank(element.text) and all(_is_blank(c.tail) for c in children):
+            indent = "\n" + "  " * (level + 1)
+            element.text = indent
+            for child in children:
+                child.tail = indent
+            children[-1].tail = "\n" + "  " * level
+    for child in children:
+        if isinstance(child.tag, str):
+            _indent(child, level + 1)
+
+
+def _is_blank(text):
+    # Same test as condense_xml, which drops these text nodes
+    return not text or text.strip() == ""
+
 
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from unpack import MANIFEST_NAME, is_unchanged, read_manifest, unpack_document
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+MEMBERS = {
+    "[Content_Types].xml": "<Types/>",
+    "word/document.xml": f"<w:document {W}><w:body><w:p/></w:body></w:document>",
+    "word/styles.xml": f"<w:styles {W}/>",
+    "word/_rels/document.xml.rels": "<Relationships/>",
+    "word/media/image1.png": "\x89PNG" + "x" * 100,
+    "word/media/IMAGE2.PNG": "\x89PNG" + "y" * 100,
+}
+
+
+class TestUnpackDocument(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+
+        self.input_file = self.temp_dir / "input.docx"
+        with zipfile.ZipFile(self.input_file, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, text in MEMBERS.items():
+                zf.writestr(name, text)
+
+    def unpacked(self, output_dir):
+        """Return the unpacked files by relative POSIX path, without the manifest."""
+        return {
+            path.relative_to(output_dir).as_posix(): path.read_bytes()
+            for path in sorted(output_dir.rglob("*"))
+            if path.is_file() and path.name != MANIFEST_NAME
+        }
+
+    def test_all_members(self):
+        output_dir = self.temp_dir / "unpacked"
+        unpack_document(self.input_file, output_dir)
+        self.assertEqual(set(self.unpacked(output_dir)), set(MEMBERS))
+
+    def test_only(self):
+        output_dir = self.temp_dir / "unpacked"
+        files = unpack_document(
+            self.input_file, output_dir, only=["word/*.xml", "*.png"]
+        )
+        # "*" matches "/" too, and matching is case-sensitive
+        self.assertEqual(
+            set(self.unpacked(output_dir)),
+            {"word/document.xml", "word/styles.xml", "word/media/image1.png"},
+        )
+        self.assertEqual(len(files), 3)
+
+    def test_jobs(self):
+        serial = self.temp_dir / "serial"
+        parallel = self.temp_dir / "parallel"
+        unpack_document(self.input_file, serial)
+        unpack_document(self.input_file, parallel, jobs=3)
+        self.assertEqual(self.unpacked(parallel), self.unpacked(serial))
+        self.assertEqual(read_manifest(parallel), read_manifest(serial))
+
+    def test_manifest(self):
+        output_dir = self.temp_dir / "unpacked"
+        unpack_document(self.input_file, output_dir)
+        manifest = read_manifest(output_dir)
+        self.assertEqual(manifest["source"], str(self.input_file.resolve()))
+
+        with zipfile.ZipFile(self.input_file) as zf:
+            infos = zf.infolist()
+            self.assertEqual(set(manifest["parts"]), {info.filename for info in infos})
+            for info in infos:
+                entry = manifest["parts"][info.filename]
+                data = (output_dir / info.filename).read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                self.assertEqual(entry["size"], info.file_size)
+                self.assertEqual(entry["crc"], info.CRC)
+                self.assertEqual(entry["compress_type"], info.compress_type)
+                member_digest = hashlib.sha256(zf.read(info)).hexdigest()
+                self.assertEqual(entry["sha256"], member_digest)
+                self.assertEqual(entry["unpacked_size"], len(data))
+                self.assertEqual(entry["unpacked_sha256"], digest)
+
+    def test_manifest_of_only_unpacks_merged(self):
+        output_dir = self.temp_dir / "unpacked"
+        unpack_document(self.input_file, output_dir, only=["word/document.xml"])
+        unpack_document(self.input_file, output_dir, only=["word/styles.xml"])
+        self.assertEqual(
+            set(read_manifest(output_dir)["parts"]),
+            {"word/document.xml", "word/styles.xml"},
+        )
+
+    def test_no_manifest(self):
+        output_dir = self.temp_dir / "unpacked"
+        self.assertIsNone(read_manifest(output_dir))
+        unpack_document(self.input_file, output_dir)
+        manifest_file = output_dir / MANIFEST_NAME
+        manifest_file.write_text(json.dumps({"version": 0, "parts": {}}))
+        self.assertIsNone(read_manifest(output_dir))
+        manifest_file.write_text("{")
+        self.assertIsNone(read_manifest(output_dir))
+
+    def test_is_unchanged(self):
+        output_dir = self.temp_dir / "unpacked"
+        unpack_document(self.input_file, output_dir)
+        parts = read_manifest(output_dir)["parts"]
+        for name, entry in parts.items():
+            self.assertTrue(is_unchanged(output_dir / name, entry), name)
+
+        # Edited to the same size, so only the hash tells
+        document = output_dir / "word" / "document.xml"
+        document.write_bytes(document.read_bytes().replace(b"w:p", b"w:r"))
+        self.assertFalse(is_unchanged(document, parts["word/document.xml"]))
+
+        styles = output_dir / "word" / "styles.xml"
+        styles.write_bytes(styles.read_bytes() + b"\n")
+        self.assertFalse(is_unchanged(styles, parts["word/styles.xml"]))
+
+        image = output_dir / "word" / "media" / "image1.png"
+        image.unlink()
+        self.assertFalse(is_unchanged(image, parts["word/media/image1.png"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
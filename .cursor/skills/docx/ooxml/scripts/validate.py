@@ -4,24 +4,38 @@ Command line tool to validate Office document XML files against XSD schemas and
 
 Usage:
     python validate.py <dir> --original <original_file>
+    python validate.py <modified_file> --original <original_file>
+    python validate.py - --original <original_file> < modified_file
+
+Warm server mode (keeps the interpreter, lxml and compiled schemas loaded):
+    python validate.py --serve /tmp/ooxml.sock
+    python validate.py --connect /tmp/ooxml.sock <dir> --original <original_file>
 """
 
 import argparse
+import base64
+import io
+import json
+import os
+import socket
+import socketserver
 import sys
+import traceback
+import zipfile
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
-
 
-def main():
+def build_parser():
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "unpacked_dir",
-        help="Path to unpacked Office document directory",
+        nargs="?",
+        help="Path to unpacked Office document directory, or to a packaged "
+        "document (.docx/.pptx/.xlsx) to validate without unpacking; "
+        "'-' reads the packaged document from stdin",
     )
     parser.add_argument(
         "--original",
-        required=True,
         help="Path to original file (.docx/.pptx/.xlsx)",
     )
     parser.add_argument(
@@ -30,39 +44,268 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "--no-baseline-cache",
+        action="store_true",
+        help="Don't use the on-disk cache of XSD errors in the original file",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip per-part checks for parts unchanged from the original file",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for XSD validation (default: 1)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Check document.xml in a single streaming pass "
+        "(default: only when it is larger than 64 MB); XSD validation still "
+        "builds the full tree",
+    )
+    server_group = parser.add_mutually_exclusive_group()
+    server_group.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        help="Run a validation server on a Unix socket instead of validating",
+    )
+    server_group.add_argument(
+        "--connect",
+        metavar="SOCKET",
+        help="Send this validation to the server listening on a Unix socket",
+    )
+    return parser
+
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
 
+    if args.serve:
+        serve(args.serve)
+        return
+
+    if args.unpacked_dir is None or args.original is None:
+        parser.error("unpacked_dir and --original are required")
+
+    if args.connect:
+        sys.exit(connect(args.connect, sys.argv[1:], args))
+
+    sys.exit(run_from_args(args))
+
+
+def run_from_args(args):
+    """Check the paths in parsed arguments, run the validation and return the exit code."""
     # Validate paths
-    unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
     file_extension = original_file.suffix.lower()
-    assert unpacked_dir.is_dir(), f"Error: {unpacked_dir} is not a directory"
+    if args.unpacked_dir == "-":
+        unpacked_dir = sys.stdin.buffer.read()
+    else:
+        unpacked_dir = Path(args.unpacked_dir)
+        assert unpacked_dir.is_dir() or zipfile.is_zipfile(unpacked_dir), (
+            f"Error: {unpacked_dir} is not a directory or a packaged document"
+        )
     assert original_file.is_file(), f"Error: {original_file} is not a file"
     assert file_extension in [".docx", ".pptx", ".xlsx"], (
         f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
     )
+    if file_extension not in [".docx", ".pptx"]:
+        print(f"Error: Validation not supported for file type {file_extension}")
+        return 1
+
+    success = run_validation(
+        unpacked_dir,
+        original_file,
+        verbose=args.verbose,
+        baseline_cache=not args.no_baseline_cache,
+        incremental=args.incremental,
+        jobs=args.jobs,
+        streaming=args.streaming,
+    )
+    return 0 if success else 1
+
+
+def run_validation(
+    unpacked_dir,
+    original_file,
+    verbose=False,
+    baseline_cache=False,
+    incremental=False,
+    jobs=1,
+    streaming=None,
+):
+    """Run all validators for the type of original_file, printing their report.
+
+    Returns:
+        bool: True if all validations passed
+    """
+    from validation import (
+        BaseSchemaValidator,
+        DOCXSchemaValidator,
+        PPTXSchemaValidator,
+        RedliningValidator,
+    )
 
     # Run validations
-    match file_extension:
+    match Path(original_file).suffix.lower():
         case ".docx":
             validators = [DOCXSchemaValidator, RedliningValidator]
         case ".pptx":
             validators = [PPTXSchemaValidator]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
+        case file_extension:
+            raise ValueError(f"Validation not supported for file type {file_extension}")
 
     # Run validators
     success = True
     for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
+        if issubclass(V, BaseSchemaValidator):
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=verbose,
+                baseline_cache=baseline_cache,
+                incremental=incremental,
+                jobs=jobs,
+                streaming=streaming,
+            )
+        else:
+            validator = V(unpacked_dir, original_file, verbose=verbose)
         if not validator.validate():
             success = False
 
     if success:
         print("All validations PASSED!")
 
-    sys.exit(0 if success else 1)
+    return success
+
+
+def serve(socket_path):
+    """Serve validation requests on a Unix socket until interrupted.
+
+    Schemas are compiled once, up front. Each request is handled in a forked
+    child, so it starts from the warm state and can't affect later requests.
+    """
+    # Load the validators (and lxml) once, before forking
+    from validation import SCHEMA_CACHE, BaseSchemaValidator
+
+    socket_path = Path(socket_path)
+    if socket_path.is_socket():
+        socket_path.unlink()  # Left over from a server that didn't shut down
+
+    schemas_dir = Path(__file__).parent.parent / "schemas"
+    SCHEMA_CACHE.warm(
+        sorted({schemas_dir / p for p in BaseSchemaValidator.SCHEMA_MAPPINGS.values()})
+    )
+
+    # Only the owner may submit validations: the socket is created with mode 0600
+    # by binding it under this umask, rather than restricted after it is bound
+    old_umask = os.umask(0o177)
+    try:
+        server = _ValidationServer(str(socket_path), _ValidationRequestHandler)
+    finally:
+        os.umask(old_umask)
+
+    with server:
+        print(f"Serving validation requests on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def connect(socket_path, argv, args):
+    """Send a validation request to a server, replay its output and return its exit code.
+
+    The client never imports the validators, so it starts quickly.
+    """
+    request = {"argv": argv, "cwd": os.getcwd()}
+    if args.unpacked_dir == "-":
+        request["stdin"] = base64.b64encode(sys.stdin.buffer.read()).decode("ascii")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError as e:
+            print(
+                f"Error: Cannot connect to validation server at {socket_path}: {e}",
+                file=sys.stderr,
+            )
+            return 1
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+        for line in sock.makefile("rb"):
+            message = json.loads(line)
+            if "stdout" in message:
+                sys.stdout.write(message["stdout"])
+                sys.stdout.flush()
+            elif "stderr" in message:
+                sys.stderr.write(message["stderr"])
+                sys.stderr.flush()
+            elif "exit" in message:
+                return message["exit"]
+
+    print("Error: Validation server closed the connection", file=sys.stderr)
+    return 1
+
+
+class _ValidationServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    pass
+
+
+class _ValidationRequestHandler(socketserver.StreamRequestHandler):
+    """Runs one validation in the forked child and streams its output back.
+
+    Protocol: the client sends one JSON line {"argv": [...], "cwd": "...",
+    "stdin": base64 (optional)}; the server answers with JSON lines
+    {"stdout": text} / {"stderr": text} and a final {"exit": code}.
+    """
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        sys.stdout = _MessageStream(self.wfile, "stdout")
+        sys.stderr = _MessageStream(self.wfile, "stderr")
+        stdin = base64.b64decode(request.get("stdin", ""))
+        sys.stdin = io.TextIOWrapper(io.BytesIO(stdin))
+
+        try:
+            os.chdir(request["cwd"])
+            args = build_parser().parse_args(request["argv"])
+            exit_code = run_from_args(args)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self.wfile.write(json.dumps({"exit": exit_code}).encode("utf-8") + b"\n")
+
+
+class _MessageStream(io.TextIOBase):
+    """Text stream that forwards everything written to it as JSON lines."""
+
+    def __init__(self, wfile, name):
+        self._wfile = wfile
+        self._name = name
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text:
+            message = json.dumps({self._name: text}).encode("utf-8") + b"\n"
+            self._wfile.write(message)
+        return len(text)
 
 
 if __name__ == "__main__":
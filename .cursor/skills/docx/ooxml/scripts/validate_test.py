@@ -0,0 +1,167 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from opc import Package
+from unpack import unpack_document
+from validate import run_validation
+
+VALIDATE = Path(__file__).with_name("validate.py")
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+PARTS = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/settings.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="http://schemas.'
+        'openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    ),
+    "word/_rels/document.xml.rels": (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="http://schemas.'
+        'openxmlformats.org/officeDocument/2006/relationships/settings" '
+        'Target="settings.xml"/></Relationships>'
+    ),
+    "word/document.xml": (
+        f'<w:document xmlns:w="{W}" xmlns:r="{R}"><w:body>'
+        + "".join(
+            f'<w:p><w:bookmarkStart w:id="{i}" w:name="b{i}"/>'
+            f"<w:r><w:t>Paragraph {i}</w:t></w:r>"
+            f'<w:bookmarkEnd w:id="{i}"/></w:p>'
+            for i in range(10)
+        )
+        + "<w:sectPr/></w:body></w:document>"
+    ),
+    "word/settings.xml": (
+        f'<w:settings xmlns:w="{W}"><w:zoom w:percent="100"/>'
+        '<w:defaultTabStop w:val="720"/></w:settings>'
+    ),
+}
+
+
+class TestValidate(unittest.TestCase):
+    """A broken document gives the same report however it is validated."""
+
+    @classmethod
+    def setUpClass(cls):
+        temp_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(temp_dir.cleanup)
+        cls.temp_dir = Path(temp_dir.name)
+        cls.environ = dict(
+            os.environ, OOXML_VALIDATION_CACHE_DIR=str(cls.temp_dir / "cache")
+        )
+
+        cls.original = cls.temp_dir / "original.docx"
+        with zipfile.ZipFile(cls.original, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, xml in PARTS.items():
+                zf.writestr(name, DECLARATION + xml)
+
+        # New errors in two parts: schema errors and a duplicate bookmark ID
+        cls.broken_dir = cls.temp_dir / "broken"
+        unpack_document(cls.original, cls.broken_dir)
+        document = cls.broken_dir / "word" / "document.xml"
+        document.write_text(
+            document.read_text()
+            .replace('<w:bookmarkStart w:id="3"', '<w:bookmarkStart w:id="2"')
+            .replace("<w:sectPr/>", "<w:p><w:foo/></w:p><w:sectPr/>")
+        )
+        settings = cls.broken_dir / "word" / "settings.xml"
+        settings.write_text(settings.read_text().replace("<w:zoom", "<w:bar/><w:zoom"))
+        # Zipped as is, not packed, so errors are reported on the same lines
+        cls.broken_file = cls.temp_dir / "broken.docx"
+        with zipfile.ZipFile(cls.broken_file, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name in PARTS:
+                zf.write(cls.broken_dir / name, name)
+
+        cls.serial = cls.validate("broken")
+
+    @classmethod
+    def validate(cls, *args, stdin=None):
+        """Run validate.py in the temp directory; return its exit code and stdout."""
+        result = subprocess.run(
+            [sys.executable, str(VALIDATE), *args, "--original", "original.docx"],
+            stdin=stdin,
+            capture_output=True,
+            text=True,
+            cwd=cls.temp_dir,
+            env=cls.environ,
+        )
+        return result.returncode, result.stdout
+
+    def test_serial_directory_run(self):
+        exit_code, report = self.serial
+        self.assertEqual(exit_code, 1)
+        self.assertIn("word/document.xml", report)
+        self.assertIn("word/settings.xml", report)
+        self.assertIn("}foo': This element is not expected", report)
+        self.assertIn("}bar': This element is not expected", report)
+        self.assertIn("Duplicate", report)
+
+    def test_valid_document(self):
+        self.assertEqual(self.validate("original.docx")[0], 0)
+
+    def test_jobs(self):
+        self.assertEqual(self.validate("broken", "-j", "2"), self.serial)
+
+    def test_archive(self):
+        self.assertEqual(self.validate("broken.docx"), self.serial)
+        self.assertEqual(self.validate("broken.docx", "-j", "2"), self.serial)
+        with open(self.broken_file, "rb") as stdin:
+            self.assertEqual(self.validate("-", stdin=stdin), self.serial)
+
+    def test_package(self):
+        stdout = io.StringIO()
+        with (
+            Package(self.broken_dir) as package,
+            mock.patch.dict(os.environ, self.environ),
+            contextlib.redirect_stdout(stdout),
+        ):
+            success = run_validation(package, self.original)
+        self.assertEqual((int(not success), stdout.getvalue()), self.serial)
+
+    def test_server(self):
+        socket_path = self.temp_dir / "validate.sock"
+        server = subprocess.Popen(
+            [sys.executable, str(VALIDATE), "--serve", str(socket_path)],
+            stderr=subprocess.DEVNULL,
+            cwd=self.temp_dir,
+            env=self.environ,
+        )
+        self.addCleanup(server.wait)
+        self.addCleanup(server.terminate)
+        deadline = time.monotonic() + 30
+        while not socket_path.is_socket():
+            self.assertIsNone(server.poll(), "The server exited")
+            self.assertLess(time.monotonic(), deadline, "The server didn't start")
+            time.sleep(0.1)
+
+        connect = ("--connect", str(socket_path))
+        self.assertEqual(self.validate(*connect, "broken"), self.serial)
+        self.assertEqual(self.validate(*connect, "broken", "-j", "2"), self.serial)
+        self.assertEqual(self.validate(*connect, "broken.docx"), self.serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
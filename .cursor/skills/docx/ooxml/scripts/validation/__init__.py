@@ -4,12 +4,17 @@ Validation modules for Word document processing.
 
 from .base import BaseSchemaValidator
 from .docx import DOCXSchemaValidator
+from .error_cache import BaselineErrorCache
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
+from .schema_cache import SCHEMA_CACHE, SchemaCache
 
 __all__ = [
     "BaseSchemaValidator",
+    "BaselineErrorCache",
     "DOCXSchemaValidator",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "SCHEMA_CACHE",
+    "SchemaCache",
 ]
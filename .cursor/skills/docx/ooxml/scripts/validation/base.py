@@ -2,11 +2,19 @@
 Base validator with common validation logic for document files.
 """
 
+import hashlib
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+from .baseline import BaselineReader
+from .error_cache import BaselineErrorCache
+from .parts import PartStore
+from .schema_cache import SCHEMA_CACHE
+from .source import open_source
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -81,6 +89,20 @@ class BaseSchemaValidator:
         "http://schemas.openxmlformats.org/package/2006/content-types"
     )
 
+    # Compiled XSD schemas, shared by all validators in the process
+    schema_cache = SCHEMA_CACHE
+
+    # Version of the XSD preprocessing below; bump it whenever a change could alter
+    # the errors reported for a part, so stale cached baseline errors are ignored
+    VALIDATOR_VERSION = 1
+
+    # File names of parts that may be checked in a single streaming pass instead
+    # of through a parsed tree; subclasses that implement _scan_part list them here
+    STREAMING_PARTS = set()
+
+    # Streamable parts at least this large are streamed unless streaming=False
+    STREAMING_THRESHOLD = 64 * 1024 * 1024
+
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
@@ -103,19 +125,67 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir).resolve()
-        self.original_file = Path(original_file)
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        memory_budget=PartStore.DEFAULT_MEMORY_BUDGET,
+        baseline_cache=False,
+        incremental=False,
+        jobs=1,
+        streaming=None,
+        xml_files=None,
+    ):
+        # The modified document: an unpacked directory, a packaged file (path or
+        # bytes) or an opc.Package, whose parts are read under a virtual root
+        self.document = unpacked_dir
+        self.source = open_source(unpacked_dir)
+        self.unpacked_dir = self.source.root
+        # The original: path to the packaged file, or an opc.Package
+        self.original_file = original_file
+        if isinstance(original_file, str):
+            self.original_file = Path(original_file)
         self.verbose = verbose
 
+        # Parsed XML parts shared by all checks of this validator
+        self.parts = PartStore(memory_budget=memory_budget, source=self.source)
+
+        # Parts of the original document, read from its archive on demand
+        self.baseline = BaselineReader(original_file, memory_budget=memory_budget)
+        self._original_errors = {}  # part name -> XSD errors in the original
+
+        # On-disk cache of baseline errors; True uses the shared default cache
+        # (validate.py does), False (the default) disables it, or pass a
+        # BaselineErrorCache instance
+        if baseline_cache is True:
+            baseline_cache = BASELINE_ERROR_CACHE
+        self.baseline_cache = baseline_cache or None
+
+        # In incremental mode, per-part checks skip parts whose normalized
+        # content is identical to the same part in the original
+        self.incremental = incremental
+        self._unchanged = {}  # path -> True if identical to the original part
+
+        # Number of worker processes for per-part XSD validation
+        self.jobs = max(1, jobs)
+
+        # Streaming of STREAMING_PARTS: None streams parts above STREAMING_THRESHOLD,
+        # True always streams them, False never does
+        self.streaming = streaming
+        self._scans = {}  # path -> StreamingPartScan
+
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
-        # Get all XML and .rels files
-        patterns = ["*.xml", "*.rels"]
-        self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
-        ]
+        # Get all XML and .rels files, unless the caller has them already
+        if xml_files is not None:
+            self.xml_files = [Path(f) for f in xml_files]
+        else:
+            patterns = ["*.xml", "*.rels"]
+            self.xml_files = [
+                f for pattern in patterns for f in self.source.rglob(pattern)
+            ]
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
@@ -131,7 +201,8 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                if self._streaming_scan(xml_file) is None:
+                    self.parts.get(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -157,13 +228,18 @@ class BaseSchemaValidator:
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._changed_files(self.xml_files):
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+                scan = self._streaming_scan(xml_file)
+                if scan is None:
+                    root = self.parts.get_root(xml_file)
+                    root_nsmap, root_attrib = root.nsmap, root.attrib
+                else:
+                    root_nsmap, root_attrib = scan.root_nsmap, scan.root_attrib
+                declared = set(root_nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
+                    v for k, v in root_attrib.items() if k.endswith("Ignorable")
                 ]:
                     undeclared = set(attr_val.split()) - declared
                     errors.extend(
@@ -189,75 +265,57 @@ class BaseSchemaValidator:
         global_ids = {}  # Track globally unique IDs across all files
 
         for xml_file in self.xml_files:
+            # Unchanged parts only contribute their globally unique IDs
+            unchanged = self._is_unchanged(xml_file)
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
                 file_ids = {}  # Track IDs that must be unique within this file
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
+                for tag, attrib, sourceline in self._id_elements(xml_file):
+                    attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
 
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
+                    # Look for the specified attribute
+                    id_value = None
+                    for attr, value in attrib:
+                        attr_local = (
+                            attr.split("}")[-1].lower() if "}" in attr else attr.lower()
+                        )
+                        if attr_local == attr_name:
+                            id_value = value
+                            break
+
+                    if id_value is not None:
+                        if scope == "global":
+                            # Check global uniqueness
+                            if id_value in global_ids:
+                                prev_file, prev_line, prev_tag = global_ids[
+                                    id_value
+                                ]
+                                errors.append(
+                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                                    f"Line {sourceline}: Global ID '{id_value}' in <{tag}> "
+                                    f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                                )
+                            else:
+                                global_ids[id_value] = (
+                                    xml_file.relative_to(self.unpacked_dir),
+                                    sourceline,
+                                    tag,
+                                )
+                        elif scope == "file" and not unchanged:
+                            # Check file-level uniqueness
+                            key = (tag, attr_name)
+                            if key not in file_ids:
+                                file_ids[key] = {}
+
+                            if id_value in file_ids[key]:
+                                prev_line = file_ids[key][id_value]
+                                errors.append(
+                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                                    f"Line {sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                                    f"(first occurrence at line {prev_line})"
+                                )
+                            else:
+                                file_ids[key][id_value] = sourceline
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
@@ -281,7 +339,7 @@ class BaseSchemaValidator:
         errors = []
 
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_files = self.source.rglob("*.rels")
 
         if not rels_files:
             if self.verbose:
@@ -290,13 +348,13 @@ class BaseSchemaValidator:
 
         # Get all files in the unpacked directory (excluding reference files)
         all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
+        for file_path in self.source.rglob("*"):
             if (
-                file_path.is_file()
+                self.source.is_file(file_path)
                 and file_path.name != "[Content_Types].xml"
                 and not file_path.name.endswith(".rels")
             ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+                all_files.append(self.source.resolve(file_path))
 
         # Track all files that are referenced by any .rels file
         all_referenced_files = set()
@@ -310,7 +368,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self.parts.get_root(rels_file)
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -339,8 +397,8 @@ class BaseSchemaValidator:
 
                         # Normalize the path and check if it exists
                         try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
+                            target_path = self.source.resolve(target_path)
+                            if self.source.is_file(target_path):
                                 referenced_files.add(target_path)
                                 all_referenced_files.add(target_path)
                             else:
@@ -390,8 +448,6 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
@@ -406,12 +462,16 @@ class BaseSchemaValidator:
             rels_file = rels_dir / f"{xml_file.name}.rels"
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if not self.source.is_file(rels_file):
+                continue
+
+            # Skip if neither the file nor its relationships changed
+            if self._is_unchanged(xml_file) and self._is_unchanged(rels_file):
                 continue
 
             try:
                 # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self.parts.get_root(rels_file)
                 rid_to_type = {}
 
                 for rel in rels_root.findall(
@@ -433,40 +493,30 @@ class BaseSchemaValidator:
                         )
                         rid_to_type[rid] = type_name
 
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+                # Find all elements with r:id attributes in the XML file
+                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+                for sourceline, elem_name, rid_attr in self._relationship_refs(
+                    xml_file
+                ):
+                    # Check if the ID exists
+                    if rid_attr not in rid_to_type:
+                        errors.append(
+                            f"  {xml_rel_path}: Line {sourceline}: "
+                            f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                            f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
                         )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
+                    # Check if we have type expectations for this element
+                    elif self.ELEMENT_RELATIONSHIP_TYPES:
+                        expected_type = self._get_expected_relationship_type(elem_name)
+                        if expected_type:
+                            actual_type = rid_to_type[rid_attr]
+                            # Check if the actual type matches or contains the expected type
+                            if expected_type not in actual_type.lower():
+                                errors.append(
+                                    f"  {xml_rel_path}: Line {sourceline}: "
+                                    f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                    f"but should point to a '{expected_type}' relationship"
+                                )
 
             except Exception as e:
                 xml_rel_path = xml_file.relative_to(self.unpacked_dir)
@@ -483,6 +533,143 @@ class BaseSchemaValidator:
                 print("PASSED - All relationship ID references are valid")
             return True
 
+    def _id_elements(self, xml_file):
+        """Yield (tag, attribute items, line) of elements with ID requirements.
+
+        Elements inside mc:AlternateContent are not checked.
+        """
+        scan = self._streaming_scan(xml_file)
+        if scan is not None:
+            yield from scan.id_elements
+            return
+
+        root = self.parts.get_root(xml_file)
+
+        # Remove all mc:AlternateContent elements from a private copy of the tree
+        mc_xpath = ".//mc:AlternateContent"
+        mc_namespaces = {"mc": self.MC_NAMESPACE}
+        if root.xpath(mc_xpath, namespaces=mc_namespaces):
+            root = self.parts.copy(xml_file).getroot()
+            for elem in root.xpath(mc_xpath, namespaces=mc_namespaces):
+                elem.getparent().remove(elem)
+
+        # Now check IDs in the cleaned tree
+        for elem in root.iter():
+            # Skip comments and processing instructions, whose tag isn't a str
+            if not isinstance(elem.tag, str):
+                continue
+
+            # Get the element name without namespace
+            tag = elem.tag.split("}")[-1].lower() if "}" in elem.tag else elem.tag.lower()
+
+            # Check if this element type has ID uniqueness requirements
+            if tag in self.UNIQUE_ID_REQUIREMENTS:
+                yield tag, elem.attrib.items(), elem.sourceline
+
+    def _relationship_refs(self, xml_file):
+        """Yield (line, element name, r:id) of elements with an r:id attribute."""
+        scan = self._streaming_scan(xml_file)
+        if scan is not None:
+            yield from scan.relationship_refs
+            return
+
+        rid_attribute = f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+        for elem in self.parts.get_root(xml_file).iter():
+            rid_attr = elem.get(rid_attribute)
+            if rid_attr:
+                elem_name = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+                yield elem.sourceline, elem_name, rid_attr
+
+    def _use_streaming(self, xml_file):
+        """Return True if a part is checked with a streaming pass instead of a tree."""
+        xml_file = Path(xml_file)
+        if xml_file.name not in self.STREAMING_PARTS or self.streaming is False:
+            return False
+        if self.streaming:
+            return True
+        try:
+            return self.source.size(xml_file) >= self.STREAMING_THRESHOLD
+        except OSError:
+            return False
+
+    def _streaming_scan(self, xml_file):
+        """Return the StreamingPartScan of a streamed part, or None for other parts.
+
+        The scan is done once, on first use, and shared by all checks.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed
+        """
+        if not self._use_streaming(xml_file):
+            return None
+        xml_file = Path(xml_file)
+        if xml_file not in self._scans:
+            self._scans[xml_file] = self._scan_part(xml_file)
+        scan = self._scans[xml_file]
+        if scan.syntax_error is not None:
+            raise scan.syntax_error
+        return scan
+
+    def _scan_part(self, xml_file):
+        """Scan a part listed in STREAMING_PARTS in a single pass."""
+        raise NotImplementedError(
+            "Subclasses listing STREAMING_PARTS must implement _scan_part"
+        )
+
+    def _is_unchanged(self, xml_file):
+        """Return True if a part is identical to the same part in the original.
+
+        Only used in incremental mode; always False otherwise. Parts are compared
+        by a hash of their canonical form without formatting whitespace, so the
+        pretty-printed unpacked part matches the condensed original. Nothing is
+        parsed for parts that unpack.py's manifest shows unedited since unpacking,
+        parts with the original's bytes, or parts whose hashes were computed
+        before; a part that is parsed stays in the part store for the checks.
+        """
+        if not self.incremental:
+            return False
+
+        xml_file = Path(xml_file)
+        if xml_file not in self._unchanged:
+            self._unchanged[xml_file] = self._matches_original(xml_file)
+        return self._unchanged[xml_file]
+
+    def _changed_files(self, files):
+        """Filter files down to the ones per-part checks need to look at."""
+        return [f for f in files if not self._is_unchanged(f)]
+
+    def _matches_original(self, xml_file):
+        try:
+            relative_path = Path(xml_file).relative_to(self.unpacked_dir)
+            if not self.baseline.has(relative_path):
+                return False
+
+            # Unpacked from this very part by unpack.py and not edited since
+            entry = self.source.unpacked_member(xml_file)
+            if entry is not None:
+                info = self.baseline.info(relative_path)
+                if (info.CRC, info.file_size) == (entry["crc"], entry["size"]):
+                    return True
+
+            # Byte-identical, e.g. a part of a package that wasn't written
+            current_data = self.source.read_bytes(xml_file)
+            original_data = self.baseline.read(relative_path)
+            if current_data == original_data:
+                return True
+
+            current = _NORMALIZED_DIGESTS.get(hashlib.sha256(current_data).digest())
+            original = _NORMALIZED_DIGESTS.get(hashlib.sha256(original_data).digest())
+            if None in (current, original) and self._use_streaming(xml_file):
+                return False  # Comparing would need the full tree
+            if current is None:
+                current = _normalized_digest(current_data, self.parts.get(xml_file))
+            if original is None:
+                original_doc = self.baseline.get(relative_path)
+                original = _normalized_digest(original_data, original_doc)
+            return current == original
+        except Exception:
+            return False  # Unreadable parts are always checked
+
     def _get_expected_relationship_type(self, element_name):
         """
         Get the expected relationship type for an element.
@@ -525,13 +712,13 @@ class BaseSchemaValidator:
 
         # Find [Content_Types].xml file
         content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if not self.source.is_file(content_types_file):
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self.parts.get_root(content_types_file)
             declared_parts = set()
             declared_extensions = set()
 
@@ -576,8 +763,8 @@ class BaseSchemaValidator:
             }
 
             # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
+            all_files = self.source.rglob("*")
+            all_files = [f for f in all_files if self.source.is_file(f)]
 
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
@@ -593,7 +780,11 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    scan = self._streaming_scan(xml_file)
+                    if scan is None:
+                        root_tag = self.parts.get_root(xml_file).tag
+                    else:
+                        root_tag = scan.root_tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -649,8 +840,8 @@ class BaseSchemaValidator:
             tuple: (is_valid, new_errors_set) where is_valid is True/False/None (skipped)
         """
         # Resolve both paths to handle symlinks
-        xml_file = Path(xml_file).resolve()
-        unpacked_dir = self.unpacked_dir.resolve()
+        xml_file = self.source.resolve(xml_file)
+        unpacked_dir = self.unpacked_dir
 
         # Validate current file
         is_valid, current_errors = self._validate_single_file_xsd(
@@ -673,7 +864,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +883,13 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        xml_files = self._changed_files(self.xml_files)
+        unchanged_count = len(self.xml_files) - len(xml_files)
+
+        for xml_file, (is_valid, new_file_errors) in zip(
+            xml_files, self._validate_files_against_xsd(xml_files)
+        ):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +905,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -722,6 +915,8 @@ class BaseSchemaValidator:
             print(f"Validated {len(self.xml_files)} files:")
             print(f"  - Valid: {valid_count}")
             print(f"  - Skipped (no schema): {skipped_count}")
+            if self.incremental:
+                print(f"  - Unchanged from original (skipped): {unchanged_count}")
             if original_error_count:
                 print(f"  - With original errors (ignored): {original_error_count}")
             print(
@@ -738,6 +933,47 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self, xml_files):
+        """Run validate_file_against_xsd on each file, in a process pool if jobs > 1.
+
+        Results are returned in the order of xml_files, so the report is identical
+        to a serial run. Each worker keeps its own compiled schemas and baseline
+        errors across the files it validates.
+        """
+        if self.jobs == 1 or len(xml_files) < 2:
+            return [self.validate_file_against_xsd(f) for f in xml_files]
+
+        cache = self.baseline_cache
+        # Paths are sent as str; bytes and opc.Package objects are pickled
+        document, original_file = self.document, self.original_file
+        if isinstance(document, Path):
+            document = str(document)
+        if isinstance(original_file, Path):
+            original_file = str(original_file)
+        worker_args = (
+            type(self),
+            document,
+            original_file,
+            self.parts.memory_budget,
+            (str(cache.cache_dir), cache.max_bytes) if cache is not None else None,
+            self.incremental,
+            self.streaming,
+            [str(f) for f in self.xml_files],
+        )
+        workers = min(self.jobs, len(xml_files))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_xsd_worker,
+            initargs=worker_args,
+        ) as executor:
+            return list(
+                executor.map(
+                    _validate_file_against_xsd_in_worker,
+                    [str(f) for f in xml_files],
+                    chunksize=max(1, len(xml_files) // (workers * 4)),
+                )
+            )
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -830,38 +1066,36 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            xml_doc = self.parts.get(xml_file)
+        except Exception as e:
+            return False, {str(e)}
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+        try:
+            return self._validate_tree_xsd(
+                xml_doc, schema_path, xml_file.relative_to(base_path)
+            )
+        finally:
+            # XSD validation needs the whole tree; don't keep it for streamed parts
+            if self._use_streaming(xml_file):
+                self.parts.discard(xml_file)
 
+    def _validate_tree_xsd(self, xml_doc, schema_path, relative_path):
+        """Validate a parsed XML tree against XSD schema. Returns (is_valid, errors_set)."""
+        try:
+            # Preprocess XML (template tag removal works on a copy)
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
             # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
+            if self._is_main_content(relative_path):
                 xml_doc = self._clean_ignorable_namespaces(xml_doc)
 
-            # Validate
-            if schema.validate(xml_doc):
+            # Validate against the cached compiled schema
+            # Errors are normalized messages (without line numbers for comparison)
+            errors = self.schema_cache.validate(schema_path, xml_doc)
+            if not errors:
                 return True, set()
-            else:
-                errors = set()
-                for error in schema.error_log:
-                    # Store normalized error message (without line numbers for comparison)
-                    errors.add(error.message)
-                return False, errors
+            return False, errors
 
         except Exception as e:
             return False, {str(e)}
@@ -875,33 +1109,63 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
-        xml_file = Path(xml_file).resolve()
-        unpacked_dir = self.unpacked_dir.resolve()
+        xml_file = self.source.resolve(xml_file)
+        unpacked_dir = self.unpacked_dir
         relative_path = xml_file.relative_to(unpacked_dir)
+        part_name = self.baseline.part_name(relative_path)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        if part_name not in self._original_errors:
+            self._original_errors[part_name] = self._compute_original_file_errors(
+                xml_file, relative_path
+            )
+        return self._original_errors[part_name]
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+    def _compute_original_file_errors(self, xml_file, relative_path):
+        """Validate one part of the original document, read straight from its archive."""
+        if not self.baseline.has(relative_path):
+            # File didn't exist in original, so no original errors
+            return set()
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
+        schema_path = self._get_schema_path(xml_file)
+        if not schema_path:
+            return set()
 
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+        # Look up errors found by earlier runs against the same original part
+        cache_key = None
+        if self.baseline_cache is not None:
+            try:
+                cache_key = self.baseline_cache.key(
+                    self.baseline.read(relative_path),
+                    schema_path,
+                    self.VALIDATOR_VERSION,
+                    options=self._is_main_content(relative_path),
+                )
+            except Exception:
+                cache_key = None
+            if cache_key is not None:
+                cached_errors = self.baseline_cache.get(cache_key)
+                if cached_errors is not None:
+                    return cached_errors
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
+        try:
+            xml_doc = self.baseline.get(relative_path)
+            is_valid, errors = self._validate_tree_xsd(
+                xml_doc, schema_path, relative_path
             )
-            return errors if errors else set()
+            errors = errors if errors else set()
+        except Exception as e:
+            errors = {str(e)}
+
+        if cache_key is not None:
+            self.baseline_cache.put(cache_key, errors)
+        return errors
+
+    def _is_main_content(self, relative_path):
+        """Return True if ignorable namespaces are cleaned before XSD validation."""
+        return bool(
+            relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+        )
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
@@ -947,5 +1211,66 @@ class BaseSchemaValidator:
         return lxml.etree.ElementTree(xml_copy), warnings
 
 
+# Shared on-disk cache of baseline XSD errors
+BASELINE_ERROR_CACHE = BaselineErrorCache()
+
+# SHA-256 of a part's bytes -> digest of its normalized form (see _normalized_digest),
+# so parts compared again, like the original's in every validation of a document
+# being edited, aren't canonicalized again
+_NORMALIZED_DIGESTS = {}
+_NORMALIZED_DIGESTS_LIMIT = 4096
+
+
+def _normalized_digest(data, xml_doc):
+    """Hash the canonical (C14N) form of a tree, ignoring whitespace between tags.
+
+    Args:
+        data: The bytes the tree was parsed from, which key the digest cache
+        xml_doc: The parsed tree
+    """
+    canonical = lxml.etree.tostring(xml_doc, method="c14n")
+    digest = hashlib.sha256(re.sub(rb">\s+<", b"><", canonical)).hexdigest()
+    if len(_NORMALIZED_DIGESTS) >= _NORMALIZED_DIGESTS_LIMIT:
+        del _NORMALIZED_DIGESTS[next(iter(_NORMALIZED_DIGESTS))]  # Oldest
+    _NORMALIZED_DIGESTS[hashlib.sha256(data).digest()] = digest
+    return digest
+
+# Validator owned by an XSD worker process (see _validate_files_against_xsd)
+_worker_validator = None
+
+
+def _init_xsd_worker(
+    validator_class,
+    document,
+    original_file,
+    memory_budget,
+    baseline_cache,
+    incremental,
+    streaming,
+    xml_files,
+):
+    """Create the validator used by this worker process for all of its parts.
+
+    It gets the options of the parent's validator and its list of files, so the
+    document isn't searched for parts again.
+    """
+    global _worker_validator
+    if baseline_cache is not None:
+        baseline_cache = BaselineErrorCache(*baseline_cache)
+    _worker_validator = validator_class(
+        document,
+        original_file,
+        memory_budget=memory_budget,
+        baseline_cache=baseline_cache or False,
+        incremental=incremental,
+        streaming=streaming,
+        xml_files=xml_files,
+    )
+
+
+def _validate_file_against_xsd_in_worker(xml_file):
+    return _worker_validator.validate_file_against_xsd(xml_file)
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,105 @@
+"""
+Reader for parts of the original (baseline) document, straight from its archive.
+"""
+
+import io
+from pathlib import Path, PurePosixPath
+
+import lxml.etree
+
+from .parts import PartStore
+
+try:
+    from ..opc import Package
+except ImportError:
+    from opc import Package
+
+
+class BaselineReader:
+    """Reads parts of the original .docx/.pptx/.xlsx without extracting it.
+
+    The archive is opened once, on first use, and only the members that are asked
+    for are read (in memory). Parsed trees are cached like the parts of the
+    modified document. The original can also be an opc.Package, e.g. the
+    original() of the package being edited.
+
+    Part names are package-relative POSIX paths, e.g. "word/document.xml".
+    """
+
+    def __init__(self, original_file, memory_budget=PartStore.DEFAULT_MEMORY_BUDGET):
+        if not isinstance(original_file, Package):
+            original_file = Path(original_file)
+        self.original_file = original_file
+        self.parts = _ArchivePartStore(self, memory_budget=memory_budget)
+        self._package = None
+
+    @staticmethod
+    def part_name(relative_path):
+        """Convert a relative path (str or Path) to an archive member name."""
+        return PurePosixPath(*Path(relative_path).parts).as_posix()
+
+    @property
+    def package(self):
+        """The opc.Package of the original document."""
+        if self._package is None:
+            if isinstance(self.original_file, Package):
+                self._package = self.original_file
+            else:
+                self._package = Package(self.original_file)
+        return self._package
+
+    def has(self, relative_path):
+        """Return True if the part exists in the original document."""
+        return self.part_name(relative_path) in self.package
+
+    def info(self, relative_path):
+        """Return the zipfile.ZipInfo of a part of the original document.
+
+        Raises:
+            KeyError: If the part does not exist in the original document
+        """
+        return self.package.info(self.part_name(relative_path))
+
+    def read(self, relative_path):
+        """Return the bytes of a part of the original document.
+
+        Raises:
+            KeyError: If the part does not exist in the original document
+        """
+        return self.package.read(self.part_name(relative_path))
+
+    def get(self, relative_path):
+        """Return the parsed tree of a part of the original document (read-only)."""
+        return self.parts.get(self.part_name(relative_path))
+
+    def get_root(self, relative_path):
+        """Return the root element of a part of the original document (read-only)."""
+        return self.get(relative_path).getroot()
+
+    def close(self):
+        """Close the original archive and drop cached trees."""
+        self.parts.clear()
+        if self._package is not None:
+            self._package.close()
+
+
+class _ArchivePartStore(PartStore):
+    """PartStore that parses members of the baseline archive."""
+
+    def __init__(self, reader, memory_budget=PartStore.DEFAULT_MEMORY_BUDGET):
+        super().__init__(memory_budget=memory_budget)
+        self._reader = reader
+
+    def _parse(self, path):
+        return lxml.etree.parse(io.BytesIO(self._reader.read(path)))
+
+    def _estimate_size(self, path):
+        try:
+            part_name = self._reader.part_name(path)
+            return self._reader.package.size(part_name) * self.TREE_SIZE_FACTOR
+        except KeyError:
+            return 0
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -2,13 +2,10 @@
 Validator for Word document XML files against XSD schemas.
 """
 
-import re
-import tempfile
-import zipfile
-
 import lxml.etree
 
 from .base import BaseSchemaValidator
+from .streaming import missing_space_preserve, scan_part
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
@@ -21,6 +18,9 @@ class DOCXSchemaValidator(BaseSchemaValidator):
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
+    # Large document.xml parts are checked in one streaming pass
+    STREAMING_PARTS = {"document.xml"}
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
@@ -75,36 +75,21 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._changed_files(self.xml_files):
             # Only check document.xml files
             if xml_file.name != "document.xml":
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
+                for sourceline, text in self._whitespace_violations(xml_file):
+                    # Show a preview of the text
+                    text_preview = (
+                        repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+                    )
+                    errors.append(
+                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                        f"Line {sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
+                    )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
@@ -128,32 +113,21 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._changed_files(self.xml_files):
             # Only check document.xml files
             if xml_file.name != "document.xml":
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
+                for sourceline, text in self._deletion_violations(xml_file):
+                    # Show a preview of the text
+                    text_preview = (
+                        repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+                    )
+                    errors.append(
+                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                        f"Line {sourceline}: <w:t> found within <w:del>: {text_preview}"
+                    )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
@@ -180,10 +154,14 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+                scan = self._streaming_scan(xml_file)
+                if scan is not None:
+                    count = scan.paragraph_count
+                else:
+                    root = self.parts.get_root(xml_file)
+                    # Count all w:p elements
+                    paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+                    count = len(paragraphs)
             except Exception as e:
                 print(f"Error counting paragraphs in unpacked document: {e}")
 
@@ -194,19 +172,12 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
-
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
+            # Parse document.xml straight from the original archive
+            root = self.baseline.get_root("word/document.xml")
 
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -220,29 +191,18 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self._changed_files(self.xml_files):
             if xml_file.name != "document.xml":
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
+                for sourceline, text in self._insertion_violations(xml_file):
                     text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
+                        repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
                     )
                     errors.append(
                         f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
+                        f"Line {sourceline}: <w:delText> within <w:ins>: {text_preview}"
                     )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
@@ -260,6 +220,56 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - No w:delText elements within w:ins elements")
             return True
 
+    def _whitespace_violations(self, xml_file):
+        """Yield (line, text) of w:t elements missing xml:space='preserve'."""
+        scan = self._streaming_scan(xml_file)
+        if scan is not None:
+            yield from scan.whitespace_violations
+            return
+
+        root = self.parts.get_root(xml_file)
+        for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
+            if missing_space_preserve(elem):
+                yield elem.sourceline, elem.text
+
+    def _deletion_violations(self, xml_file):
+        """Yield (line, text) of non-empty w:t elements within w:del elements."""
+        scan = self._streaming_scan(xml_file)
+        if scan is not None:
+            yield from scan.deletion_violations
+            return
+
+        # Find all w:t elements that are descendants of w:del elements
+        root = self.parts.get_root(xml_file)
+        namespaces = {"w": self.WORD_2006_NAMESPACE}
+        for t_elem in root.xpath(".//w:del//w:t", namespaces=namespaces):
+            if t_elem.text:
+                yield t_elem.sourceline, t_elem.text
+
+    def _insertion_violations(self, xml_file):
+        """Yield (line, text) of w:delText elements within w:ins but not w:del."""
+        scan = self._streaming_scan(xml_file)
+        if scan is not None:
+            yield from scan.insertion_violations
+            return
+
+        # Find w:delText in w:ins that are NOT within w:del
+        root = self.parts.get_root(xml_file)
+        namespaces = {"w": self.WORD_2006_NAMESPACE}
+        for elem in root.xpath(
+            ".//w:ins//w:delText[not(ancestor::w:del)]", namespaces=namespaces
+        ):
+            yield elem.sourceline, elem.text or ""
+
+    def _scan_part(self, xml_file):
+        return scan_part(
+            self.source.xml_input(xml_file),
+            unique_id_tags=self.UNIQUE_ID_REQUIREMENTS,
+            mc_namespace=self.MC_NAMESPACE,
+            relationships_namespace=self.OFFICE_RELATIONSHIPS_NAMESPACE,
+            word_namespace=self.WORD_2006_NAMESPACE,
+        )
+
     def compare_paragraph_counts(self):
         """Compare paragraph counts between original and new document."""
         original_count = self.count_paragraphs_in_original()
@@ -0,0 +1,188 @@
+"""
+Persistent, content-addressed cache of XSD errors found in original documents.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from .schema_cache import modification_times, schema_files
+
+
+class BaselineErrorCache:
+    """Stores baseline XSD error sets on disk, keyed by part content and schema.
+
+    Each entry is a small JSON file named after the SHA-256 of
+    (part bytes, schema identity, validator version, preprocessing options), so an
+    entry can never be served for a different part or a different schema. Entries
+    are touched on every hit; when the cache grows past max_bytes the least
+    recently used entries are deleted. The size of the cache is read from disk
+    once, then kept as a running estimate updated by put, so the directory is
+    only scanned again when the estimate passes max_bytes. Entries written by
+    other processes are only counted by that scan.
+
+    Cache failures (unwritable directory, corrupt entry, ...) are never fatal: the
+    caller just recomputes the errors.
+    """
+
+    # Environment variable overriding the default cache directory
+    CACHE_DIR_ENV = "OOXML_VALIDATION_CACHE_DIR"
+    DEFAULT_CACHE_DIR = Path.home() / ".cache" / "ooxml-validation" / "baseline"
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        if cache_dir is None:
+            cache_dir = os.environ.get(self.CACHE_DIR_ENV) or self.DEFAULT_CACHE_DIR
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._schema_ids = {}  # schema path -> (files, their mtimes, sha256)
+        self._size = None  # Estimated bytes in the cache, read by the first put
+        self._lock = threading.Lock()
+
+    def key(self, part_bytes, schema_path, version, options=""):
+        """Build the cache key for one part validated against one schema."""
+        digest = hashlib.sha256()
+        for field in (
+            hashlib.sha256(part_bytes).hexdigest(),
+            self._schema_identity(schema_path),
+            str(version),
+            str(options),
+        ):
+            digest.update(field.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached error set for key, or None on a miss."""
+        entry = self._entry_path(key)
+        try:
+            with open(entry, "r", encoding="utf-8") as f:
+                errors = set(json.load(f)["errors"])
+            os.utime(entry)  # Mark as recently used
+        except (OSError, ValueError, KeyError, TypeError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return errors
+
+    def put(self, key, errors):
+        """Store an error set under key and evict old entries if over budget."""
+        entry = self._entry_path(key)
+        data = json.dumps({"errors": sorted(errors)}).encode("utf-8")
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                replaced = entry.stat().st_size
+            except OSError:
+                replaced = 0
+            # Write atomically so concurrent runs never see a partial entry
+            fd, temp_name = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_name, entry)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_size()
+            else:
+                self._size += len(data) - replaced
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def stats(self):
+        """Return hit/miss counters."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        """Delete every cache entry."""
+        for entry in self._entries():
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+        with self._lock:
+            self._size = None
+
+    def _entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _entries(self):
+        if not self.cache_dir.is_dir():
+            return []
+        return list(self.cache_dir.glob("*/*.json"))
+
+    def _stat_entries(self):
+        """Return (mtime, size, path) of every entry."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        return entries
+
+    def _disk_size(self):
+        return sum(size for _, size, _ in self._stat_entries())
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = self._stat_entries()
+        total = sum(size for _, size, _ in entries)
+
+        if total > self.max_bytes:
+            # Trim to 90% of the budget, so the running size estimate only
+            # passes max_bytes (and the cache is scanned) again after puts
+            # worth a tenth of the budget
+            target = self.max_bytes * 0.9
+            for _, size, entry in sorted(entries, key=lambda e: e[0]):
+                if total <= target:
+                    break
+                try:
+                    entry.unlink()
+                    total -= size
+                except OSError:
+                    pass
+
+        with self._lock:
+            self._size = total
+
+    def _schema_identity(self, schema_path):
+        """Return the SHA-256 of the schema file and every file it imports or
+        includes (see schema_cache.schema_files), memoized until one of them
+        changes.
+        """
+        schema_path = Path(schema_path).resolve()
+        with self._lock:
+            entry = self._schema_ids.get(schema_path)
+            if entry is not None:
+                files, mtimes, identity = entry
+                try:
+                    if modification_times(files) == mtimes:
+                        return identity
+                except OSError:
+                    pass
+
+            files = schema_files(schema_path)
+            mtimes = modification_times(files)
+            digest = hashlib.sha256()
+            for path in files:
+                digest.update(hashlib.sha256(path.read_bytes()).digest())
+            self._schema_ids[schema_path] = (files, mtimes, digest.hexdigest())
+            return self._schema_ids[schema_path][2]
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,119 @@
+"""
+Parsed-part store shared by all checks of a validation run.
+"""
+
+import copy
+from collections import OrderedDict
+from pathlib import Path
+
+import lxml.etree
+
+
+class PartStore:
+    """Parses each XML part at most once and hands the tree to every check.
+
+    Trees returned by get() and get_root() are shared between checks and must be
+    treated as read-only. Checks that need to modify a tree (e.g. stripping
+    mc:AlternateContent) must work on copy() instead.
+
+    Parsed trees are kept in least-recently-used order. When the estimated memory
+    of the cached trees exceeds memory_budget, the oldest trees are dropped and
+    reparsed on next access.
+
+    Parts are read from the filesystem, or from source (see validation.source)
+    when one is given.
+    """
+
+    # Default budget for cached trees (estimated bytes)
+    DEFAULT_MEMORY_BUDGET = 1024 * 1024 * 1024
+
+    # Rough ratio between the in-memory size of an lxml tree and the part size on disk
+    TREE_SIZE_FACTOR = 10
+
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET, source=None):
+        self.memory_budget = memory_budget
+        self.source = source
+        self._trees = OrderedDict()  # path -> (tree, estimated size)
+        self._errors = {}  # path -> exception raised while parsing
+        self._used = 0
+        self.parses = 0
+        self.evictions = 0
+
+    def get(self, path):
+        """Return the parsed lxml.etree._ElementTree for path (read-only).
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed (cached per part)
+        """
+        key = Path(path)
+        if key in self._errors:
+            raise self._errors[key]
+
+        entry = self._trees.get(key)
+        if entry is not None:
+            self._trees.move_to_end(key)
+            return entry[0]
+
+        self.parses += 1
+        try:
+            tree = self._parse(key)
+        except Exception as e:
+            self._errors[key] = e
+            raise
+
+        size = self._estimate_size(key)
+        self._trees[key] = (tree, size)
+        self._used += size
+        self._evict()
+        return tree
+
+    def get_root(self, path):
+        """Return the root element of the parsed part (read-only)."""
+        return self.get(path).getroot()
+
+    def copy(self, path):
+        """Return a private deep copy of the parsed part that may be modified."""
+        return copy.deepcopy(self.get(path))
+
+    def discard(self, path):
+        """Drop the cached tree for path, if any."""
+        key = Path(path)
+        self._errors.pop(key, None)
+        entry = self._trees.pop(key, None)
+        if entry is not None:
+            self._used -= entry[1]
+
+    def clear(self):
+        """Drop all cached trees and parse errors."""
+        self._trees.clear()
+        self._errors.clear()
+        self._used = 0
+
+    def _parse(self, path):
+        if self.source is not None:
+            return lxml.etree.parse(self.source.xml_input(path))
+        return lxml.etree.parse(str(path))
+
+    def _estimate_size(self, path):
+        try:
+            if self.source is not None:
+                return self.source.size(path) * self.TREE_SIZE_FACTOR
+            return path.stat().st_size * self.TREE_SIZE_FACTOR
+        except OSError:
+            return 0
+
+    def _evict(self):
+        """Drop least recently used trees until the store fits its budget.
+
+        The most recently parsed tree is always kept, even if it alone exceeds
+        the budget.
+        """
+        while self._used > self.memory_budget and len(self._trees) > 1:
+            key, (_, size) = next(iter(self._trees.items()))
+            del self._trees[key]
+            self._used -= size
+            self.evictions += 1
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -84,9 +84,9 @@ class PPTXSchemaValidator(BaseSchemaValidator):
             r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
         )
 
-        for xml_file in self.xml_files:
+        for xml_file in self._changed_files(self.xml_files):
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self.parts.get_root(xml_file)
 
                 # Check all elements for ID attributes
                 for elem in root.iter():
@@ -132,7 +132,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         errors = []
 
         # Find all slide master files
-        slide_masters = list(self.unpacked_dir.glob("ppt/slideMasters/*.xml"))
+        slide_masters = self.source.glob("ppt/slideMasters/*.xml")
 
         if not slide_masters:
             if self.verbose:
@@ -142,20 +142,24 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         for slide_master in slide_masters:
             try:
                 # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
+                root = self.parts.get_root(slide_master)
 
                 # Find the corresponding _rels file for this slide master
                 rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
 
-                if not rels_file.exists():
+                if not self.source.is_file(rels_file):
                     errors.append(
                         f"  {slide_master.relative_to(self.unpacked_dir)}: "
                         f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
                     )
                     continue
 
+                # Skip if neither the slide master nor its relationships changed
+                if self._is_unchanged(slide_master) and self._is_unchanged(rels_file):
+                    continue
+
                 # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self.parts.get_root(rels_file)
 
                 # Build a set of valid relationship IDs that point to slide layouts
                 valid_layout_rids = set()
@@ -202,14 +206,12 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
     def validate_no_duplicate_slide_layouts(self):
         """Validate that each slide has exactly one slideLayout reference."""
-        import lxml.etree
-
         errors = []
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        slide_rels_files = self.source.glob("ppt/slides/_rels/*.xml.rels")
 
-        for rels_file in slide_rels_files:
+        for rels_file in self._changed_files(slide_rels_files):
             try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
+                root = self.parts.get_root(rels_file)
 
                 # Find all slideLayout relationships
                 layout_rels = [
@@ -248,7 +250,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         notes_slide_references = {}  # Track which slides reference each notesSlide
 
         # Find all slide relationship files
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        slide_rels_files = self.source.glob("ppt/slides/_rels/*.xml.rels")
 
         if not slide_rels_files:
             if self.verbose:
@@ -258,7 +260,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         for rels_file in slide_rels_files:
             try:
                 # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
+                root = self.parts.get_root(rels_file)
 
                 # Find all notesSlide relationships
                 for rel in root.findall(
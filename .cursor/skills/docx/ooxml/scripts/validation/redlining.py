@@ -4,17 +4,25 @@ Validator for tracked changes in Word documents.
 
 import subprocess
 import tempfile
-import zipfile
 from pathlib import Path
 
+from .baseline import BaselineReader
+from .source import open_source
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
     def __init__(self, unpacked_dir, original_docx, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir)
-        self.original_docx = Path(original_docx)
+        # Unpacked directory, packaged file (path or bytes) or opc.Package
+        self.source = open_source(unpacked_dir)
+        self.unpacked_dir = self.source.root
+        # Path to the original .docx, or an opc.Package
+        self.original_docx = original_docx
+        if isinstance(original_docx, str):
+            self.original_docx = Path(original_docx)
         self.verbose = verbose
+        self.baseline = BaselineReader(self.original_docx)
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
@@ -23,7 +31,7 @@ class RedliningValidator:
         """Main validation method that returns True if valid, False otherwise."""
         # Verify unpacked directory exists and has correct structure
         modified_file = self.unpacked_dir / "word" / "document.xml"
-        if not modified_file.exists():
+        if not self.source.is_file(modified_file):
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
@@ -31,7 +39,7 @@ class RedliningValidator:
         try:
             import xml.etree.ElementTree as ET
 
-            tree = ET.parse(modified_file)
+            tree = ET.parse(self.source.xml_input(modified_file))
             root = tree.getroot()
 
             # Check for w:del or w:ins tags authored by Claude
@@ -60,56 +68,46 @@ class RedliningValidator:
             # If we can't parse the XML, continue with full validation
             pass
 
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
+        # Read original document.xml straight from the original docx
+        try:
+            if not self.baseline.has("word/document.xml"):
                 print(
                     f"FAILED - Original document.xml not found in {self.original_docx}"
                 )
                 return False
+            original_content = self.baseline.read("word/document.xml")
+        except Exception as e:
+            print(f"FAILED - Error reading original docx: {e}")
+            return False
 
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
+        # Parse both XML files using xml.etree.ElementTree for redlining validation
+        try:
+            import xml.etree.ElementTree as ET
 
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
+            modified_tree = ET.parse(self.source.xml_input(modified_file))
+            modified_root = modified_tree.getroot()
+            original_root = ET.fromstring(original_content)
+        except ET.ParseError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
 
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
+        # Remove Claude's tracked changes from both documents
+        self._remove_claude_tracked_changes(original_root)
+        self._remove_claude_tracked_changes(modified_root)
 
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
+        # Extract and compare text content
+        modified_text = self._extract_text_content(modified_root)
+        original_text = self._extract_text_content(original_root)
 
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+        if modified_text != original_text:
+            # Show detailed character-level differences for each paragraph
+            error_message = self._generate_detailed_diff(original_text, modified_text)
+            print(error_message)
+            return False
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
 
     def _generate_detailed_diff(self, original_text, modified_text):
         """Generate detailed word-level differences using git word diff."""
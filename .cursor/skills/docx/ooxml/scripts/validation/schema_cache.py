@@ -0,0 +1,145 @@
+"""
+Process-wide cache of compiled XSD schemas shared by all validators.
+"""
+
+import threading
+from pathlib import Path
+
+import lxml.etree
+
+XSD_NAMESPACE = "http://www.w3.org/2001/XMLSchema"
+
+# xs:import, xs:include and xs:redefine name the schema files they read
+_SCHEMA_REFERENCES = {
+    f"{{{XSD_NAMESPACE}}}{name}" for name in ("import", "include", "redefine")
+}
+
+
+def schema_files(schema_path):
+    """Return the resolved paths of an XSD file and of every local XSD file it
+    imports, includes or redefines, directly or through others.
+
+    The schema itself comes first. References without a schemaLocation, to a URL
+    or to a missing file are left out (compiling the schema reports them).
+    """
+    files = {}
+    pending = [Path(schema_path).resolve()]
+    while pending:
+        path = pending.pop()
+        if path in files:
+            continue
+        files[path] = None
+        for elem in lxml.etree.parse(str(path)).getroot():
+            location = elem.get("schemaLocation")
+            if elem.tag in _SCHEMA_REFERENCES and location and "://" not in location:
+                referenced = (path.parent / location).resolve()
+                if referenced.is_file():
+                    pending.append(referenced)
+    return list(files)
+
+
+def modification_times(paths):
+    """Return the st_mtime_ns of each of paths, as a tuple."""
+    return tuple(path.stat().st_mtime_ns for path in paths)
+
+
+class SchemaCache:
+    """Compiles each XSD schema once per process and hands out the compiled object.
+
+    Entries are keyed by the resolved schema path and checked against the
+    modification times of the schema and of every XSD file it imports or includes
+    (see schema_files), so a schema is recompiled on next use after any of them is
+    edited. lxml schema objects keep their error log on the instance, so
+    validation runs under a per-schema lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # resolved path -> (files, mtimes, schema, lock)
+        self.hits = 0
+        self.misses = 0
+
+    def _get_entry(self, schema_path):
+        schema_path = Path(schema_path).resolve()
+
+        with self._lock:
+            entry = self._entries.get(schema_path)
+            if entry is not None and self._is_current(entry):
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            # Before compiling, so a file edited meanwhile is compiled again
+            files = schema_files(schema_path)
+            mtimes = modification_times(files)
+            with open(schema_path, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(
+                    xsd_file, parser=parser, base_url=str(schema_path)
+                )
+                schema = lxml.etree.XMLSchema(xsd_doc)
+
+            entry = (files, mtimes, schema, threading.Lock())
+            self._entries[schema_path] = entry
+            return entry
+
+    @staticmethod
+    def _is_current(entry):
+        """Return True if none of the files an entry was compiled from changed."""
+        files, mtimes, _, _ = entry
+        try:
+            return modification_times(files) == mtimes
+        except OSError:
+            return False  # Removed
+
+    def get(self, schema_path):
+        """Return the compiled lxml.etree.XMLSchema for schema_path."""
+        return self._get_entry(schema_path)[2]
+
+    def validate(self, schema_path, xml_doc):
+        """Validate xml_doc against the schema at schema_path.
+
+        Returns:
+            set: Error messages (without line numbers), empty if the document is valid
+        """
+        _, _, schema, lock = self._get_entry(schema_path)
+        with lock:
+            if schema.validate(xml_doc):
+                return set()
+            return {error.message for error in schema.error_log}
+
+    def warm(self, schema_paths):
+        """Compile every schema in schema_paths ahead of the first validation.
+
+        Schemas that fail to compile are skipped; validating against them raises
+        the compile error as usual.
+        """
+        for schema_path in schema_paths:
+            try:
+                self._get_entry(schema_path)
+            except (OSError, lxml.etree.XMLSchemaParseError, lxml.etree.XMLSyntaxError):
+                continue
+
+    def stats(self):
+        """Return hit/miss counters and the number of compiled schemas."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "schemas": len(self._entries),
+            }
+
+    def clear(self):
+        """Drop all compiled schemas and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by every validator in this process
+SCHEMA_CACHE = SchemaCache()
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import lxml.etree
+
+from validation.schema_cache import SchemaCache, schema_files
+
+SCHEMA = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:include schemaLocation="types.xsd"/>
+  <xs:element name="a" type="T"/>
+</xs:schema>"""
+
+TYPES = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:simpleType name="T"><xs:restriction base="xs:{base}"/></xs:simpleType>
+</xs:schema>"""
+
+
+class TestSchemaCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.schema = self.temp_dir / "main.xsd"
+        self.schema.write_text(SCHEMA)
+        self.types = self.temp_dir / "types.xsd"
+        self.types.write_text(TYPES.format(base="string"))
+        self.doc = lxml.etree.ElementTree(lxml.etree.fromstring("<a>x</a>"))
+        self.cache = SchemaCache()
+
+    def test_schema_files(self):
+        self.assertEqual(
+            schema_files(self.schema), [self.schema.resolve(), self.types.resolve()]
+        )
+
+    def test_compiled_once(self):
+        self.assertEqual(self.cache.validate(self.schema, self.doc), set())
+        self.assertEqual(self.cache.validate(self.schema, self.doc), set())
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_included_schema_edited(self):
+        self.assertEqual(self.cache.validate(self.schema, self.doc), set())
+        self.types.write_text(TYPES.format(base="int"))
+        stat = self.types.stat()
+        os.utime(self.types, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertEqual(len(self.cache.validate(self.schema, self.doc)), 1)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
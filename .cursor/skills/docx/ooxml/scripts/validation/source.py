@@ -0,0 +1,250 @@
+"""
+Sources of the parts of the document being validated: a directory or a zip archive.
+"""
+
+import io
+import os
+import posixpath
+import zipfile
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
+
+try:
+    from ..opc import Package
+    from ..unpack import MANIFEST_NAME, is_unchanged, read_manifest
+except ImportError:
+    from opc import Package
+    from unpack import MANIFEST_NAME, is_unchanged, read_manifest
+
+
+def open_source(document):
+    """Return the part source for an unpacked directory, a packaged file or its bytes.
+
+    Args:
+        document: Path to an unpacked directory, path to a .docx/.pptx/.xlsx file,
+            the bytes of such a file, or an opc.Package
+
+    Returns:
+        DirectorySource, ArchiveSource or PackageSource
+    """
+    if isinstance(document, Package):
+        return PackageSource(document)
+    if isinstance(document, (bytes, bytearray, memoryview)):
+        return ArchiveSource(document)
+    if Path(document).is_file():
+        return ArchiveSource(document)
+    return DirectorySource(document)
+
+
+class DirectorySource:
+    """Parts of an unpacked document, read from a directory.
+
+    The manifest unpack.py leaves in the directory is not a part; it is used to
+    recognize parts that haven't been edited since they were unpacked.
+    """
+
+    def __init__(self, directory):
+        self.root = Path(directory).resolve()
+        self.manifest = read_manifest(self.root)
+
+    def rglob(self, pattern):
+        """Return paths below root whose name matches pattern."""
+        return [p for p in self.root.rglob(pattern) if p != self.root / MANIFEST_NAME]
+
+    def glob(self, pattern):
+        """Return paths matching a pattern relative to root, e.g. "ppt/slides/*.xml"."""
+        return [p for p in self.root.glob(pattern) if p != self.root / MANIFEST_NAME]
+
+    def unpacked_member(self, path):
+        """Return the archive member path was unpacked from, if it is unedited.
+
+        Returns:
+            The part's manifest entry (see unpack.read_manifest) if the file is
+            as unpack.py wrote it, otherwise None
+        """
+        if self.manifest is None:
+            return None
+        name = PurePosixPath(*Path(path).relative_to(self.root).parts).as_posix()
+        entry = self.manifest["parts"].get(name)
+        if entry is None or not is_unchanged(path, entry):
+            return None
+        return entry
+
+    def is_file(self, path):
+        return Path(path).is_file()
+
+    def size(self, path):
+        return Path(path).stat().st_size
+
+    def read_bytes(self, path):
+        return Path(path).read_bytes()
+
+    def xml_input(self, path):
+        """Return what lxml and ElementTree parsers accept for path."""
+        return str(path)
+
+    def resolve(self, path):
+        return Path(path).resolve()
+
+    def close(self):
+        pass
+
+
+class ArchiveSource:
+    """Parts of a packaged document, read from the zip archive on demand.
+
+    Parts are addressed by paths below a virtual root directory (the archive path,
+    or "<memory>" in the working directory for in-memory archives), so checks can
+    treat them like files of an unpacked document. Listings come from the central
+    directory; a member is only decompressed when it is read.
+    """
+
+    def __init__(self, archive):
+        if isinstance(archive, (bytes, bytearray, memoryview)):
+            self.root = Path.cwd() / "<memory>"
+            self._zip = zipfile.ZipFile(io.BytesIO(archive), "r")
+        else:
+            self.root = Path(archive).resolve()
+            self._zip = zipfile.ZipFile(self.root, "r")
+
+        # Member name -> ZipInfo, in archive order (directory entries excluded)
+        self._members = {
+            info.filename: info for info in self._zip.infolist() if not info.is_dir()
+        }
+
+    def member_name(self, path):
+        """Return the archive member name of a path below root."""
+        relative_path = Path(path).relative_to(self.root)
+        return PurePosixPath(*relative_path.parts).as_posix()
+
+    def rglob(self, pattern):
+        """Return paths of members whose file name matches pattern."""
+        return [
+            self.root / name
+            for name in self._members
+            if fnmatch(posixpath.basename(name), pattern)
+        ]
+
+    def glob(self, pattern):
+        """Return paths of members matching a pattern relative to root."""
+        depth = len(PurePosixPath(pattern).parts)
+        return [
+            self.root / name
+            for name in self._members
+            if len(PurePosixPath(name).parts) == depth
+            and PurePosixPath(name).match(pattern)
+        ]
+
+    def is_file(self, path):
+        try:
+            return self.member_name(path) in self._members
+        except ValueError:
+            return False  # Outside the archive
+
+    def size(self, path):
+        return self._info(path).file_size
+
+    def read_bytes(self, path):
+        return self._zip.read(self._info(path))
+
+    def xml_input(self, path):
+        """Return what lxml and ElementTree parsers accept for path."""
+        return io.BytesIO(self.read_bytes(path))
+
+    def unpacked_member(self, path):
+        """Packaged documents have no unpack manifest."""
+        return None
+
+    def resolve(self, path):
+        """Normalize path lexically; archives have no symlinks to follow."""
+        return Path(os.path.normpath(path))
+
+    def close(self):
+        self._zip.close()
+
+    def _info(self, path):
+        try:
+            return self._members[self.member_name(path)]
+        except (KeyError, ValueError):
+            raise FileNotFoundError(f"No such part: {path}") from None
+
+
+class PackageSource:
+    """Parts of an opc.Package, including the changes it holds in memory.
+
+    Like ArchiveSource, parts are addressed by paths below a virtual root: the
+    package's directory or archive path, or "<package>" in the working directory.
+    """
+
+    def __init__(self, package):
+        self.package = package
+        if package.directory is not None:
+            self.root = package.directory.resolve()
+        elif package.archive_path is not None:
+            self.root = package.archive_path.resolve()
+        else:
+            self.root = Path.cwd() / "<package>"
+        self._manifest = None
+        if package.directory is not None:
+            self._manifest = read_manifest(package.directory)
+
+    def member_name(self, path):
+        """Return the part name of a path below root."""
+        relative_path = Path(path).relative_to(self.root)
+        return PurePosixPath(*relative_path.parts).as_posix()
+
+    def rglob(self, pattern):
+        """Return paths of parts whose file name matches pattern."""
+        return [
+            self.root / name
+            for name in self.package.part_names()
+            if fnmatch(posixpath.basename(name), pattern)
+        ]
+
+    def glob(self, pattern):
+        """Return paths of parts matching a pattern relative to root."""
+        depth = len(PurePosixPath(pattern).parts)
+        return [
+            self.root / name
+            for name in self.package.part_names()
+            if len(PurePosixPath(name).parts) == depth
+            and PurePosixPath(name).match(pattern)
+        ]
+
+    def is_file(self, path):
+        try:
+            return self.member_name(path) in self.package
+        except ValueError:
+            return False  # Outside the package
+
+    def size(self, path):
+        return self.package.size(self.member_name(path))
+
+    def read_bytes(self, path):
+        return self.package.read(self.member_name(path))
+
+    def xml_input(self, path):
+        """Return what lxml and ElementTree parsers accept for path."""
+        return io.BytesIO(self.read_bytes(path))
+
+    def resolve(self, path):
+        """Normalize path lexically, like for archives."""
+        return Path(os.path.normpath(path))
+
+    def unpacked_member(self, path):
+        """Return the unpack manifest entry of an unmodified part of a directory."""
+        if self._manifest is None:
+            return None
+        name = self.member_name(path)
+        file = self.package.file(name)
+        entry = self._manifest["parts"].get(name)
+        if file is None or entry is None or not is_unchanged(file, entry):
+            return None
+        return entry
+
+    def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
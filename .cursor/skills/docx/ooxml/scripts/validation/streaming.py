@@ -0,0 +1,152 @@
+"""
+Single-pass streaming scan of very large XML parts.
+"""
+
+import re
+from pathlib import Path
+
+import lxml.etree
+
+XML_SPACE_ATTRIBUTE = "{http://www.w3.org/XML/1998/namespace}space"
+
+
+def missing_space_preserve(t_elem):
+    """Return True if a w:t element has edge whitespace but no xml:space='preserve'."""
+    text = t_elem.text
+    if not text:
+        return False
+    # Check if text starts or ends with whitespace
+    if not (re.match(r"^\s.*", text) or re.match(r".*\s$", text)):
+        return False
+    return t_elem.attrib.get(XML_SPACE_ATTRIBUTE) != "preserve"
+
+
+class StreamingPartScan:
+    """Facts collected from one part by scan_part, in document order.
+
+    Attributes:
+        syntax_error: lxml.etree.XMLSyntaxError if the part is not well-formed
+        root_tag, root_nsmap, root_attrib: Tag, namespaces and attributes of the root
+        paragraph_count: Number of w:p elements below the root
+        id_elements: (tag, attribute items, line) of elements with ID requirements
+            outside mc:AlternateContent; an exception at the position where
+            tree-based iteration would have raised one
+        relationship_refs: (line, element name, r:id) of elements with an r:id
+        whitespace_violations: (line, text) of w:t missing xml:space='preserve'
+        deletion_violations: (line, text) of w:t inside w:del
+        insertion_violations: (line, text) of w:delText inside w:ins but not w:del
+    """
+
+    def __init__(self):
+        self.syntax_error = None
+        self.root_tag = None
+        self.root_nsmap = {}
+        self.root_attrib = {}
+        self.paragraph_count = 0
+        self.id_elements = []
+        self.relationship_refs = []
+        self.whitespace_violations = []
+        self.deletion_violations = []
+        self.insertion_violations = []
+
+
+def scan_part(
+    path, unique_id_tags, mc_namespace, relationships_namespace, word_namespace
+):
+    """Collect the facts needed by the per-part checks in one iterparse pass.
+
+    Elements are cleared as soon as they have been processed, so memory stays
+    bounded by the depth of the tree rather than its size.
+
+    Args:
+        path: Path to the XML part, or a binary file object
+        unique_id_tags: Lowercase local names of elements with ID requirements
+        mc_namespace: Markup compatibility namespace (AlternateContent is skipped
+            for ID checks, like the tree-based check does)
+        relationships_namespace: Namespace of the r:id attribute
+        word_namespace: WordprocessingML main namespace
+
+    Returns:
+        StreamingPartScan
+    """
+    scan = StreamingPartScan()
+
+    alternate_content_tag = f"{{{mc_namespace}}}AlternateContent"
+    rid_attribute = f"{{{relationships_namespace}}}id"
+    p_tag = f"{{{word_namespace}}}p"
+    t_tag = f"{{{word_namespace}}}t"
+    del_tag = f"{{{word_namespace}}}del"
+    ins_tag = f"{{{word_namespace}}}ins"
+    del_text_tag = f"{{{word_namespace}}}delText"
+
+    depth = 0
+    mc_depth = 0  # Nesting level of mc:AlternateContent
+    del_depth = 0  # Nesting level of w:del
+    ins_depth = 0  # Nesting level of w:ins
+
+    try:
+        if isinstance(path, Path):
+            path = str(path)
+        for event, elem in lxml.etree.iterparse(path, events=("start", "end")):
+            if event == "start":
+                tag = elem.tag
+                if depth == 0:
+                    scan.root_tag = tag
+                    scan.root_nsmap = dict(elem.nsmap)
+                    scan.root_attrib = dict(elem.attrib)
+                depth += 1
+
+                if tag == alternate_content_tag:
+                    mc_depth += 1
+                elif tag == del_tag:
+                    del_depth += 1
+                elif tag == ins_tag:
+                    ins_depth += 1
+                elif tag == p_tag and depth > 1:
+                    scan.paragraph_count += 1
+
+                local_name = tag.split("}")[-1] if "}" in tag else tag
+                if mc_depth == 0 and local_name.lower() in unique_id_tags:
+                    scan.id_elements.append(
+                        (local_name.lower(), list(elem.attrib.items()), elem.sourceline)
+                    )
+
+                rid = elem.get(rid_attribute)
+                if rid:
+                    scan.relationship_refs.append((elem.sourceline, local_name, rid))
+
+            elif event == "end":
+                tag = elem.tag
+                if tag == t_tag:
+                    if missing_space_preserve(elem):
+                        scan.whitespace_violations.append((elem.sourceline, elem.text))
+                    if del_depth and elem.text:
+                        scan.deletion_violations.append((elem.sourceline, elem.text))
+                elif tag == del_text_tag:
+                    if ins_depth and not del_depth:
+                        scan.insertion_violations.append(
+                            (elem.sourceline, elem.text or "")
+                        )
+                elif tag == alternate_content_tag:
+                    mc_depth -= 1
+                elif tag == del_tag:
+                    del_depth -= 1
+                elif tag == ins_tag:
+                    ins_depth -= 1
+                depth -= 1
+
+                # Drop the processed subtree and any earlier siblings
+                elem.clear(keep_tail=True)
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+    except lxml.etree.XMLSyntaxError as e:
+        scan.syntax_error = e
+
+    return scan
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -8,6 +8,7 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document(Package('workspace/document.docx'))  # In memory, no unpacking
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
@@ -24,9 +25,11 @@ Usage:
 
     # Save
     doc.save()
+    doc.save('workspace/output.docx')  # Packed, when editing a Package
 """
 
 import html
+import posixpath
 import random
 import shutil
 import tempfile
@@ -34,6 +37,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from defusedxml import minidom
+from ooxml.scripts.opc import Package
 from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
@@ -54,20 +58,29 @@ class DocxXMLEditor(XMLEditor):
 
     Attributes:
         dom (defusedxml.minidom.Document): The DOM document for direct manipulation
+            (an lxml ElementTree with backend="lxml")
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        data=None,
+        backend: str = "minidom",
     ):
         """Initialize with required RSID and optional author.
 
         Args:
-            xml_path: Path to XML file to edit
+            xml_path: Path to XML file to edit, or None with data
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "Claude")
             initials: Author initials (default: "C")
+            data: The XML as bytes, parsed instead of reading xml_path
+            backend: "minidom" (default) or "lxml", see XMLEditor
         """
-        super().__init__(xml_path)
+        super().__init__(xml_path, data=data, backend=backend)
         self.rsid = rsid
         self.author = author
         self.initials = initials
@@ -76,9 +89,9 @@ class DocxXMLEditor(XMLEditor):
         """Get the next available change ID by checking all tracked change elements."""
         max_id = -1
         for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
+            elements = self._elements(tag)
             for elem in elements:
-                change_id = elem.getAttribute("w:id")
+                change_id = self._get(elem, "w:id")
                 if change_id:
                     try:
                         max_id = max(max_id, int(change_id))
@@ -88,30 +101,21 @@ class DocxXMLEditor(XMLEditor):
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16du"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16du",
-                "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
-            )
+        self._declare_namespace(
+            "w16du", "http://schemas.microsoft.com/office/word/2023/wordml/word16du"
+        )
 
     def _ensure_w16cex_namespace(self):
         """Ensure w16cex namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16cex"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16cex",
-                "http://schemas.microsoft.com/office/word/2018/wordml/cex",
-            )
+        self._declare_namespace(
+            "w16cex", "http://schemas.microsoft.com/office/word/2018/wordml/cex"
+        )
 
     def _ensure_w14_namespace(self):
         """Ensure w14 namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w14"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w14",
-                "http://schemas.microsoft.com/office/word/2010/wordml",
-            )
+        self._declare_namespace(
+            "w14", "http://schemas.microsoft.com/office/word/2010/wordml"
+        )
 
     def _inject_attributes_to_nodes(self, nodes):
         """Inject RSID, author, and date attributes into DOM nodes where applicable.
@@ -133,108 +137,105 @@ class DocxXMLEditor(XMLEditor):
 
         def is_inside_deletion(elem):
             """Check if element is inside a w:del element."""
-            parent = elem.parentNode
-            while parent:
-                if parent.nodeType == parent.ELEMENT_NODE and parent.tagName == "w:del":
+            parent = self._parent(elem)
+            while parent is not None:
+                if self._tag(parent) == "w:del":
                     return True
-                parent = parent.parentNode
+                parent = self._parent(parent)
             return False
 
         def add_rsid_to_p(elem):
-            if not elem.hasAttribute("w:rsidR"):
-                elem.setAttribute("w:rsidR", self.rsid)
-            if not elem.hasAttribute("w:rsidRDefault"):
-                elem.setAttribute("w:rsidRDefault", self.rsid)
-            if not elem.hasAttribute("w:rsidP"):
-                elem.setAttribute("w:rsidP", self.rsid)
+            if not self._has(elem, "w:rsidR"):
+                self._set(elem, "w:rsidR", self.rsid)
+            if not self._has(elem, "w:rsidRDefault"):
+                self._set(elem, "w:rsidRDefault", self.rsid)
+            if not self._has(elem, "w:rsidP"):
+                self._set(elem, "w:rsidP", self.rsid)
             # Add w14:paraId and w14:textId if not present
-            if not elem.hasAttribute("w14:paraId"):
+            if not self._has(elem, "w14:paraId"):
                 self._ensure_w14_namespace()
-                elem.setAttribute("w14:paraId", _generate_hex_id())
-            if not elem.hasAttribute("w14:textId"):
+                self._set(elem, "w14:paraId", _generate_hex_id())
+            if not self._has(elem, "w14:textId"):
                 self._ensure_w14_namespace()
-                elem.setAttribute("w14:textId", _generate_hex_id())
+                self._set(elem, "w14:textId", _generate_hex_id())
 
         def add_rsid_to_r(elem):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
             if is_inside_deletion(elem):
-                if not elem.hasAttribute("w:rsidDel"):
-                    elem.setAttribute("w:rsidDel", self.rsid)
+                if not self._has(elem, "w:rsidDel"):
+                    self._set(elem, "w:rsidDel", self.rsid)
             else:
-                if not elem.hasAttribute("w:rsidR"):
-                    elem.setAttribute("w:rsidR", self.rsid)
+                if not self._has(elem, "w:rsidR"):
+                    self._set(elem, "w:rsidR", self.rsid)
 
         def add_tracked_change_attrs(elem):
             # Auto-assign w:id if not present
-            if not elem.hasAttribute("w:id"):
-                elem.setAttribute("w:id", str(self._get_next_change_id()))
-            if not elem.hasAttribute("w:author"):
-                elem.setAttribute("w:author", self.author)
-            if not elem.hasAttribute("w:date"):
-                elem.setAttribute("w:date", timestamp)
+            if not self._has(elem, "w:id"):
+                self._set(elem, "w:id", str(self._get_next_change_id()))
+            if not self._has(elem, "w:author"):
+                self._set(elem, "w:author", self.author)
+            if not self._has(elem, "w:date"):
+                self._set(elem, "w:date", timestamp)
             # Add w16du:dateUtc for tracked changes (same as w:date since we generate UTC timestamps)
-            if elem.tagName in ("w:ins", "w:del") and not elem.hasAttribute(
-                "w16du:dateUtc"
+            if self._tag(elem) in ("w:ins", "w:del") and not self._has(
+                elem, "w16du:dateUtc"
             ):
                 self._ensure_w16du_namespace()
-                elem.setAttribute("w16du:dateUtc", timestamp)
+                self._set(elem, "w16du:dateUtc", timestamp)
 
         def add_comment_attrs(elem):
-            if not elem.hasAttribute("w:author"):
-                elem.setAttribute("w:author", self.author)
-            if not elem.hasAttribute("w:date"):
-                elem.setAttribute("w:date", timestamp)
-            if not elem.hasAttribute("w:initials"):
-                elem.setAttribute("w:initials", self.initials)
+            if not self._has(elem, "w:author"):
+                self._set(elem, "w:author", self.author)
+            if not self._has(elem, "w:date"):
+                self._set(elem, "w:date", timestamp)
+            if not self._has(elem, "w:initials"):
+                self._set(elem, "w:initials", self.initials)
 
         def add_comment_extensible_date(elem):
             # Add w16cex:dateUtc for comment extensible elements
-            if not elem.hasAttribute("w16cex:dateUtc"):
+            if not self._has(elem, "w16cex:dateUtc"):
                 self._ensure_w16cex_namespace()
-                elem.setAttribute("w16cex:dateUtc", timestamp)
+                self._set(elem, "w16cex:dateUtc", timestamp)
 
         def add_xml_space_to_t(elem):
             # Add xml:space="preserve" to w:t if text has leading/trailing whitespace
-            if (
-                elem.firstChild
-                and elem.firstChild.nodeType == elem.firstChild.TEXT_NODE
-            ):
-                text = elem.firstChild.data
-                if text and (text[0].isspace() or text[-1].isspace()):
-                    if not elem.hasAttribute("xml:space"):
-                        elem.setAttribute("xml:space", "preserve")
+            text = self._first_text(elem)
+            if text and (text[0].isspace() or text[-1].isspace()):
+                if not self._has(elem, "xml:space"):
+                    self._set(elem, "xml:space", "preserve")
 
         for node in nodes:
-            if node.nodeType != node.ELEMENT_NODE:
+            tag = self._tag(node)
+            if tag is None:
                 continue
 
             # Handle the node itself
-            if node.tagName == "w:p":
+            if tag == "w:p":
                 add_rsid_to_p(node)
-            elif node.tagName == "w:r":
+            elif tag == "w:r":
                 add_rsid_to_r(node)
-            elif node.tagName == "w:t":
+            elif tag == "w:t":
                 add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
+            elif tag in ("w:ins", "w:del"):
                 add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
+            elif tag == "w:comment":
                 add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
+            elif tag == "w16cex:commentExtensible":
                 add_comment_extensible_date(node)
 
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
+            # Process descendants (_elements doesn't return the element itself)
+            for elem in self._elements("w:p", node):
                 add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
+            for elem in self._elements("w:r", node):
                 add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
+            for elem in self._elements("w:t", node):
                 add_xml_space_to_t(elem)
             for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
+                for elem in self._elements(tag, node):
                     add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
+            for elem in self._elements("w:comment", node):
                 add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
+            for elem in self._elements("w16cex:commentExtensible", node):
                 add_comment_extensible_date(elem)
 
     def replace_node(self, elem, new_content):
@@ -287,55 +288,42 @@ class DocxXMLEditor(XMLEditor):
         """
         # Collect insertions
         ins_elements = []
-        if elem.tagName == "w:ins":
+        if self._tag(elem) == "w:ins":
             ins_elements.append(elem)
         else:
-            ins_elements.extend(elem.getElementsByTagName("w:ins"))
+            ins_elements.extend(self._elements("w:ins", elem))
 
         # Validate that there are insertions to reject
         if not ins_elements:
             raise ValueError(
                 f"revert_insertion requires w:ins elements. "
-                f"The provided element <{elem.tagName}> contains no insertions. "
+                f"The provided element <{self._tag(elem)}> contains no insertions. "
             )
 
         # Process all insertions - wrap all children in w:del
         for ins_elem in ins_elements:
-            runs = list(ins_elem.getElementsByTagName("w:r"))
+            runs = list(self._elements("w:r", ins_elem))
             if not runs:
                 continue
 
-            # Create deletion wrapper
-            del_wrapper = self.dom.createElement("w:del")
-
             # Process each run
             for run in runs:
                 # Convert w:t → w:delText and w:rsidR → w:rsidDel
-                if run.hasAttribute("w:rsidR"):
-                    run.setAttribute("w:rsidDel", run.getAttribute("w:rsidR"))
-                    run.removeAttribute("w:rsidR")
-                elif not run.hasAttribute("w:rsidDel"):
-                    run.setAttribute("w:rsidDel", self.rsid)
-
-                for t_elem in list(run.getElementsByTagName("w:t")):
-                    del_text = self.dom.createElement("w:delText")
-                    # Copy ALL child nodes (not just firstChild) to handle entities
-                    while t_elem.firstChild:
-                        del_text.appendChild(t_elem.firstChild)
-                    for i in range(t_elem.attributes.length):
-                        attr = t_elem.attributes.item(i)
-                        del_text.setAttribute(attr.name, attr.value)
-                    t_elem.parentNode.replaceChild(del_text, t_elem)
-
-            # Move all children from ins to del wrapper
-            while ins_elem.firstChild:
-                del_wrapper.appendChild(ins_elem.firstChild)
-
-            # Add del wrapper back to ins
-            ins_elem.appendChild(del_wrapper)
+                if self._has(run, "w:rsidR"):
+                    self._set(run, "w:rsidDel", self._get(run, "w:rsidR"))
+                    self._remove_attribute(run, "w:rsidR")
+                elif not self._has(run, "w:rsidDel"):
+                    self._set(run, "w:rsidDel", self.rsid)
+
+                for t_elem in list(self._elements("w:t", run)):
+                    self._rename(t_elem, "w:delText")
+
+            # Move all children from ins to a del wrapper, added back to ins
+            del_wrapper = self._wrap_children(ins_elem, "w:del")
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._index_nodes([ins_elem])
 
         return [elem]
 
@@ -366,18 +354,18 @@ class DocxXMLEditor(XMLEditor):
         """
         # Collect deletions FIRST - before we modify the DOM
         del_elements = []
-        is_single_del = elem.tagName == "w:del"
+        is_single_del = self._tag(elem) == "w:del"
 
         if is_single_del:
             del_elements.append(elem)
         else:
-            del_elements.extend(elem.getElementsByTagName("w:del"))
+            del_elements.extend(self._elements("w:del", elem))
 
         # Validate that there are deletions to reject
         if not del_elements:
             raise ValueError(
                 f"revert_deletion requires w:del elements. "
-                f"The provided element <{elem.tagName}> contains no deletions. "
+                f"The provided element <{self._tag(elem)}> contains no deletions. "
             )
 
         # Track created insertion (only relevant if elem is a single w:del)
@@ -386,46 +374,39 @@ class DocxXMLEditor(XMLEditor):
         # Process all deletions - create insertions that copy the deleted content
         for del_elem in del_elements:
             # Clone the deleted runs and convert them to insertions
-            runs = list(del_elem.getElementsByTagName("w:r"))
+            runs = list(self._elements("w:r", del_elem))
             if not runs:
                 continue
 
             # Create insertion wrapper
-            ins_elem = self.dom.createElement("w:ins")
+            ins_elem = self._create("w:ins")
 
             for run in runs:
                 # Clone the run
-                new_run = run.cloneNode(True)
+                new_run = self._clone(run)
 
                 # Convert w:delText → w:t
-                for del_text in list(new_run.getElementsByTagName("w:delText")):
-                    t_elem = self.dom.createElement("w:t")
-                    # Copy ALL child nodes (not just firstChild) to handle entities
-                    while del_text.firstChild:
-                        t_elem.appendChild(del_text.firstChild)
-                    for i in range(del_text.attributes.length):
-                        attr = del_text.attributes.item(i)
-                        t_elem.setAttribute(attr.name, attr.value)
-                    del_text.parentNode.replaceChild(t_elem, del_text)
+                for del_text in list(self._elements("w:delText", new_run)):
+                    self._rename(del_text, "w:t")
 
                 # Update run attributes: w:rsidDel → w:rsidR
-                if new_run.hasAttribute("w:rsidDel"):
-                    new_run.setAttribute("w:rsidR", new_run.getAttribute("w:rsidDel"))
-                    new_run.removeAttribute("w:rsidDel")
-                elif not new_run.hasAttribute("w:rsidR"):
-                    new_run.setAttribute("w:rsidR", self.rsid)
+                if self._has(new_run, "w:rsidDel"):
+                    self._set(new_run, "w:rsidR", self._get(new_run, "w:rsidDel"))
+                    self._remove_attribute(new_run, "w:rsidDel")
+                elif not self._has(new_run, "w:rsidR"):
+                    self._set(new_run, "w:rsidR", self.rsid)
 
-                ins_elem.appendChild(new_run)
+                self._append(ins_elem, new_run)
 
             # Insert the new insertion after the deletion
-            nodes = self.insert_after(del_elem, ins_elem.toxml())
+            nodes = self.insert_after(del_elem, self._to_xml(ins_elem))
 
             # If processing a single w:del, track the created insertion
             if is_single_del and nodes:
                 created_insertion = nodes[0]
 
         # Return based on input type
-        if is_single_del and created_insertion:
+        if is_single_del and created_insertion is not None:
             return [elem, created_insertion]
         else:
             return [elem]
@@ -495,102 +476,78 @@ class DocxXMLEditor(XMLEditor):
         Raises:
             ValueError: If element has existing tracked changes or invalid structure
         """
-        if elem.nodeName == "w:r":
+        tag = self._tag(elem)
+        if tag == "w:r":
             # Check for existing w:delText
-            if elem.getElementsByTagName("w:delText"):
+            if self._elements("w:delText", elem):
                 raise ValueError("w:r element already contains w:delText")
 
             # Convert w:t → w:delText
-            for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
-                # Copy ALL child nodes (not just firstChild) to handle entities
-                while t_elem.firstChild:
-                    del_text.appendChild(t_elem.firstChild)
-                # Preserve attributes like xml:space
-                for i in range(t_elem.attributes.length):
-                    attr = t_elem.attributes.item(i)
-                    del_text.setAttribute(attr.name, attr.value)
-                t_elem.parentNode.replaceChild(del_text, t_elem)
+            for t_elem in list(self._elements("w:t", elem)):
+                self._rename(t_elem, "w:delText")
 
             # Update run attributes: w:rsidR → w:rsidDel
-            if elem.hasAttribute("w:rsidR"):
-                elem.setAttribute("w:rsidDel", elem.getAttribute("w:rsidR"))
-                elem.removeAttribute("w:rsidR")
-            elif not elem.hasAttribute("w:rsidDel"):
-                elem.setAttribute("w:rsidDel", self.rsid)
+            if self._has(elem, "w:rsidR"):
+                self._set(elem, "w:rsidDel", self._get(elem, "w:rsidR"))
+                self._remove_attribute(elem, "w:rsidR")
+            elif not self._has(elem, "w:rsidDel"):
+                self._set(elem, "w:rsidDel", self.rsid)
 
             # Wrap in w:del
-            del_wrapper = self.dom.createElement("w:del")
-            parent = elem.parentNode
-            parent.insertBefore(del_wrapper, elem)
-            parent.removeChild(elem)
-            del_wrapper.appendChild(elem)
+            del_wrapper = self._wrap(elem, "w:del")
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._index_nodes([del_wrapper])
 
             return del_wrapper
 
-        elif elem.nodeName == "w:p":
+        elif tag == "w:p":
             # Check for existing tracked changes
-            if elem.getElementsByTagName("w:ins") or elem.getElementsByTagName("w:del"):
+            if self._elements("w:ins", elem) or self._elements("w:del", elem):
                 raise ValueError("w:p element already contains tracked changes")
 
             # Check if it's a numbered list item
-            pPr_list = elem.getElementsByTagName("w:pPr")
-            is_numbered = pPr_list and pPr_list[0].getElementsByTagName("w:numPr")
+            pPr_list = self._elements("w:pPr", elem)
+            is_numbered = pPr_list and self._elements("w:numPr", pPr_list[0])
 
             if is_numbered:
                 # Add <w:del/> to w:rPr in w:pPr
                 pPr = pPr_list[0]
-                rPr_list = pPr.getElementsByTagName("w:rPr")
+                rPr_list = self._elements("w:rPr", pPr)
 
                 if not rPr_list:
-                    rPr = self.dom.createElement("w:rPr")
-                    pPr.appendChild(rPr)
+                    rPr = self._create("w:rPr")
+                    self._append(pPr, rPr)
                 else:
                     rPr = rPr_list[0]
 
                 # Add <w:del/> marker
-                del_marker = self.dom.createElement("w:del")
-                rPr.insertBefore(
-                    del_marker, rPr.firstChild
-                ) if rPr.firstChild else rPr.appendChild(del_marker)
+                self._prepend(rPr, self._create("w:del"))
 
             # Convert w:t → w:delText in all runs
-            for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
-                # Copy ALL child nodes (not just firstChild) to handle entities
-                while t_elem.firstChild:
-                    del_text.appendChild(t_elem.firstChild)
-                # Preserve attributes like xml:space
-                for i in range(t_elem.attributes.length):
-                    attr = t_elem.attributes.item(i)
-                    del_text.setAttribute(attr.name, attr.value)
-                t_elem.parentNode.replaceChild(del_text, t_elem)
+            for t_elem in list(self._elements("w:t", elem)):
+                self._rename(t_elem, "w:delText")
 
             # Update run attributes: w:rsidR → w:rsidDel
-            for run in elem.getElementsByTagName("w:r"):
-                if run.hasAttribute("w:rsidR"):
-                    run.setAttribute("w:rsidDel", run.getAttribute("w:rsidR"))
-                    run.removeAttribute("w:rsidR")
-                elif not run.hasAttribute("w:rsidDel"):
-                    run.setAttribute("w:rsidDel", self.rsid)
+            for run in self._elements("w:r", elem):
+                if self._has(run, "w:rsidR"):
+                    self._set(run, "w:rsidDel", self._get(run, "w:rsidR"))
+                    self._remove_attribute(run, "w:rsidR")
+                elif not self._has(run, "w:rsidDel"):
+                    self._set(run, "w:rsidDel", self.rsid)
 
             # Wrap all non-pPr children in <w:del>
-            del_wrapper = self.dom.createElement("w:del")
-            for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
-                elem.removeChild(child)
-                del_wrapper.appendChild(child)
-            elem.appendChild(del_wrapper)
+            del_wrapper = self._wrap_children(elem, "w:del", keep=("w:pPr",))
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._index_nodes([elem])
 
             return elem
 
         else:
-            raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
+            raise ValueError(f"Element must be w:r or w:p, got {tag}")
 
 
 def _generate_hex_id() -> str:
@@ -609,8 +566,38 @@ def _generate_rsid() -> str:
     return "".join(random.choices("0123456789ABCDEF", k=8))
 
 
+def _copy_changed_files(source_dir, target_dir):
+    """Copy the files of source_dir that are missing or differ in target_dir.
+
+    Files are compared by size and modification time, which shutil.copy2 (used
+    both for the temporary copy and here) preserves, so unchanged files are left
+    untouched.
+    """
+    for path in sorted(Path(source_dir).rglob("*")):
+        if not path.is_file():
+            continue
+        target = Path(target_dir) / path.relative_to(source_dir)
+        if target.is_file():
+            source_stat, target_stat = path.stat(), target.stat()
+            if (source_stat.st_size, source_stat.st_mtime_ns) == (
+                target_stat.st_size,
+                target_stat.st_mtime_ns,
+            ):
+                continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, target)
+
+
 class Document:
-    """Manages comments in unpacked Word documents."""
+    """Manages comments in unpacked Word documents.
+
+    All parts are read from and written to self.package (an opc.Package). For
+    an unpacked directory that is a temporary copy of it, at unpacked_path; a
+    Package passed in is edited in memory, without any temporary files.
+
+    Its editors always use the minidom backend: the nodes they return, and the
+    nodes add_comment takes, are minidom elements.
+    """
 
     def __init__(
         self,
@@ -625,27 +612,36 @@ class Document:
         Automatically sets up comment infrastructure (people.xml, RSIDs).
 
         Args:
-            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory)
+            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory),
+                or an opc.Package of the document to edit in memory
             rsid: Optional RSID to use for all comment elements. If not provided, one will be generated.
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
         """
-        self.original_path = Path(unpacked_dir)
+        if isinstance(unpacked_dir, Package):
+            # Edited in memory; the package as it was opened is the baseline
+            self.package = unpacked_dir
+            self.original_path = None
+            self.temp_dir = None
+            self.unpacked_path = None
+            self.original_docx = unpacked_dir.original()
+        else:
+            self.original_path = Path(unpacked_dir)
 
-        if not self.original_path.exists() or not self.original_path.is_dir():
-            raise ValueError(f"Directory not found: {unpacked_dir}")
+            if not self.original_path.exists() or not self.original_path.is_dir():
+                raise ValueError(f"Directory not found: {unpacked_dir}")
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
-        self.temp_dir = tempfile.mkdtemp(prefix="docx_")
-        self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
+            # Create temporary directory with subdirectories for unpacked content and baseline
+            self.temp_dir = tempfile.mkdtemp(prefix="docx_")
+            self.unpacked_path = Path(self.temp_dir) / "unpacked"
+            shutil.copytree(self.original_path, self.unpacked_path)
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+            # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
+            self.original_docx = Path(self.temp_dir) / "original.docx"
+            pack_document(self.original_path, self.original_docx, validate=False)
 
-        self.word_path = self.unpacked_path / "word"
+            self.package = Package(self.unpacked_path)
 
         # Generate RSID if not provided
         self.rsid = rsid if rsid else _generate_rsid()
@@ -658,12 +654,6 @@ class Document:
         # Cache for lazy-loaded editors
         self._editors = {}
 
-        # Comment file paths
-        self.comments_path = self.word_path / "comments.xml"
-        self.comments_extended_path = self.word_path / "commentsExtended.xml"
-        self.comments_ids_path = self.word_path / "commentsIds.xml"
-        self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
-
         # Load existing comments and determine next ID (before setup modifies files)
         self.existing_comments = self._load_existing_comments()
         self.next_comment_id = self._get_next_comment_id()
@@ -688,10 +678,10 @@ class Document:
             xml_path: Relative path to XML file (e.g., "word/document.xml", "word/comments.xml")
 
         Returns:
-            DocxXMLEditor instance for the specified file
+            DocxXMLEditor instance for the specified file (minidom backend)
 
         Raises:
-            ValueError: If the file does not exist
+            ValueError: If the package has no such part
 
         Example:
             # Get node from document.xml
@@ -701,12 +691,19 @@ class Document:
             comment = doc["word/comments.xml"].get_node(tag="w:comment", attrs={"w:id": "0"})
         """
         if xml_path not in self._editors:
-            file_path = self.unpacked_path / xml_path
-            if not file_path.exists():
+            if xml_path not in self.package:
                 raise ValueError(f"XML file not found: {xml_path}")
+            file_path = None
+            if self.unpacked_path is not None:
+                file_path = self.unpacked_path / xml_path
             # Use DocxXMLEditor with RSID, author, and initials for all editors
             self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+                file_path,
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
+                data=self.package.read(xml_path),
+                backend="minidom",
             )
         return self._editors[xml_path]
 
@@ -832,8 +829,9 @@ class Document:
 
     def __del__(self):
         """Clean up temporary directory on deletion."""
-        if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
-            shutil.rmtree(self.temp_dir)
+        temp_dir = getattr(self, "temp_dir", None)
+        if temp_dir is not None and Path(temp_dir).exists():
+            shutil.rmtree(temp_dir)
 
     def validate(self) -> None:
         """
@@ -842,57 +840,89 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
-        schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
-        redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
-
-        # Run validations
-        if not schema_validator.validate():
-            raise ValueError("Schema validation failed")
-        if not redlining_validator.validate():
-            raise ValueError("Redlining validation failed")
+        self._write_editors()
+        self._validate()
 
     def save(self, destination=None, validate=True) -> None:
         """
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Only parts whose XML changed (through the editor or its dom) are
+        rewritten, and only files that changed are copied, so the others keep
+        their modification times.
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
+                For a Document of a Package, None keeps the changes in the package;
+                a .docx path packs it there and any other path extracts it there.
             validate: If True, validates document before saving (default: True).
         """
         # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
+        if "word/comments.xml" in self.package:
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
-        # Save all modified XML files in temp directory
-        for editor in self._editors.values():
-            editor.save()
+        # Save all modified XML files in the package
+        self._write_editors()
 
         # Validate by default
         if validate:
-            self.validate()
+            self._validate()
+
+        if self.unpacked_path is None:
+            if destination is None:
+                return
+            if Path(destination).suffix.lower() == ".docx":
+                pack_document(self.package, destination)
+            else:
+                self.package.extract(destination)
+            return
 
-        # Copy contents from temp directory to destination (or original directory)
+        # Write the changes to the temp directory, then copy the files that differ
+        # to the destination (or original directory)
+        self.package.extract(self.unpacked_path)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        _copy_changed_files(self.unpacked_path, target_path)
+
+    def _write_editors(self):
+        """Write the XML of the editors that changed to the package.
+
+        Editors only read by this class, or whose nodes were only looked at,
+        are unmodified and skipped, so their parts keep their files untouched.
+        """
+        for xml_path, editor in self._editors.items():
+            if not editor.modified:
+                continue
+            data = editor.to_bytes()
+            if data != self.package.read(xml_path):
+                self.package.write(xml_path, data)
+
+    def _validate(self):
+        # Create validators with current state
+        schema_validator = DOCXSchemaValidator(
+            self.package, self.original_docx, verbose=False
+        )
+        redlining_validator = RedliningValidator(
+            self.package, self.original_docx, verbose=False
+        )
+
+        # Run validations
+        if not schema_validator.validate():
+            raise ValueError("Schema validation failed")
+        if not redlining_validator.validate():
+            raise ValueError("Redlining validation failed")
 
     # ==================== Private: Initialization ====================
 
     def _get_next_comment_id(self):
         """Get the next available comment ID."""
-        if not self.comments_path.exists():
+        if "word/comments.xml" not in self.package:
             return 0
 
         editor = self["word/comments.xml"]
         max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
+        for comment_elem in editor.get_nodes([{"tag": "w:comment"}])[0]:
             comment_id = comment_elem.getAttribute("w:id")
             if comment_id:
                 try:
@@ -903,13 +933,13 @@ class Document:
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        if "word/comments.xml" not in self.package:
             return {}
 
         editor = self["word/comments.xml"]
         existing = {}
 
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
+        for comment_elem in editor.get_nodes([{"tag": "w:comment"}])[0]:
             comment_id = comment_elem.getAttribute("w:id")
             if not comment_id:
                 continue
@@ -937,25 +967,24 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml
         """
         # Create or update word/people.xml
-        people_file = self.word_path / "people.xml"
-        self._update_people_xml(people_file)
+        self._update_people_xml("word/people.xml")
 
         # Update XML files
-        self._add_content_type_for_people(self.unpacked_path / "[Content_Types].xml")
-        self._add_relationship_for_people(
-            self.word_path / "_rels" / "document.xml.rels"
-        )
+        self._add_content_type_for_people("[Content_Types].xml")
+        self._add_relationship_for_people("word/_rels/document.xml.rels")
 
         # Always add RSID to settings.xml, optionally enable trackRevisions
-        self._update_settings(
-            self.word_path / "settings.xml", track_revisions=track_revisions
-        )
+        self._update_settings("word/settings.xml", track_revisions=track_revisions)
 
     def _update_people_xml(self, path):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
-            # Copy from template
-            shutil.copy(TEMPLATE_DIR / "people.xml", path)
+        self._add_part_from_template(path)
+
+    def _add_part_from_template(self, path):
+        """Add a part to the package from TEMPLATE_DIR if it doesn't exist."""
+        if path not in self.package:
+            template = TEMPLATE_DIR / posixpath.basename(path)
+            self.package.write(path, template.read_bytes())
 
     def _add_content_type_for_people(self, path):
         """Add people.xml content type to [Content_Types].xml if not already present."""
@@ -989,7 +1018,7 @@ class Document:
         """Add RSID and optionally enable track revisions in settings.xml.
 
         Args:
-            path: Path to settings.xml
+            path: Part name of settings.xml
             track_revisions: If True, adds trackRevisions element
 
         Places elements per OOXML schema order:
@@ -1002,17 +1031,12 @@ class Document:
 
         # Conditionally add trackRevisions if requested
         if track_revisions:
-            track_revisions_exists = any(
-                elem.tagName == f"{prefix}:trackRevisions"
-                for elem in editor.dom.getElementsByTagName(f"{prefix}:trackRevisions")
-            )
-
-            if not track_revisions_exists:
+            if not editor.get_nodes([{"tag": f"{prefix}:trackRevisions"}])[0]:
                 track_rev_xml = f"<{prefix}:trackRevisions/>"
                 # Try to insert before documentProtection, defaultTabStop, or at start
                 inserted = False
                 for tag in [f"{prefix}:documentProtection", f"{prefix}:defaultTabStop"]:
-                    elements = editor.dom.getElementsByTagName(tag)
+                    elements = editor.get_nodes([{"tag": tag}])[0]
                     if elements:
                         editor.insert_before(elements[0], track_rev_xml)
                         inserted = True
@@ -1025,7 +1049,7 @@ class Document:
                         editor.append_to(root, track_rev_xml)
 
         # Always check if rsids section exists
-        rsids_elements = editor.dom.getElementsByTagName(f"{prefix}:rsids")
+        rsids_elements = editor.get_nodes([{"tag": f"{prefix}:rsids"}])[0]
 
         if not rsids_elements:
             # Add new rsids section
@@ -1036,15 +1060,15 @@ class Document:
 
             # Try to insert after compat, before clrSchemeMapping, or before closing tag
             inserted = False
-            compat_elements = editor.dom.getElementsByTagName(f"{prefix}:compat")
+            compat_elements = editor.get_nodes([{"tag": f"{prefix}:compat"}])[0]
             if compat_elements:
                 editor.insert_after(compat_elements[0], rsids_xml)
                 inserted = True
 
             if not inserted:
-                clr_elements = editor.dom.getElementsByTagName(
-                    f"{prefix}:clrSchemeMapping"
-                )
+                clr_elements = editor.get_nodes(
+                    [{"tag": f"{prefix}:clrSchemeMapping"}]
+                )[0]
                 if clr_elements:
                     editor.insert_before(clr_elements[0], rsids_xml)
                     inserted = True
@@ -1069,8 +1093,7 @@ class Document:
         self, comment_id, para_id, text, author, initials, timestamp
     ):
         """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
-            shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
+        self._add_part_from_template("word/comments.xml")
 
         editor = self["word/comments.xml"]
         root = editor.get_node(tag="w:comments")
@@ -1090,10 +1113,7 @@ class Document:
 
     def _add_to_comments_extended_xml(self, para_id, parent_para_id):
         """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
-            )
+        self._add_part_from_template("word/commentsExtended.xml")
 
         editor = self["word/commentsExtended.xml"]
         root = editor.get_node(tag="w15:commentsEx")
@@ -1106,8 +1126,7 @@ class Document:
 
     def _add_to_comments_ids_xml(self, para_id, durable_id):
         """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
-            shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
+        self._add_part_from_template("word/commentsIds.xml")
 
         editor = self["word/commentsIds.xml"]
         root = editor.get_node(tag="w16cid:commentsIds")
@@ -1117,10 +1136,7 @@ class Document:
 
     def _add_to_comments_extensible_xml(self, durable_id):
         """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
-            )
+        self._add_part_from_template("word/commentsExtensible.xml")
 
         editor = self["word/commentsExtensible.xml"]
         root = editor.get_node(tag="w16cex:commentsExtensible")
@@ -1159,31 +1175,26 @@ class Document:
 
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
-            if rel_elem.getAttribute("Target") == target:
-                return True
-        return False
+        return bool(
+            editor.get_nodes([{"tag": "Relationship", "attrs": {"Target": target}}])[0]
+        )
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
-            if override_elem.getAttribute("PartName") == part_name:
-                return True
-        return False
+        return bool(
+            editor.get_nodes([{"tag": "Override", "attrs": {"PartName": part_name}}])[0]
+        )
 
     def _has_author(self, editor, author):
         """Check if an author already exists in people.xml."""
-        for person_elem in editor.dom.getElementsByTagName("w15:person"):
-            if person_elem.getAttribute("w15:author") == author:
-                return True
-        return False
+        return bool(
+            editor.get_nodes([{"tag": "w15:person", "attrs": {"w15:author": author}}])[0]
+        )
 
     def _add_author_to_people(self, author):
         """Add author to people.xml (called during initialization)."""
-        people_path = self.word_path / "people.xml"
-
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if "word/people.xml" not in self.package:
             raise ValueError("people.xml should exist after _setup_tracking")
 
         editor = self["word/people.xml"]
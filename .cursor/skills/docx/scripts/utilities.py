@@ -4,7 +4,8 @@ Utilities for editing OOXML documents.
 
 This module provides XMLEditor, a tool for manipulating XML files with support for
 line-number-based node finding and DOM manipulation. Each element is automatically
-annotated with its original line and column position during parsing.
+annotated with its original line and column position during parsing. Editors use a
+defusedxml.minidom DOM by default, or an lxml tree with backend="lxml".
 
 Example usage:
     editor = XMLEditor("document.xml")
@@ -22,20 +23,35 @@ Example usage:
     # Combine filters
     elem = editor.get_node(tag="w:p", line_number=range(1, 50), contains="text")
 
+    # Find many nodes with one call: key -> list of matches
+    found = editor.get_nodes({"paras": {"tag": "w:p", "line_number": range(1, 50)}})
+
     # Replace, insert, or manipulate
     new_elem = editor.replace_node(elem, "<w:r><w:t>new text</w:t></w:r>")
     editor.insert_after(new_elem, "<w:r><w:t>more</w:t></w:r>")
 
     # Save changes
     editor.save()
+
+    # Same API on an lxml tree: faster to parse and save, smaller in memory
+    editor = XMLEditor("document.xml", backend="lxml")
 """
 
+import bisect
+import copy
+import functools
 import html
+import io
+import itertools
+import re
 from pathlib import Path
 from typing import Optional, Union
 
 import defusedxml.minidom
 import defusedxml.sax
+import lxml.etree
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
 
 
 class XMLEditor:
@@ -46,32 +62,102 @@ class XMLEditor:
     of each element. This enables finding nodes by their line number in the original
     file, which is useful when working with Read tool output.
 
+    get_node looks elements up in an index by tag, attribute value, line and
+    text (contains searches the joined text of all elements of the tag at once),
+    built on first use and kept up to date by replace_node, insert_after,
+    insert_before and append_to. Once nodes were handed to the caller (by dom,
+    get_node, get_nodes or the editing methods), any node reachable from them
+    may have been changed directly, so from then on get_node scans the elements
+    of the tag instead and get_nodes checks every spec in one pass over the
+    tree: the index only answers lookups while it can't be stale.
+
+    With backend="lxml" the document is an lxml tree instead, and get_node and the
+    editing methods take and return lxml elements (tags and attributes are still
+    given as prefixed names like "w:p"). Line numbers are those minidom reports,
+    the line each start tag begins on: lxml's sourceline is the line a tag ends
+    on, and unreliable past line 65535, so lines that differ are read from the
+    XML itself when it is parsed.
+
     Attributes:
-        xml_path: Path to the XML file being edited
+        xml_path: Path to the XML file being edited (None for XML given as bytes)
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
-        dom: Parsed DOM tree with parse_position attributes on elements
+        backend: "minidom" or "lxml"
+        dom: Parsed DOM tree with parse_position attributes on elements, or the
+            lxml.etree.ElementTree with the lxml backend
+        modified: True once the tree was changed by the editing methods, or
+            directly: its XML then differs from when nodes were first handed to
+            the caller (see _hand_out)
     """
 
-    def __init__(self, xml_path):
+    def __init__(self, xml_path, data=None, backend="minidom"):
         """
         Initialize with path to XML file and parse with line number tracking.
 
         Args:
-            xml_path: Path to XML file to edit (str or Path)
+            xml_path: Path to XML file to edit (str or Path), or None with data
+            data: The XML as bytes, e.g. a part of an opc.Package, parsed instead
+                of reading xml_path; save() writes to xml_path if there is one
+            backend: "minidom" (default) or "lxml" (see the class docstring)
 
         Raises:
-            ValueError: If the XML file does not exist
+            ValueError: If the XML file does not exist or the backend is unknown
         """
-        self.xml_path = Path(xml_path)
-        if not self.xml_path.exists():
-            raise ValueError(f"XML file not found: {xml_path}")
-
-        with open(self.xml_path, "rb") as f:
-            header = f.read(200).decode("utf-8", errors="ignore")
+        if backend not in ("minidom", "lxml"):
+            raise ValueError(f"Unknown backend: {backend!r} (use 'minidom' or 'lxml')")
+        self.backend = backend
+        self.xml_path = Path(xml_path) if xml_path is not None else None
+        if data is None:
+            if self.xml_path is None or not self.xml_path.exists():
+                raise ValueError(f"XML file not found: {xml_path}")
+            data = self.xml_path.read_bytes()
+
+        header = data[:200].decode("utf-8", errors="ignore")
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
 
-        parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        if backend == "lxml":
+            self._dom = lxml.etree.parse(io.BytesIO(data), _create_lxml_parser())
+            # Element -> line where it differs from (or can't be read from) sourceline
+            self._lines = {
+                elem: line
+                for elem, line in zip(
+                    self._dom.getroot().iter(lxml.etree.Element),
+                    _start_tag_lines(data),
+                )
+                if line != elem.sourceline or line >= 65535
+            }
+        else:
+            parser = _create_line_tracking_parser()
+            self._dom = defusedxml.minidom.parse(io.BytesIO(data), parser)
+        self._node_index = None  # _NodeIndex, built by the first get_node
+        self._handed_out = False  # See _hand_out
+        self._edited = False  # Changed by the editing methods
+        self._handed_out_xml = None  # to_bytes() when first handed out unedited
+
+    @property
+    def dom(self):
+        """The parsed tree, for direct manipulation.
+
+        Changes made through it can't be seen by the editor, so lookups stop
+        using the node index (see the class docstring) once it was accessed.
+        """
+        self._hand_out()
+        return self._dom
+
+    @dom.setter
+    def dom(self, dom):
+        self._node_index = None
+        self._edited = True
+        self._hand_out()
+        self._dom = dom
+
+    @property
+    def modified(self):
+        """True if the tree was changed, by the editing methods or directly."""
+        if self._edited:
+            return True
+        return self._handed_out_xml is not None and (
+            self.to_bytes() != self._handed_out_xml
+        )
 
     def get_node(
         self,
@@ -88,7 +174,8 @@ class XMLEditor:
 
         Args:
             tag: The XML tag name (e.g., "w:del", "w:ins", "w:r")
-            attrs: Dictionary of attribute name-value pairs to match (e.g., {"w:id": "1"})
+            attrs: Dictionary of attribute name-value pairs to match (e.g., {"w:id": "1"});
+                   a value may also be a set of accepted values (e.g., {"w:id": {"1", "2"}})
             line_number: Line number (int) or line range (range) in original XML file (1-indexed)
             contains: Text string that must appear in any text node within the element.
                       Supports both entity notation (&#8220;) and Unicode characters (\u201c).
@@ -109,41 +196,99 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
-            # Check line_number filter
-            if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
+        if self._handed_out:
+            matches = [
+                elem
+                for elem in self._elements(tag)
+                if self._matches(elem, attrs, line_number, contains)
+            ]
+        else:
+            matches = self._indexed_matches(tag, attrs, line_number, contains)
+
+        self._check_unique(matches, tag, attrs, line_number, contains)
+        self._hand_out()
+        return matches[0]
 
-                # Handle both single line number and range
-                if isinstance(line_number, range):
-                    if elem_line not in line_number:
-                        continue
-                else:
-                    if elem_line != line_number:
-                        continue
+    def get_nodes(self, specs, unique=False):
+        """
+        Get the DOM elements matching each of several get_node filter specs at once.
 
-            # Check attrs filter
-            if attrs is not None:
-                if not all(
-                    elem.getAttribute(attr_name) == attr_value
-                    for attr_name, attr_value in attrs.items()
-                ):
-                    continue
+        Specs are answered in at most one pass over the document, or from the
+        node index while it can be used (see the class docstring), instead of a
+        scan per get_node call. Unlike get_node, a spec may match any number of
+        elements unless unique is set.
 
-            # Check contains filter
-            if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
+        Args:
+            specs: Dict mapping keys of your choice to filter specs, or a list of
+                specs (keyed by position). A spec is a dict of get_node arguments:
+                "tag" and optionally "attrs", "line_number" and "contains"
+            unique: If True, every spec must match exactly one element, and that
+                element is returned instead of a list (default: False)
+
+        Returns:
+            dict: Key of each spec -> list of its matching elements in document
+            order (or the matching element, if unique), in the order of specs
 
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+        Raises:
+            ValueError: If unique and a spec matches no element or several
+            TypeError: If a spec has no "tag" or an unknown filter
+
+        Example:
+            found = editor.get_nodes(
+                {
+                    "paragraphs": {"tag": "w:p", "line_number": range(100, 200)},
+                    "starts": {"tag": "w:commentRangeStart", "attrs": {"w:id": {"1", "4"}}},
+                }
+            )
+            for para in found["paragraphs"]:
+                ...
+            intro, outro = editor.get_nodes(
+                [{"tag": "w:p", "contains": "Intro"}, {"tag": "w:p", "contains": "Outro"}],
+                unique=True,
+            ).values()
+        """
+        if not isinstance(specs, dict):
+            specs = dict(enumerate(specs))
+        filters = {key: _node_filters(**spec) for key, spec in specs.items()}
+        if self._handed_out:
+            found = {key: [] for key in specs}
+            keys_by_tag = {}
+            for key, (tag, *_) in filters.items():
+                keys_by_tag.setdefault(tag, []).append(key)
+            for elem in self._elements("*"):
+                for key in keys_by_tag.get(self._tag(elem), ()):
+                    if self._matches(elem, *filters[key][1:]):
+                        found[key].append(elem)
+        else:
+            found = {key: self._indexed_matches(*filters[key]) for key in specs}
+            if any(len(matches) > 1 for matches in found.values()):
+                # One pass puts the matches in document order
+                position = {elem: i for i, elem in enumerate(self._elements("*"))}
+                for matches in found.values():
+                    matches.sort(key=position.__getitem__)
+
+        self._hand_out()
+        if unique:
+            for key, matches in found.items():
+                self._check_unique(matches, *filters[key])
+            return {key: matches[0] for key, matches in found.items()}
+        return found
+
+    def _indexed_matches(self, tag, attrs, line_number, contains):
+        """Return the elements the node index finds for get_node filters."""
+        if self._node_index is None:
+            self._node_index = _NodeIndex(self)
+        candidates = self._node_index.candidates(tag, attrs, line_number, contains)
+        return [
+            elem
+            for elem in candidates
+            if self._tag(elem) == tag
+            and self._matches(elem, attrs, line_number, contains)
+            and self._node_index.is_attached(elem)
+        ]
 
+    def _check_unique(self, matches, tag, attrs, line_number, contains):
+        """Raise a ValueError describing the filters unless there is one match."""
         if not matches:
             # Build descriptive error message
             filters = []
@@ -178,7 +323,40 @@ class XMLEditor:
                 f"Multiple nodes found: <{tag}>. "
                 f"Add more filters (attrs, line_number, or contains) to narrow the search."
             )
-        return matches[0]
+
+    def _matches(self, elem, attrs, line_number, contains):
+        """Return True if an element passes the get_node filters that are given."""
+        # Check line_number filter
+        if line_number is not None:
+            elem_line = self._line(elem)
+
+            # Handle both single line number and range
+            if isinstance(line_number, range):
+                if elem_line not in line_number:
+                    return False
+            else:
+                if elem_line != line_number:
+                    return False
+
+        # Check attrs filter
+        if attrs is not None:
+            if not all(
+                _attribute_matches(self._get(elem, attr_name), attr_value)
+                for attr_name, attr_value in attrs.items()
+            ):
+                return False
+
+        # Check contains filter
+        if contains is not None:
+            elem_text = self._get_element_text(elem)
+            # Normalize the search string: convert HTML entities to Unicode characters
+            # This allows searching for both "&#8220;Rowan" and ""Rowan"
+            normalized_contains = _unescape(contains)
+            if normalized_contains not in elem_text:
+                return False
+
+        # All applicable filters passed
+        return True
 
     def _get_element_text(self, elem):
         """
@@ -188,11 +366,20 @@ class XMLEditor:
         which typically represent XML formatting rather than document content.
 
         Args:
-            elem: defusedxml.minidom.Element to extract text from
+            elem: defusedxml.minidom.Element (or lxml element) to extract text from
 
         Returns:
             str: Concatenated text from all non-whitespace text nodes within the element
         """
+        if self.backend == "lxml":
+            text_parts = [elem.text] if elem.text and elem.text.strip() else []
+            for child in elem:
+                if isinstance(child.tag, str):
+                    text_parts.append(self._get_element_text(child))
+                if child.tail and child.tail.strip():
+                    text_parts.append(child.tail)
+            return "".join(text_parts)
+
         text_parts = []
         for node in elem.childNodes:
             if node.nodeType == node.TEXT_NODE:
@@ -212,16 +399,22 @@ class XMLEditor:
             new_content: String containing XML to replace the node with
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List[defusedxml.minidom.Node]: All inserted nodes (with lxml, the
+            inserted elements and comments; text goes into their tails)
 
         Example:
             new_nodes = editor.replace_node(old_elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        nodes = self._parse_fragment(new_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        parent.removeChild(elem)
+        if self.backend == "lxml":
+            nodes = self._place_fragment(elem, new_content, "replace")
+        else:
+            parent = elem.parentNode
+            nodes = self._parse_fragment(new_content)
+            for node in nodes:
+                parent.insertBefore(node, elem)
+            parent.removeChild(elem)
+        self._unindex_node(elem)
+        self._index_nodes(nodes)
         return nodes
 
     def insert_after(self, elem, xml_content):
@@ -233,19 +426,24 @@ class XMLEditor:
             xml_content: String containing XML to insert
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List[defusedxml.minidom.Node]: All inserted nodes (with lxml, the
+            inserted elements and comments; text goes into their tails)
 
         Example:
             new_nodes = editor.insert_after(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        next_sibling = elem.nextSibling
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            if next_sibling:
-                parent.insertBefore(node, next_sibling)
-            else:
-                parent.appendChild(node)
+        if self.backend == "lxml":
+            nodes = self._place_fragment(elem, xml_content, "after")
+        else:
+            parent = elem.parentNode
+            next_sibling = elem.nextSibling
+            nodes = self._parse_fragment(xml_content)
+            for node in nodes:
+                if next_sibling:
+                    parent.insertBefore(node, next_sibling)
+                else:
+                    parent.appendChild(node)
+        self._index_nodes(nodes)
         return nodes
 
     def insert_before(self, elem, xml_content):
@@ -257,15 +455,20 @@ class XMLEditor:
             xml_content: String containing XML to insert
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List[defusedxml.minidom.Node]: All inserted nodes (with lxml, the
+            inserted elements and comments; text goes into their tails)
 
         Example:
             new_nodes = editor.insert_before(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
+        if self.backend == "lxml":
+            nodes = self._place_fragment(elem, xml_content, "before")
+        else:
+            parent = elem.parentNode
+            nodes = self._parse_fragment(xml_content)
+            for node in nodes:
+                parent.insertBefore(node, elem)
+        self._index_nodes(nodes)
         return nodes
 
     def append_to(self, elem, xml_content):
@@ -277,21 +480,26 @@ class XMLEditor:
             xml_content: String containing XML to append
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List[defusedxml.minidom.Node]: All inserted nodes (with lxml, the
+            inserted elements and comments; text goes into their tails)
 
         Example:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            elem.appendChild(node)
+        if self.backend == "lxml":
+            nodes = self._place_fragment(elem, xml_content, "append")
+        else:
+            nodes = self._parse_fragment(xml_content)
+            for node in nodes:
+                elem.appendChild(node)
+        self._index_nodes(nodes)
         return nodes
 
     def get_next_rid(self):
         """Get the next available rId for relationships files."""
         max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
-            rel_id = rel_elem.getAttribute("Id")
+        for rel_elem in self._elements("Relationship"):
+            rel_id = self._get(rel_elem, "Id")
             if rel_id.startswith("rId"):
                 try:
                     max_id = max(max_id, int(rel_id[3:]))
@@ -305,9 +513,53 @@ class XMLEditor:
 
         Serializes the DOM tree and writes it back to the original file path,
         preserving the original encoding (ascii or utf-8).
+
+        Raises:
+            ValueError: If the editor was given bytes without a file path
         """
-        content = self.dom.toxml(encoding=self.encoding)
-        self.xml_path.write_bytes(content)
+        if self.xml_path is None:
+            raise ValueError("No file to save to; use to_bytes() instead")
+        self.xml_path.write_bytes(self.to_bytes())
+
+    def to_bytes(self):
+        """Return the edited XML, serialized in the original encoding."""
+        if self.backend == "lxml":
+            # The declaration minidom writes, instead of lxml's single-quoted one
+            declaration = f'<?xml version="1.0" encoding="{self.encoding}"?>'
+            return declaration.encode() + lxml.etree.tostring(
+                self._dom, encoding=self.encoding, xml_declaration=False
+            )
+        return self._dom.toxml(encoding=self.encoding)
+
+    def _index_nodes(self, nodes):
+        """Add nodes inserted into the DOM or changed in place to the node index.
+
+        Their elements are indexed by the next lookup that uses the index, with
+        the attribute values and text they have then, and are handed out (see
+        _hand_out) as the editing methods return them. Every edit goes through
+        here, so this is also where the editor is marked modified.
+        """
+        if self._node_index is not None:
+            self._node_index.add(nodes)
+        self._edited = True
+        self._hand_out()
+
+    def _hand_out(self):
+        """Note that nodes (or the dom) are given to the caller.
+
+        The caller may change them, or anything reachable from them, directly,
+        which the index can't see: from now on lookups scan the tree instead.
+        The first time, unless the editing methods changed the tree already,
+        its XML is kept to tell whether it was changed later (see modified).
+        """
+        if not self._edited and self._handed_out_xml is None:
+            self._handed_out_xml = self.to_bytes()
+        self._handed_out = True
+
+    def _unindex_node(self, node):
+        """Remove a node taken out of the DOM, and its descendants, from the index."""
+        if self._node_index is not None:
+            self._node_index.discard(node)
 
     def _parse_fragment(self, xml_content):
         """
@@ -323,7 +575,7 @@ class XMLEditor:
             AssertionError: If fragment contains no element nodes
         """
         # Extract namespace declarations from the root document element
-        root_elem = self.dom.documentElement
+        root_elem = self._dom.documentElement
         namespaces = []
         if root_elem and root_elem.attributes:
             for i in range(root_elem.attributes.length):
@@ -335,13 +587,529 @@ class XMLEditor:
         wrapper = f"<root {ns_decl}>{xml_content}</root>"
         fragment_doc = defusedxml.minidom.parseString(wrapper)
         nodes = [
-            self.dom.importNode(child, deep=True)
+            self._dom.importNode(child, deep=True)
             for child in fragment_doc.documentElement.childNodes  # type: ignore
         ]
         elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
         assert elements, "Fragment must contain at least one element"
         return nodes
 
+    def _parse_lxml_fragment(self, xml_content):
+        """
+        Parse XML fragment for the lxml backend.
+
+        Returns:
+            tuple: (text before the first node or None, list of the elements and
+            comments of the fragment, not yet in this document)
+
+        Raises:
+            AssertionError: If fragment contains no element nodes
+        """
+        namespaces = [
+            f'xmlns:{prefix}="{uri}"' if prefix else f'xmlns="{uri}"'
+            for prefix, uri in self._dom.getroot().nsmap.items()
+        ]
+        wrapper = lxml.etree.fromstring(
+            f"<root {' '.join(namespaces)}>{xml_content}</root>".encode("utf-8"),
+            _create_lxml_parser(),
+        )
+        for elem in wrapper.iter(lxml.etree.Element):
+            elem.sourceline = 0  # Not from the original file: no line number
+        nodes = list(wrapper)
+        assert any(
+            isinstance(n.tag, str) for n in nodes
+        ), "Fragment must contain at least one element"
+        return wrapper.text, nodes
+
+    def _place_fragment(self, elem, xml_content, position):
+        """
+        Insert an XML fragment in an lxml tree, where the minidom backend would.
+
+        lxml keeps text as the text and tail of elements, so the text around elem
+        is moved to keep it where it was relative to the inserted nodes.
+
+        Args:
+            elem: The lxml element the fragment goes "before", "after", into
+                ("append") or in place of ("replace")
+            xml_content: String containing XML to insert
+            position: One of "before", "after", "append" and "replace"
+
+        Returns:
+            list: The inserted elements and comments
+        """
+        text, nodes = self._parse_lxml_fragment(xml_content)
+        if position == "after":
+            tail, elem.tail = elem.tail, text
+            anchor = elem
+            for node in nodes:
+                anchor.addnext(node)
+                anchor = node
+            nodes[-1].tail = _join_text(nodes[-1].tail, tail)
+            return nodes
+
+        for node in nodes:
+            if position == "append":
+                elem.append(node)
+            else:
+                elem.addprevious(node)
+        previous = nodes[0].getprevious()
+        if previous is not None:
+            previous.tail = _join_text(previous.tail, text)
+        else:
+            parent = nodes[0].getparent()
+            parent.text = _join_text(parent.text, text)
+        if position == "replace":
+            nodes[-1].tail = _join_text(nodes[-1].tail, elem.tail)
+            elem.tail = None
+            elem.getparent().remove(elem)
+        return nodes
+
+    # DOM helpers for either backend, used by subclasses like DocxXMLEditor.
+    # Elements are minidom elements or lxml elements, names are prefixed names.
+
+    def _root(self):
+        """Return the document element."""
+        if self.backend == "lxml":
+            return self._dom.getroot()
+        return self._dom.documentElement
+
+    def _elements(self, tag, node=None):
+        """Return the elements named tag ("*" for all) in document order.
+
+        Args:
+            tag: Prefixed name like "w:p", or "*"
+            node: Only return descendants of this element (default: the document)
+        """
+        if self.backend != "lxml":
+            return (self._dom if node is None else node).getElementsByTagName(tag)
+        start = self._dom if node is None else node
+        qualified = None if tag == "*" else self._qualify(tag)
+        if tag == "*":
+            elements = start.iter(lxml.etree.Element)
+        elif qualified is not None:
+            elements = start.iter(qualified)
+        else:
+            # The prefix isn't declared on the root: compare prefixed names
+            elements = (
+                e for e in start.iter(lxml.etree.Element) if self._tag(e) == tag
+            )
+        return [e for e in elements if e is not node]
+
+    def _tag(self, node):
+        """Return the prefixed name of an element, or None for other nodes."""
+        if self.backend != "lxml":
+            return node.tagName if node.nodeType == node.ELEMENT_NODE else None
+        if not isinstance(node.tag, str):
+            return None
+        local = lxml.etree.QName(node).localname
+        return f"{node.prefix}:{local}" if node.prefix else local
+
+    def _line(self, elem):
+        """Return the line an element was parsed from, or None if it was added."""
+        if self.backend == "lxml":
+            return self._lines.get(elem, elem.sourceline)
+        return getattr(elem, "parse_position", (None,))[0]
+
+    def _get(self, elem, name):
+        """Return the value of an attribute, or "" if it isn't set."""
+        if self.backend != "lxml":
+            return elem.getAttribute(name)
+        qualified = self._qualify(name, elem, attribute=True)
+        return "" if qualified is None else elem.get(qualified, "")
+
+    def _has(self, elem, name):
+        """Return True if an element has an attribute."""
+        if self.backend != "lxml":
+            return elem.hasAttribute(name)
+        qualified = self._qualify(name, elem, attribute=True)
+        return qualified is not None and qualified in elem.attrib
+
+    def _set(self, elem, name, value):
+        """Set an attribute; with lxml, its prefix must be declared."""
+        if self.backend != "lxml":
+            elem.setAttribute(name, value)
+            return
+        qualified = self._qualify(name, elem, attribute=True)
+        if qualified is None:
+            raise ValueError(f"Namespace prefix of {name!r} is not declared")
+        elem.set(qualified, value)
+
+    def _remove_attribute(self, elem, name):
+        """Remove an attribute that is set."""
+        if self.backend != "lxml":
+            elem.removeAttribute(name)
+            return
+        del elem.attrib[self._qualify(name, elem, attribute=True)]
+
+    def _parent(self, node):
+        """Return the parent of a node (the minidom Document for its root), or None."""
+        if self.backend == "lxml":
+            return node.getparent()
+        return node.parentNode
+
+    def _create(self, tag):
+        """Return a new element, not yet in the document."""
+        if self.backend != "lxml":
+            return self._dom.createElement(tag)
+        qualified = self._qualify(tag)
+        if qualified is None:
+            raise ValueError(f"Namespace prefix of {tag!r} is not declared")
+        # Declaring the root's namespaces keeps their prefixes when serialized
+        # on its own; lxml drops the declarations once it is in the document
+        root = self._dom.getroot()
+        return root.makeelement(qualified, nsmap=root.nsmap)
+
+    def _append(self, parent, child):
+        """Add a node as the last child of an element."""
+        if self.backend == "lxml":
+            parent.append(child)
+        else:
+            parent.appendChild(child)
+
+    def _prepend(self, parent, child):
+        """Add a node as the first child of an element."""
+        if self.backend == "lxml":
+            child.tail, parent.text = parent.text, None
+            parent.insert(0, child)
+        elif parent.firstChild:
+            parent.insertBefore(child, parent.firstChild)
+        else:
+            parent.appendChild(child)
+
+    def _rename(self, elem, tag):
+        """Give an element another name, keeping its attributes and content.
+
+        Returns:
+            The renamed element: elem with lxml, a new element replacing it with
+            minidom
+        """
+        # The index lists elements by tag: take elem out under its old one
+        self._unindex_node(elem)
+        if self.backend == "lxml":
+            elem.tag = self._qualify(tag)
+            renamed = elem
+        else:
+            renamed = self._dom.createElement(tag)
+            # Copy ALL child nodes (not just firstChild) to handle entities
+            while elem.firstChild:
+                renamed.appendChild(elem.firstChild)
+            # Preserve attributes like xml:space
+            for i in range(elem.attributes.length):
+                attr = elem.attributes.item(i)
+                renamed.setAttribute(attr.name, attr.value)
+            elem.parentNode.replaceChild(renamed, elem)
+        self._index_nodes([renamed])
+        return renamed
+
+    def _wrap(self, elem, tag):
+        """Put a new element named tag in the place of elem, with elem inside it.
+
+        Returns:
+            The new element
+        """
+        wrapper = self._create(tag)
+        if self.backend == "lxml":
+            elem.addprevious(wrapper)
+            wrapper.tail, elem.tail = elem.tail, None
+            wrapper.append(elem)
+            return wrapper
+        parent = elem.parentNode
+        parent.insertBefore(wrapper, elem)
+        parent.removeChild(elem)
+        wrapper.appendChild(elem)
+        return wrapper
+
+    def _wrap_children(self, elem, tag, keep=()):
+        """Move the children of elem into a new element named tag, its last child.
+
+        Args:
+            elem: Element whose children are moved
+            tag: Name of the new element
+            keep: Names of child elements that stay where they are
+
+        Returns:
+            The new element
+        """
+        wrapper = self._create(tag)
+        if self.backend == "lxml":
+            # Text is moved too, including the tails of the children kept
+            wrapper.text, elem.text = elem.text, None
+            last = None
+            for child in list(elem):
+                if self._tag(child) not in keep:
+                    wrapper.append(child)
+                    last = child
+                    continue
+                tail, child.tail = child.tail, None
+                if last is None:
+                    wrapper.text = _join_text(wrapper.text, tail)
+                else:
+                    last.tail = _join_text(last.tail, tail)
+            elem.append(wrapper)
+            return wrapper
+        for child in [c for c in elem.childNodes if c.nodeName not in keep]:
+            elem.removeChild(child)
+            wrapper.appendChild(child)
+        elem.appendChild(wrapper)
+        return wrapper
+
+    def _clone(self, elem):
+        """Return a deep copy of an element, not in the document."""
+        if self.backend == "lxml":
+            clone = copy.deepcopy(elem)
+            clone.tail = None  # Not part of the element in minidom
+            return clone
+        return elem.cloneNode(True)
+
+    def _to_xml(self, elem):
+        """Return the XML of an element, as a string."""
+        if self.backend == "lxml":
+            return lxml.etree.tostring(elem, encoding="unicode", with_tail=False)
+        return elem.toxml()
+
+    def _first_text(self, elem):
+        """Return the text before the first child of an element, or None."""
+        if self.backend == "lxml":
+            return elem.text
+        first = elem.firstChild
+        return first.data if first and first.nodeType == first.TEXT_NODE else None
+
+    def _declare_namespace(self, prefix, uri):
+        """Declare a namespace prefix on the root element, unless it is already."""
+        if self.backend != "lxml":
+            root = self._dom.documentElement
+            if not root.hasAttribute(f"xmlns:{prefix}"):
+                root.setAttribute(f"xmlns:{prefix}", uri)
+            return
+        root = self._dom.getroot()
+        if prefix in root.nsmap:
+            return
+        # lxml only declares namespaces where they are used: use this one on a
+        # temporary child and have cleanup_namespaces move it up to the root,
+        # keeping every other declaration
+        keep = set().union(*(e.nsmap for e in root.iter(lxml.etree.Element)))
+        probe = lxml.etree.SubElement(root, f"{{{uri}}}probe")
+        lxml.etree.cleanup_namespaces(
+            root, top_nsmap={prefix: uri}, keep_ns_prefixes=keep - {None}
+        )
+        root.remove(probe)
+
+    def _qualify(self, name, elem=None, attribute=False):
+        """Return the {namespace}name lxml uses for a prefixed name, or None.
+
+        The prefix is looked up on the root element, then in scope at elem.
+        Unprefixed element names are in the default namespace, unprefixed
+        attribute names in none. None means the prefix isn't declared.
+        """
+        prefix, _, local = name.rpartition(":")
+        if prefix == "xml":
+            return f"{{{XML_NAMESPACE}}}{local}"
+        if not prefix and attribute:
+            return local
+        uri = self._dom.getroot().nsmap.get(prefix or None)
+        if uri is None and elem is not None:
+            uri = elem.nsmap.get(prefix or None)
+        if uri is None:
+            return None if prefix else local
+        return f"{{{uri}}}{local}"
+
+
+def _join_text(first, second):
+    """Concatenate two lxml text or tail values, either of which may be None."""
+    if not second:
+        return first
+    return (first or "") + second
+
+
+def _node_filters(tag, attrs=None, line_number=None, contains=None):
+    """Return a get_nodes spec as a (tag, attrs, line_number, contains) tuple."""
+    return tag, attrs, line_number, contains
+
+
+@functools.lru_cache(maxsize=256)
+def _unescape(text):
+    """Return text with entities like &#8220; converted to Unicode characters."""
+    return html.unescape(text)
+
+
+def _attribute_matches(value, expected):
+    """Return True if an attribute value is expected, a str or a set of them."""
+    if isinstance(expected, str):
+        return value == expected
+    return value in expected
+
+
+class _NodeIndex:
+    """
+    Index of the elements of an XMLEditor's tree by tag, (tag, attribute) value,
+    line and text. The tree is read through the editor, so either backend works.
+
+    Elements are listed by tag when the index is built; the attribute, line and
+    text indexes of a tag are built the first time a lookup needs them. The text
+    of an element is cached until a node is added or discarded in its subtree.
+    Inserted nodes are queued by add and indexed at the next lookup. Entries are
+    never trusted blindly: callers re-check the filters and is_attached on each
+    candidate, so elements moved, removed or changed behind the index's back
+    are filtered out rather than returned.
+    """
+
+    def __init__(self, editor):
+        self.editor = editor
+        self._by_tag = {}  # Tag -> {element: None}, an ordered set
+        self._by_attr = {}  # (tag, attribute) -> value -> {element: None}
+        self._by_line = {}  # Tag -> ([line, ...] sorted, [element, ...])
+        self._by_text = {}  # Tag -> (NUL-joined texts, [offset, ...], [element, ...])
+        self._texts = {}  # Element -> its text, as XMLEditor._get_element_text
+        self._pending = []  # Nodes added since the last lookup
+        self._add_elements(editor._elements("*"))
+
+    def add(self, nodes):
+        """Queue nodes (and their descendants) to be indexed at the next lookup."""
+        self._pending.extend(nodes)
+
+    def discard(self, node):
+        """Stop listing an element and its descendants."""
+        if self.editor._tag(node) is None:
+            return
+        # Its former ancestors are invalidated by the nodes added in its place
+        for elem in [node, *self.editor._elements("*", node)]:
+            self._by_tag.get(self.editor._tag(elem), {}).pop(elem, None)
+            self._texts.pop(elem, None)
+
+    def candidates(self, tag, attrs=None, line_number=None, contains=None):
+        """Return the indexed elements that may match a get_node lookup.
+
+        The first attribute in attrs selects the buckets of its values (O(1));
+        otherwise contains selects the elements whose text has it, found by
+        searching the texts of all elements of the tag joined in one string;
+        otherwise line_number selects a slice of the elements sorted by line
+        (O(log n)); otherwise all elements of the tag are candidates.
+        """
+        self._flush()
+        if attrs:
+            name, value = next(iter(attrs.items()))
+            buckets = self._attribute_index(tag, name)
+            if isinstance(value, str):
+                return list(buckets.get(value, ()))
+            return list({e: None for v in value for e in buckets.get(v, ())})
+        if contains is not None:
+            joined, offsets, elements = self._text_index(tag)
+            needle = _unescape(contains)
+            found = []
+            start = joined.find(needle)
+            while start != -1:
+                # Texts can't contain NUL, so a match lies within one element's
+                i = bisect.bisect_right(offsets, start) - 1
+                found.append(elements[i])
+                if i + 1 == len(offsets):
+                    break
+                start = joined.find(needle, offsets[i + 1])
+            return found
+        if line_number is not None:
+            lines, elements = self._line_index(tag)
+            if isinstance(line_number, range):
+                if line_number.step != 1:
+                    return elements
+                start, stop = line_number.start, line_number.stop
+            else:
+                start, stop = line_number, line_number + 1
+            return elements[
+                bisect.bisect_left(lines, start) : bisect.bisect_left(lines, stop)
+            ]
+        return list(self._by_tag.get(tag, ()))
+
+    def is_attached(self, elem):
+        """Return True if an element is still part of the document."""
+        root = self.editor._root()
+        node = elem
+        while node is not None:
+            if node is root:
+                return True
+            node = self.editor._parent(node)
+        return False
+
+    def _flush(self):
+        pending, self._pending = self._pending, []
+        for node in pending:
+            if self.editor._tag(node) is not None and self.is_attached(node):
+                self._add_elements([node, *self.editor._elements("*", node)])
+            # The text of the elements around the node changed
+            parent = self.editor._parent(node)
+            while parent is not None:
+                self._texts.pop(parent, None)
+                self._by_text.pop(self.editor._tag(parent), None)
+                parent = self.editor._parent(parent)
+
+    def _add_elements(self, elements):
+        tag_of, get = self.editor._tag, self.editor._get
+        for elem in elements:
+            elem_tag = tag_of(elem)
+            self._by_tag.setdefault(elem_tag, {})[elem] = None
+            self._texts.pop(elem, None)
+            self._by_text.pop(elem_tag, None)
+            for (tag, name), buckets in self._by_attr.items():
+                if tag == elem_tag:
+                    buckets.setdefault(get(elem, name), {})[elem] = None
+            # Only parsed elements have lines, and they are all indexed already
+            # when the line index is built, so it needs no updating
+
+    def _attribute_index(self, tag, name):
+        if (tag, name) not in self._by_attr:
+            buckets = {}
+            for elem in self._by_tag.get(tag, ()):
+                buckets.setdefault(self.editor._get(elem, name), {})[elem] = None
+            self._by_attr[(tag, name)] = buckets
+        return self._by_attr[(tag, name)]
+
+    def _text_index(self, tag):
+        if tag not in self._by_text:
+            elements = list(self._by_tag.get(tag, ()))
+            texts = []
+            for elem in elements:
+                if elem not in self._texts:
+                    self._texts[elem] = self.editor._get_element_text(elem)
+                texts.append(self._texts[elem])
+            offsets = list(itertools.accumulate((len(t) + 1 for t in texts), initial=0))
+            self._by_text[tag] = ("\0".join(texts), offsets[:-1], elements)
+        return self._by_text[tag]
+
+    def _line_index(self, tag):
+        if tag not in self._by_line:
+            lines = (
+                (self.editor._line(elem), i, elem)
+                for i, elem in enumerate(self._by_tag.get(tag, ()))
+            )
+            positioned = sorted(entry for entry in lines if entry[0] is not None)
+            self._by_line[tag] = (
+                [line for line, _, _ in positioned],
+                [elem for _, _, elem in positioned],
+            )
+        return self._by_line[tag]
+
+
+# Markup that may contain "<" without starting an element, or a start tag's "<"
+_MARKUP_PATTERN = re.compile(
+    rb"<!--.*?-->|<!\[CDATA\[.*?\]\]>|<\?.*?\?>|<!DOCTYPE(?:[^\[>]|\[.*?\])*>"
+    rb"|<(?=[^/!?])",
+    re.DOTALL,
+)
+
+
+def _start_tag_lines(data):
+    """Yield the line of each start tag in XML bytes, in document order."""
+    line, position = 1, 0
+    for match in _MARKUP_PATTERN.finditer(data):
+        start = match.start()
+        if match.end() - start == 1:
+            line += data.count(b"\n", position, start)
+            position = start
+            yield line
+
+
+def _create_lxml_parser():
+    """Create the parser of the lxml backend: no entity expansion or network access."""
+    return lxml.etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+
 
 def _create_line_tracking_parser():
     """
@@ -0,0 +1,326 @@
+"""Tests for XMLEditor lookups and Document.save.
+
+Run from the docx skill directory: python -m unittest scripts.utilities_test
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+from .document import Document, DocxXMLEditor
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W = f'xmlns:w="{W_NS}"'
+BACKENDS = ("minidom", "lxml")
+
+
+def sample_document(paragraphs=40):
+    """A pretty-printed document.xml with repeated ids, text and entities."""
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>',
+        f"<w:document {W}>",
+        "  <w:body>",
+    ]
+    for i in range(paragraphs):
+        lines += [
+            f'    <w:p w:id="{i % 7}" w:rsidR="00AB{i % 3:04d}">',
+            "      <w:r>",
+            f"        <w:t>Paragraph {i} &#8220;quoted&#8221;</w:t>",
+            "      </w:r>",
+            "      <w:r>",
+            f'        <w:t xml:space="preserve"> item {i % 5} </w:t>',
+            "      </w:r>",
+            "    </w:p>",
+        ]
+    lines += ["  </w:body>", "</w:document>", ""]
+    return "\n".join(lines).encode("utf-8")
+
+
+QUERIES = [
+    {"tag": "w:p"},
+    {"tag": "w:r"},
+    {"tag": "w:t", "contains": "item 3"},
+    {"tag": "w:t", "contains": "“quoted"},
+    {"tag": "w:t", "contains": "&#8221;"},
+    {"tag": "w:p", "contains": "Paragraph 1"},
+    {"tag": "w:p", "attrs": {"w:id": "3"}},
+    {"tag": "w:p", "attrs": {"w:id": {"1", "5"}, "w:rsidR": "00AB0002"}},
+    {"tag": "w:p", "attrs": {"w:id": "9"}},
+    {"tag": "w:t", "attrs": {"xml:space": "preserve"}, "contains": "item 0"},
+    {"tag": "w:r", "line_number": 21},
+    {"tag": "w:r", "line_number": range(30, 90)},
+    {"tag": "w:p", "line_number": range(4, 60), "attrs": {"w:id": "2"}},
+    {"tag": "w:delText"},
+    {"tag": "w:del"},
+    {"tag": "w:ins", "contains": "new"},
+]
+
+
+def scan(editor, tag, attrs=None, line_number=None, contains=None):
+    """The elements a get_node query matches, by checking every element."""
+    return [
+        elem
+        for elem in editor._elements(tag)
+        if editor._matches(elem, attrs, line_number, contains)
+    ]
+
+
+def make_editor(backend, data=None):
+    return DocxXMLEditor(
+        None, rsid="00AB1234", data=data or sample_document(), backend=backend
+    )
+
+
+def set_attribute(editor, elem, name, value):
+    """Change an attribute directly, as a caller of get_node would."""
+    if editor.backend == "lxml":
+        elem.set(f"{{{W_NS}}}{name.split(':')[1]}", value)
+    else:
+        elem.setAttribute(name, value)
+
+
+class TestGetNode(unittest.TestCase):
+    def assert_index_matches_scan(self, editor):
+        for query in QUERIES:
+            with self.subTest(backend=editor.backend, query=query):
+                expected = scan(editor, **query)
+                self.assertEqual(editor.get_nodes([query])[0], expected)
+                if len(expected) == 1:
+                    self.assertIs(editor.get_node(**query), expected[0])
+                else:
+                    with self.assertRaises(ValueError):
+                        editor.get_node(**query)
+
+    def test_indexed_lookups_match_scan(self):
+        for backend in BACKENDS:
+            self.assert_index_matches_scan(make_editor(backend))
+
+    def test_backends_find_the_same_lines(self):
+        editors = [make_editor(backend) for backend in BACKENDS]
+        for query in QUERIES:
+            with self.subTest(query=query):
+                lines = [
+                    [editor._line(elem) for elem in editor.get_nodes([query])[0]]
+                    for editor in editors
+                ]
+                self.assertEqual(lines[0], lines[1])
+
+    def test_lookups_after_edits(self):
+        for backend in BACKENDS:
+            editor = make_editor(backend)
+            paragraph = editor.get_node(tag="w:p", contains="Paragraph 4 ")
+            editor.insert_after(paragraph, "<w:p><w:r><w:t>new</w:t></w:r></w:p>")
+            editor.suggest_deletion(editor.get_node(tag="w:r", contains="Paragraph 9"))
+            editor.suggest_deletion(editor.get_node(tag="w:p", contains="Paragraph 12"))
+            run = editor.get_node(tag="w:r", contains="Paragraph 20")
+            editor.replace_node(run, "<w:r><w:t>Replaced item 3</w:t></w:r>")
+            self.assert_index_matches_scan(editor)
+
+    def test_renamed_elements_not_found_by_old_tag(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                editor = make_editor(backend)
+                run = editor.get_node(tag="w:r", contains="Paragraph 6 ")
+                editor.suggest_deletion(run)
+                with self.assertRaises(ValueError):
+                    editor.get_node(tag="w:t", contains="Paragraph 6 ")
+                editor.get_node(tag="w:delText", contains="Paragraph 6 ")
+
+    def test_direct_changes_to_returned_nodes(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                editor = make_editor(backend)
+                first = editor.get_node(tag="w:p", contains="Paragraph 1 ")
+                second = editor.get_node(tag="w:p", contains="Paragraph 2 ")
+                set_attribute(editor, first, "w:id", "x")
+                self.assertIs(editor.get_node(tag="w:p", attrs={"w:id": "x"}), first)
+                set_attribute(editor, second, "w:id", "x")
+                with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+                    editor.get_node(tag="w:p", attrs={"w:id": "x"})
+
+    def test_direct_changes_to_nodes_reached_from_returned_nodes(self):
+        data = sample_document().replace(b"<w:r>", b'<w:r w:rsidR="1">', 1)
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                editor = make_editor(backend, data)
+                first = editor.get_node(tag="w:r", attrs={"w:rsidR": "1"})
+                paragraph = editor.get_node(tag="w:p", contains="Paragraph 2 ")
+                run = editor._elements("w:r", paragraph)[0]
+                set_attribute(editor, run, "w:rsidR", "1")
+                with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+                    editor.get_node(tag="w:r", attrs={"w:rsidR": "1"})
+                set_attribute(editor, first, "w:rsidR", "2")
+                self.assertIs(editor.get_node(tag="w:r", attrs={"w:rsidR": "1"}), run)
+
+    def test_direct_changes_through_dom(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                editor = make_editor(backend)
+                editor.get_node(tag="w:p", contains="Paragraph 6 ")
+                editor.dom  # Handed out for direct changes
+                paragraphs = list(editor._elements("w:p"))
+                set_attribute(editor, paragraphs[0], "w:id", "x")
+                set_attribute(editor, paragraphs[-1], "w:id", "y")
+                found = editor.get_node(tag="w:p", attrs={"w:id": "x"})
+                self.assertIs(found, paragraphs[0])
+                self.assert_index_matches_scan(editor)
+
+
+class TestGetNodes(unittest.TestCase):
+    def test_matches_in_document_order(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                editor = make_editor(backend)
+                found = editor.get_nodes(
+                    {
+                        "ids": {"tag": "w:p", "attrs": {"w:id": {"4", "1"}}},
+                        "text": {"tag": "w:t", "contains": "item 2"},
+                        "lines": {"tag": "w:r", "line_number": range(60, 10, -1)},
+                    }
+                )
+                self.assertEqual(list(found), ["ids", "text", "lines"])
+                for key, matches in found.items():
+                    lines = [editor._line(elem) for elem in matches]
+                    self.assertEqual(lines, sorted(lines), key)
+                self.assertEqual(
+                    found["ids"], scan(editor, "w:p", attrs={"w:id": {"1", "4"}})
+                )
+
+    def test_list_specs_keyed_by_position(self):
+        editor = make_editor("minidom")
+        found = editor.get_nodes([{"tag": "w:p"}, {"tag": "w:del"}])
+        self.assertEqual(list(found), [0, 1])
+        self.assertEqual(len(found[0]), 40)
+        self.assertEqual(found[1], [])
+
+    def test_unique(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                editor = make_editor(backend)
+                first, last = editor.get_nodes(
+                    [
+                        {"tag": "w:p", "contains": "Paragraph 0 "},
+                        {"tag": "w:p", "contains": "Paragraph 39 "},
+                    ],
+                    unique=True,
+                ).values()
+                self.assertEqual(editor._line(first), 4)
+                self.assertIs(last, scan(editor, "w:p")[-1])
+                with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+                    editor.get_nodes([{"tag": "w:p", "attrs": {"w:id": "0"}}], True)
+                with self.assertRaisesRegex(ValueError, "Node not found"):
+                    editor.get_nodes([{"tag": "w:p", "contains": "none"}], True)
+
+    def test_invalid_specs(self):
+        editor = make_editor("minidom")
+        with self.assertRaises(TypeError):
+            editor.get_nodes([{"attrs": {"w:id": "1"}}])
+        with self.assertRaises(TypeError):
+            editor.get_nodes([{"tag": "w:p", "text": "x"}])
+
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+  <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+  <Default Extension="xml" ContentType="application/xml"/>
+  <Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+  <Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>
+</Types>
+"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>
+"""
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/>
+</Relationships>
+"""
+
+SETTINGS = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:settings {W}>
+  <w:defaultTabStop w:val="720"/>
+</w:settings>
+"""
+
+
+class TestDocumentSave(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.unpacked = self.temp_dir / "unpacked"
+        parts = {
+            "[Content_Types].xml": CONTENT_TYPES.encode("utf-8"),
+            "_rels/.rels": PACKAGE_RELS.encode("utf-8"),
+            "word/_rels/document.xml.rels": DOCUMENT_RELS.encode("utf-8"),
+            "word/settings.xml": SETTINGS.encode("utf-8"),
+            "word/document.xml": sample_document(5),
+        }
+        for name, data in parts.items():
+            path = self.unpacked / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+        with redirect_stdout(StringIO()):
+            self.doc = Document(self.unpacked, rsid="00AB1234")
+        self.addCleanup(shutil.rmtree, self.doc.temp_dir, True)
+        self.save()  # Writes the comment infrastructure set up by Document
+
+    def save(self):
+        """Save with every file dated in the past; return the files rewritten."""
+        for directory in (self.unpacked, self.doc.unpacked_path):
+            for path in directory.rglob("*"):
+                os.utime(path, ns=(0, 0))
+        self.doc.save(validate=False)
+        return sorted(
+            path.relative_to(self.unpacked).as_posix()
+            for path in self.unpacked.rglob("*")
+            if path.is_file() and path.stat().st_mtime_ns != 0
+        )
+
+    def test_unchanged_save_touches_nothing(self):
+        self.doc["word/document.xml"].get_node(tag="w:p", contains="Paragraph 1")
+        self.assertEqual(self.save(), [])
+
+    def test_only_changed_parts_rewritten(self):
+        editor = self.doc["word/document.xml"]
+        editor.replace_node(
+            editor.get_node(tag="w:t", contains="Paragraph 2"),
+            "<w:t>Edited</w:t>",
+        )
+        self.assertEqual(self.save(), ["word/document.xml"])
+        self.assertIn(b"Edited", (self.unpacked / "word/document.xml").read_bytes())
+
+    def test_direct_dom_changes_saved(self):
+        editor = self.doc["word/document.xml"]
+        text = editor.dom.getElementsByTagName("w:t")[0]
+        text.firstChild.data = "Changed directly"
+        self.assertEqual(self.save(), ["word/document.xml"])
+        self.assertIn(
+            b"Changed directly", (self.unpacked / "word/document.xml").read_bytes()
+        )
+
+    def test_changes_to_returned_nodes_saved(self):
+        editor = self.doc["word/settings.xml"]
+        editor.get_node(tag="w:defaultTabStop").setAttribute("w:val", "360")
+        self.assertEqual(self.save(), ["word/settings.xml"])
+
+    def test_undone_direct_changes_not_saved(self):
+        editor = self.doc["word/document.xml"]
+        paragraph = editor.get_node(tag="w:p", contains="Paragraph 3")
+        paragraph.setAttribute("w:id", "x")
+        self.assertTrue(editor.modified)
+        paragraph.setAttribute("w:id", "3")
+        self.assertFalse(editor.modified)
+        self.assertEqual(self.save(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,24 +12,35 @@ import platform
 from pathlib import Path
 from openpyxl import load_workbook
 
+try:
+    from soffice_pool import SofficePool
+except ImportError:  # Imported from elsewhere: start LibreOffice for every run
+    SofficePool = None
 
-def setup_libreoffice_macro():
-    """Setup LibreOffice macro for recalculation if not already configured"""
-    if platform.system() == 'Darwin':
+
+def setup_libreoffice_macro(profile_dir=None):
+    """Setup LibreOffice macro for recalculation if not already configured
+
+    Args:
+        profile_dir: User installation of a soffice pool worker; by default the
+            macro goes to the user's own LibreOffice profile
+    """
+    if profile_dir is not None:
+        macro_dir = os.path.join(profile_dir, 'user', 'basic', 'Standard')
+    elif platform.system() == 'Darwin':
         macro_dir = os.path.expanduser('~/Library/Application Support/LibreOffice/4/user/basic/Standard')
     else:
         macro_dir = os.path.expanduser('~/.config/libreoffice/4/user/basic/Standard')
     
     macro_file = os.path.join(macro_dir, 'Module1.xba')
     
-    if os.path.exists(macro_file):
-        with open(macro_file, 'r') as f:
-            if 'RecalculateAndSave' in f.read():
-                return True
+    if _has_macro(macro_file):
+        return True
     
     if not os.path.exists(macro_dir):
-        subprocess.run(['soffice', '--headless', '--terminate_after_init'], 
-                      capture_output=True, timeout=10)
+        if profile_dir is None:
+            subprocess.run(['soffice', '--headless', '--terminate_after_init'], 
+                          capture_output=True, timeout=10)
         os.makedirs(macro_dir, exist_ok=True)
     
     macro_content = '''<?xml version="1.0" encoding="UTF-8"?>
@@ -50,6 +61,49 @@ def setup_libreoffice_macro():
         return False
 
 
+def _has_macro(macro_file):
+    """Check if a macro module file has the recalculation macro"""
+    if not os.path.exists(macro_file):
+        return False
+    with open(macro_file, 'r') as f:
+        return 'RecalculateAndSave' in f.read()
+
+
+def _install_macro(profile_dir):
+    """Set up the macro in a soffice pool worker's profile, raising if that fails
+
+    Returns:
+        True if the macro was installed now (the worker must be restarted to load it)
+    """
+    macro_file = os.path.join(profile_dir, 'user', 'basic', 'Standard', 'Module1.xba')
+    if _has_macro(macro_file):
+        return False
+    if not setup_libreoffice_macro(profile_dir):
+        raise RuntimeError('Failed to setup LibreOffice macro')
+    return True
+
+
+def _run_cold(args, timeout):
+    """Run soffice with args in a new soffice process, stopped after timeout seconds"""
+    cmd = ['soffice'] + args
+    
+    # Handle timeout command differences between Linux and macOS
+    if platform.system() != 'Windows':
+        timeout_cmd = 'timeout' if platform.system() == 'Linux' else None
+        if platform.system() == 'Darwin':
+            # Check if gtimeout is available on macOS
+            try:
+                subprocess.run(['gtimeout', '--version'], capture_output=True, timeout=1, check=False)
+                timeout_cmd = 'gtimeout'
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                pass
+        
+        if timeout_cmd:
+            cmd = [timeout_cmd, str(timeout)] + cmd
+    
+    return subprocess.run(cmd, capture_output=True, text=True)
+
+
 def recalc(filename, timeout=30):
     """
     Recalculate formulas in Excel file and report any errors
@@ -66,30 +120,26 @@ def recalc(filename, timeout=30):
     
     abs_path = str(Path(filename).absolute())
     
-    if not setup_libreoffice_macro():
-        return {'error': 'Failed to setup LibreOffice macro'}
-    
-    cmd = [
-        'soffice', '--headless', '--norestore',
+    args = [
+        '--headless', '--norestore',
         'vnd.sun.star.script:Standard.Module1.RecalculateAndSave?language=Basic&location=application',
         abs_path
     ]
     
-    # Handle timeout command differences between Linux and macOS
-    if platform.system() != 'Windows':
-        timeout_cmd = 'timeout' if platform.system() == 'Linux' else None
-        if platform.system() == 'Darwin':
-            # Check if gtimeout is available on macOS
-            try:
-                subprocess.run(['gtimeout', '--version'], capture_output=True, timeout=1, check=False)
-                timeout_cmd = 'gtimeout'
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                pass
-        
-        if timeout_cmd:
-            cmd = [timeout_cmd, str(timeout)] + cmd
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    pool = SofficePool() if SofficePool is not None else None
+    if pool is not None and pool.is_running():
+        # Run on a warm soffice of the pool (python soffice_pool.py start)
+        try:
+            result = pool.run(args, timeout, setup=_install_macro)
+        except RuntimeError as e:
+            return {'error': str(e)}
+        except subprocess.TimeoutExpired:
+            # Like the timeout command of a cold run; the file may have been saved
+            result = subprocess.CompletedProcess(args, 124, '', '')
+    else:
+        if not setup_libreoffice_macro():
+            return {'error': 'Failed to setup LibreOffice macro'}
+        result = _run_cold(args, timeout)
     
     if result.returncode != 0 and result.returncode != 124:  # 124 is timeout exit code
         error_msg = result.stderr or 'Unknown error during recalculation'
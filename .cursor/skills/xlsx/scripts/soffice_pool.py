@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Pool of long-lived headless LibreOffice (soffice) instances for document conversions.
+
+Starting soffice takes seconds, most of it spent before any document is opened.
+A pool worker is a headless soffice with its own user profile, left running in
+the background until the pool is stopped. A job runs a short-lived soffice with
+the worker's profile, which hands its arguments to the running instance and
+waits until they have been processed, so it skips the startup.
+
+Scripts that use soffice (pack.py validation, xlsx recalc.py) use the pool when
+it has been started and start a cold soffice for each job otherwise. The docx
+skill (ooxml/scripts) and the xlsx skill (scripts) each ship this file, so that
+either works alone; the copies share the pool, so keep them identical.
+
+Usage:
+    python soffice_pool.py start [--size N]
+    python soffice_pool.py status
+    python soffice_pool.py stop
+"""
+
+import argparse
+import contextlib
+import getpass
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no pool, every job starts its own soffice
+    fcntl = None
+
+# Seconds a cold soffice may take to start, on top of a job's own timeout
+STARTUP_TIMEOUT = 60
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the soffice worker pool")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    start_parser = subparsers.add_parser("start", help="Start the worker pool")
+    start_parser.add_argument(
+        "--size", type=int, default=1, help="Number of soffice workers (default: 1)"
+    )
+    subparsers.add_parser("status", help="Show the workers of the pool")
+    subparsers.add_parser("stop", help="Stop the workers and remove the pool")
+    args = parser.parse_args()
+
+    pool = SofficePool()
+    match args.command:
+        case "start":
+            if not soffice_available():
+                sys.exit("Error: soffice not found")
+            pool.start(args.size)
+            print(f"Started {args.size} soffice worker(s) in {pool.pool_dir}")
+        case "status":
+            if not pool.is_running():
+                print("Pool is not running")
+                return
+            for worker in pool.status():
+                state = "running" if worker["alive"] else "stopped"
+                print(f"Worker {worker['worker']}: {state} (pid {worker['pid']})")
+        case "stop":
+            pool.stop()
+            print("Pool stopped")
+
+
+def soffice_available():
+    """Return True if the soffice command is installed."""
+    return shutil.which("soffice") is not None
+
+
+def run_soffice(args, timeout, setup=None):
+    """Run soffice with args on a pool worker, or in a cold soffice if there is no pool.
+
+    Args:
+        args: soffice arguments, e.g. ["--headless", "--convert-to", "pdf", file]
+        timeout: Seconds the job may take; a cold soffice gets STARTUP_TIMEOUT more
+        setup: Called with the user profile directory the job will use before
+            soffice starts on it, e.g. to install macros, and returning True if it
+            changed the profile (a pool worker already running is then restarted,
+            as soffice only reads its profile at startup); the default profile of
+            a cold soffice (None) is left to soffice
+
+    Returns:
+        subprocess.CompletedProcess with text stdout and stderr
+
+    Raises:
+        FileNotFoundError: If soffice is not installed
+        subprocess.TimeoutExpired: If the job did not finish in time
+    """
+    pool = SofficePool()
+    if pool.is_running():
+        return pool.run(args, timeout, setup=setup)
+    if setup:
+        setup(None)
+    return _run_client(["soffice", *args], timeout + STARTUP_TIMEOUT)
+
+
+class SofficePool:
+    """Workers shared by all processes of the user, kept in a pool directory.
+
+    The directory (SOFFICE_POOL_DIR, by default soffice-pool-<user> in the temp
+    directory) holds pool.json with the pool size and, per worker, its profile,
+    a state file with its process ID and a lock file held while it runs a job.
+    A worker found dead when a job needs it is started again, and one that
+    overruns a job's timeout is killed so the next job gets a fresh instance.
+    """
+
+    POOL_DIR_ENV = "SOFFICE_POOL_DIR"
+    DEFAULT_POOL_DIR = Path(tempfile.gettempdir()) / f"soffice-pool-{getpass.getuser()}"
+
+    def __init__(self, pool_dir=None, startup_timeout=STARTUP_TIMEOUT):
+        self.pool_dir = Path(
+            pool_dir or os.environ.get(self.POOL_DIR_ENV) or self.DEFAULT_POOL_DIR
+        )
+        self.startup_timeout = startup_timeout
+
+    @property
+    def config_file(self):
+        return self.pool_dir / "pool.json"
+
+    def is_running(self):
+        """Return True if the pool has been started (its workers start on demand)."""
+        return fcntl is not None and self.config_file.is_file()
+
+    def size(self):
+        return json.loads(self.config_file.read_text())["size"]
+
+    def start(self, size=1):
+        """Create the pool and start its workers."""
+        if fcntl is None:
+            raise RuntimeError("The soffice pool is not supported on this platform")
+        self.pool_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.config_file.write_text(json.dumps({"size": size}))
+        for worker in range(size):
+            with self._locked(worker):
+                self._ensure_worker(worker)
+
+    def stop(self):
+        """Stop all workers and remove the pool directory."""
+        if not self.pool_dir.is_dir():
+            return
+        if self.config_file.is_file():
+            for worker in range(self.size()):
+                with self._locked(worker):
+                    self._stop_worker(worker)
+        shutil.rmtree(self.pool_dir, ignore_errors=True)
+
+    def status(self):
+        """Return {"worker", "pid", "alive"} of each worker."""
+        statuses = []
+        for worker in range(self.size()):
+            pid = self._read_pid(worker)
+            alive = pid is not None and self._is_alive(worker, pid)
+            statuses.append({"worker": worker, "pid": pid, "alive": alive})
+        return statuses
+
+    def run(self, args, timeout, setup=None):
+        """Run a job on a free worker; see run_soffice."""
+        with self._acquire() as worker:
+            self._ensure_worker(worker, setup)
+            command = ["soffice", f"-env:UserInstallation={self._profile_uri(worker)}"]
+            try:
+                return _run_client(command + list(args), timeout)
+            except subprocess.TimeoutExpired:
+                # The instance may be stuck on the document; don't hand it more jobs
+                self._stop_worker(worker)
+                raise
+
+    @contextlib.contextmanager
+    def _acquire(self):
+        """Lock a worker for a job, waiting for one if all are busy."""
+        size = self.size()
+        for worker in range(size):
+            lock_file = open(self._worker_file(worker, "lock"), "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            with lock_file:
+                yield worker
+            return
+
+        # All busy: queue on one worker, spreading waiting processes over the pool
+        worker = os.getpid() % size
+        with self._locked(worker):
+            yield worker
+
+    @contextlib.contextmanager
+    def _locked(self, worker):
+        with open(self._worker_file(worker, "lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _ensure_worker(self, worker, setup=None):
+        """Start the worker unless it is running. The worker's lock must be held.
+
+        setup (see run_soffice) is called before soffice starts on the profile,
+        and a running worker whose profile it changes is started again.
+        """
+        pid = self._read_pid(worker)
+        if pid is not None and self._is_alive(worker, pid):
+            if not (setup and setup(self._profile_dir(worker))):
+                return
+            self._stop_worker(worker)
+            setup = None  # Done
+
+        profile_uri = self._profile_uri(worker)
+        if not self._profile_dir(worker).is_dir():
+            # Create the profile first, so the worker doesn't start half-initialized
+            _run_client(
+                [
+                    "soffice",
+                    f"-env:UserInstallation={profile_uri}",
+                    "--headless",
+                    "--terminate_after_init",
+                ],
+                self.startup_timeout,
+            )
+
+        if setup:
+            setup(self._profile_dir(worker))
+
+        # A lock file left by a crashed instance would look like a started one
+        lock_file = self._profile_dir(worker) / ".lock"
+        lock_file.unlink(missing_ok=True)
+
+        # The acceptor keeps the headless instance alive while it has no documents
+        process = subprocess.Popen(
+            [
+                "soffice",
+                f"-env:UserInstallation={profile_uri}",
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                f"--accept=pipe,name=soffice-pool-{os.getpid()}-{worker};urp;",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,  # Outlives this process; killed as a group
+        )
+        self._worker_file(worker, "json").write_text(json.dumps({"pid": process.pid}))
+
+        # soffice creates the lock file after its IPC pipe. Until then a job could
+        # start a second instance on the profile instead of handing over its
+        # arguments, so wait for it.
+        deadline = time.monotonic() + self.startup_timeout
+        while not lock_file.exists() and time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"soffice worker {worker} exited during startup "
+                    f"(exit code {process.returncode})"
+                )
+            time.sleep(0.1)
+
+    def _stop_worker(self, worker):
+        pid = self._read_pid(worker)
+        if pid is not None and self._is_alive(worker, pid):
+            _kill_process_group(pid)
+        self._worker_file(worker, "json").unlink(missing_ok=True)
+
+    def _read_pid(self, worker):
+        try:
+            return json.loads(self._worker_file(worker, "json").read_text())["pid"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _is_alive(self, worker, pid):
+        """Return True if pid is still this worker's soffice (not a reused PID)."""
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return False
+        cmdline = Path(f"/proc/{pid}/cmdline")
+        if cmdline.parent.is_dir():
+            try:
+                # Empty for a zombie
+                return self._profile_uri(worker).encode() in cmdline.read_bytes()
+            except OSError:
+                return False
+        return True
+
+    def _worker_file(self, worker, suffix):
+        return self.pool_dir / f"worker-{worker}.{suffix}"
+
+    def _profile_dir(self, worker):
+        return self.pool_dir / f"worker-{worker}-profile"
+
+    def _profile_uri(self, worker):
+        return self._profile_dir(worker).resolve().as_uri()
+
+
+def _run_client(command, timeout):
+    """Run a soffice command, killing it with any children if it overruns timeout."""
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_process_group(process.pid, grace_period=0)
+        process.communicate()
+        raise
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def _kill_process_group(pid, grace_period=5):
+    """Terminate a process group started with start_new_session, then kill it."""
+    if not hasattr(os, "killpg"):
+        os.kill(pid, signal.SIGTERM)
+        return
+    try:
+        if grace_period:
+            os.killpg(pid, signal.SIGTERM)
+            deadline = time.monotonic() + grace_period
+            while time.monotonic() < deadline:
+                with contextlib.suppress(ChildProcessError):
+                    os.waitpid(pid, os.WNOHANG)  # Reap it if it is our child
+                os.killpg(pid, 0)
+                time.sleep(0.1)
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass  # Already gone
+
+
+if __name__ == "__main__":
+    main()